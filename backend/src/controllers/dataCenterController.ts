@@ -2,6 +2,9 @@ import { Request, Response } from 'express'
 import { DataCenterModel } from '../models/DataCenter'
 import { stringify } from 'csv-stringify/sync'
 
+/** unique_violation: another facility already has this name in this city (case-insensitive) */
+const isDuplicateNameCity = (e: unknown) => (e as { code?: string })?.code === '23505'
+
 export const getAllDataCenters = async (req: Request, res: Response) => {
   try {
     const dataCenters = req.adminAuth
@@ -124,6 +127,9 @@ export const createDataCenter = async (req: Request, res: Response) => {
     const dataCenter = await DataCenterModel.create(req.body)
     res.status(201).json(dataCenter)
   } catch (error) {
+    if (isDuplicateNameCity(error)) {
+      return res.status(409).json({ error: 'A data center with this name already exists in this city' })
+    }
     console.error('Error creating data center:', error)
     res.status(500).json({ error: 'Failed to create data center' })
   }
@@ -140,6 +146,9 @@ export const updateDataCenter = async (req: Request, res: Response) => {
     
     res.json(dataCenter)
   } catch (error) {
+    if (isDuplicateNameCity(error)) {
+      return res.status(409).json({ error: 'A data center with this name already exists in this city' })
+    }
     console.error('Error updating data center:', error)
     res.status(500).json({ error: 'Failed to update data center' })
   }
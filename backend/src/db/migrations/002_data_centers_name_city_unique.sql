@@ -0,0 +1,41 @@
+-- One published row per (name, city), case-insensitive. The scraper's Tier A batch
+-- upsert and the admin promote flow both match on this key; the index lets the
+-- scraper use INSERT ... ON CONFLICT instead of a SELECT per row.
+
+-- Databases created before this key existed can hold case-variant duplicates
+-- ("iXAfrica NBO1" / "IXAFRICA NBO1" in the same city), which would make the index
+-- fail. Merge each group into one row first: the published, then oldest, row is
+-- kept; the others' sources and candidate links move to it (sources whose URL it
+-- already has are dropped), and the others are deleted.
+CREATE TEMP TABLE data_center_duplicates AS
+SELECT id, keeper_id
+FROM (
+    SELECT id,
+           FIRST_VALUE(id) OVER (
+               PARTITION BY LOWER(name), LOWER(city)
+               ORDER BY verified DESC, created_at ASC NULLS LAST, id
+           ) AS keeper_id
+    FROM data_centers
+) ranked
+WHERE id <> keeper_id;
+
+UPDATE sources s
+SET data_center_id = d.keeper_id
+FROM data_center_duplicates d
+WHERE s.data_center_id = d.id
+  AND NOT EXISTS (
+      SELECT 1 FROM sources k WHERE k.data_center_id = d.keeper_id AND k.url = s.url
+  );
+
+UPDATE ingestion_candidates c
+SET merged_data_center_id = d.keeper_id
+FROM data_center_duplicates d
+WHERE c.merged_data_center_id = d.id;
+
+-- Remaining sources of the merged rows go with them (ON DELETE CASCADE)
+DELETE FROM data_centers WHERE id IN (SELECT id FROM data_center_duplicates);
+
+DROP TABLE data_center_duplicates;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_data_centers_name_city_lower
+    ON data_centers (LOWER(name), LOWER(city));
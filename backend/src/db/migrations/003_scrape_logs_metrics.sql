@@ -0,0 +1,2 @@
+-- Per-run scraper metrics (stage timings, item counts, HTTP and cache stats) as JSON.
+ALTER TABLE scrape_logs ADD COLUMN IF NOT EXISTS metrics JSONB;
@@ -0,0 +1,4 @@
+-- Hash of the Tier A curated record a published row was built from. The scraper
+-- compares it with the catalogue and skips geocoding, source fetches and the
+-- UPDATE for records that did not change. NULL for rows not owned by the catalogue.
+ALTER TABLE data_centers ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
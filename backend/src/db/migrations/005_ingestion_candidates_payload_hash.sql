@@ -0,0 +1,5 @@
+-- Hash of the payload last written to a candidate (source scrape times excluded).
+-- The scraper loads (external_id, status, payload_hash) per source system once per
+-- harvest and skips rows whose hash is unchanged, instead of rewriting every
+-- pending candidate on every run.
+ALTER TABLE ingestion_candidates ADD COLUMN IF NOT EXISTS payload_hash VARCHAR(64);
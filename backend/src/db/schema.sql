@@ -18,6 +18,7 @@ CREATE TABLE IF NOT EXISTS data_centers (
     certifications TEXT[],
     connectivity TEXT[],
     verified BOOLEAN NOT NULL DEFAULT true,
+    content_hash VARCHAR(64),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -44,6 +45,7 @@ CREATE TABLE IF NOT EXISTS scrape_logs (
     records_new INTEGER DEFAULT 0,
     records_updated INTEGER DEFAULT 0,
     error_message TEXT,
+    metrics JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -53,6 +55,7 @@ CREATE INDEX IF NOT EXISTS idx_data_centers_status ON data_centers(status);
 CREATE INDEX IF NOT EXISTS idx_data_centers_ownership ON data_centers(ownership_type);
 CREATE INDEX IF NOT EXISTS idx_sources_data_center ON sources(data_center_id);
 CREATE INDEX IF NOT EXISTS idx_data_centers_verified ON data_centers (verified);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_data_centers_name_city_lower ON data_centers (LOWER(name), LOWER(city));
 
 -- Harvested rows awaiting admin promotion (Tier B+; Kenya-focused in application layer)
 CREATE TABLE IF NOT EXISTS ingestion_candidates (
@@ -66,6 +69,7 @@ CREATE TABLE IF NOT EXISTS ingestion_candidates (
     raw_payload JSONB,
     source_urls TEXT[] NOT NULL DEFAULT '{}',
     confidence SMALLINT NOT NULL DEFAULT 50 CHECK (confidence >= 0 AND confidence <= 100),
+    payload_hash VARCHAR(64),
     merged_data_center_id UUID REFERENCES data_centers(id) ON DELETE SET NULL,
     resolution_note TEXT,
     created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -52,8 +52,8 @@ async function seedDatabase() {
     for (const dc of initialDataCenters) {
       // Check if already exists
       const existing = await query(
-        'SELECT id FROM data_centers WHERE name = $1',
-        [dc.name]
+        'SELECT id FROM data_centers WHERE LOWER(name) = LOWER($1) AND LOWER(city) = LOWER($2)',
+        [dc.name, dc.city]
       )
 
       if (existing.rows.length > 0) {
@@ -255,92 +255,60 @@ export class DataCenterModel {
         ? Number(payload.year_established)
         : null
 
-    const existing = await query(
+    // Same (LOWER(name), LOWER(city)) key as the scraper's Tier A upsert: an existing
+    // facility is refreshed and published instead of tripping the unique index
+    const ins = await query(
       `
-      SELECT id FROM data_centers
-      WHERE LOWER(name) = LOWER($1) AND LOWER(city) = LOWER($2)
+      INSERT INTO data_centers (
+        name, operator, address, city, country,
+        latitude, longitude,
+        status, ownership_type,
+        power_capacity_mw, floor_space_sqm, rack_count,
+        year_established, tier_rating,
+        verified
+      ) VALUES (
+        $1, $2, $3, $4, $5,
+        $6, $7,
+        $8, $9,
+        $10, $11, $12,
+        $13, $14,
+        true
+      )
+      ON CONFLICT (LOWER(name), LOWER(city)) DO UPDATE SET
+        operator = EXCLUDED.operator,
+        address = EXCLUDED.address,
+        country = EXCLUDED.country,
+        latitude = EXCLUDED.latitude,
+        longitude = EXCLUDED.longitude,
+        status = EXCLUDED.status,
+        ownership_type = EXCLUDED.ownership_type,
+        power_capacity_mw = EXCLUDED.power_capacity_mw,
+        floor_space_sqm = EXCLUDED.floor_space_sqm,
+        rack_count = EXCLUDED.rack_count,
+        year_established = EXCLUDED.year_established,
+        tier_rating = EXCLUDED.tier_rating,
+        verified = true,
+        updated_at = CURRENT_TIMESTAMP
+      RETURNING id
     `,
-      [name, city]
+      [
+        name,
+        operator,
+        address,
+        city,
+        country,
+        latitude,
+        longitude,
+        status,
+        ownershipType,
+        Number.isFinite(powerMw) ? powerMw : null,
+        Number.isFinite(floorSqm) ? floorSqm : null,
+        Number.isFinite(racks) ? racks : null,
+        Number.isFinite(yearEstablished as number) ? yearEstablished : null,
+        metadata.tier != null ? String(metadata.tier) : null,
+      ]
     )
-
-    let dcId: string
-
-    if (existing.rows.length > 0) {
-      dcId = existing.rows[0].id
-      await query(
-        `
-        UPDATE data_centers SET
-          operator = $2,
-          address = $3,
-          country = $4,
-          latitude = $5,
-          longitude = $6,
-          status = $7,
-          ownership_type = $8,
-          power_capacity_mw = $9,
-          floor_space_sqm = $10,
-          rack_count = $11,
-          year_established = $12,
-          tier_rating = $13,
-          verified = true,
-          updated_at = CURRENT_TIMESTAMP
-        WHERE id = $1
-      `,
-        [
-          dcId,
-          operator,
-          address,
-          country,
-          latitude,
-          longitude,
-          status,
-          ownershipType,
-          Number.isFinite(powerMw) ? powerMw : null,
-          Number.isFinite(floorSqm) ? floorSqm : null,
-          Number.isFinite(racks) ? racks : null,
-          Number.isFinite(yearEstablished as number) ? yearEstablished : null,
-          metadata.tier != null ? String(metadata.tier) : null,
-        ]
-      )
-    } else {
-      const ins = await query(
-        `
-        INSERT INTO data_centers (
-          name, operator, address, city, country,
-          latitude, longitude,
-          status, ownership_type,
-          power_capacity_mw, floor_space_sqm, rack_count,
-          year_established, tier_rating,
-          verified
-        ) VALUES (
-          $1, $2, $3, $4, $5,
-          $6, $7,
-          $8, $9,
-          $10, $11, $12,
-          $13, $14,
-          true
-        )
-        RETURNING id
-      `,
-        [
-          name,
-          operator,
-          address,
-          city,
-          country,
-          latitude,
-          longitude,
-          status,
-          ownershipType,
-          Number.isFinite(powerMw) ? powerMw : null,
-          Number.isFinite(floorSqm) ? floorSqm : null,
-          Number.isFinite(racks) ? racks : null,
-          Number.isFinite(yearEstablished as number) ? yearEstablished : null,
-          metadata.tier != null ? String(metadata.tier) : null,
-        ]
-      )
-      dcId = ins.rows[0].id
-    }
+    const dcId: string = ins.rows[0].id
 
     const rawSources = Array.isArray(payload.sources) ? payload.sources : []
     for (const s of rawSources) {
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark Deduplicator.deduplicate: blocking index vs the exhaustive pairwise scan.
+
+    cd scraper
+    python -m benchmarks.bench_dedup --sizes 1000 10000 100000
+
+The exhaustive scan is only run up to ``--baseline-max`` rows (it is quadratic);
+above that its time is estimated from the measured cost per comparison. Wherever
+both run, the outputs are compared. Prints one JSON object per size.
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.synthetic import make_facilities
+from processors.deduplicator import Deduplicator
+
+
+def _exhaustive_comparisons(n: int, unique: int) -> float:
+    # Each row is compared with roughly every unique row seen before it
+    return n * unique / 2.0
+
+
+def bench_size(n: int, baseline_max: int, dup_rate: float, seed: int) -> Dict[str, Any]:
+    rows = make_facilities(n, dup_rate=dup_rate, seed=seed)
+    result: Dict[str, Any] = {"benchmark": "dedup", "rows": n, "dup_rate": dup_rate}
+
+    blocked_rows = copy.deepcopy(rows)
+    t0 = time.perf_counter()
+    blocked = Deduplicator(exhaustive_max_rows=0).deduplicate(blocked_rows)
+    result["blocked_s"] = round(time.perf_counter() - t0, 4)
+    result["unique"] = len(blocked)
+
+    if n <= baseline_max:
+        exhaustive_rows = copy.deepcopy(rows)
+        t0 = time.perf_counter()
+        exhaustive = Deduplicator(blocking=False).deduplicate(exhaustive_rows)
+        result["exhaustive_s"] = round(time.perf_counter() - t0, 4)
+        result["exhaustive_estimated"] = False
+        result["exhaustive_unique"] = len(exhaustive)
+        result["identical_output"] = exhaustive == blocked
+    else:
+        result["exhaustive_s"] = None
+        result["exhaustive_estimated"] = True
+    return result
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--baseline-max", type=int, default=10000,
+                        help="Largest size at which the exhaustive scan is actually run")
+    parser.add_argument("--dup-rate", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    results = [bench_size(n, args.baseline_max, args.dup_rate, args.seed) for n in sorted(args.sizes)]
+
+    # Estimate skipped exhaustive runs from the largest measured seconds-per-comparison
+    measured = [r for r in results if not r["exhaustive_estimated"]]
+    if measured:
+        ref = measured[-1]
+        per_cmp = ref["exhaustive_s"] / _exhaustive_comparisons(ref["rows"], ref["unique"])
+        for r in results:
+            if r["exhaustive_estimated"]:
+                r["exhaustive_s"] = round(per_cmp * _exhaustive_comparisons(r["rows"], r["unique"]), 2)
+    for r in results:
+        if r["exhaustive_s"] and r["blocked_s"]:
+            r["speedup"] = round(r["exhaustive_s"] / r["blocked_s"], 1)
+        print(json.dumps(r))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
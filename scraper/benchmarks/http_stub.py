@@ -0,0 +1,211 @@
+"""
+Local HTTP stand-ins for fetch benchmarks.
+
+``StubSite`` serves synthetic HTML on 127.0.0.1 with a fixed per-response latency,
+ETag / 304 support and a request counter. Several sites on different ports stand in
+for different hosts, since the rate limiter keys on ``host:port``.
+
+``OverpassStub`` answers the OSM harvester's Overpass queries from the recorded
+``fixtures/overpass_kenya.json`` response plus optional synthetic elements.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import parse_qs
+
+from benchmarks.synthetic import make_html_page, make_overpass_elements
+
+OVERPASS_FIXTURE = Path(__file__).resolve().parent / "fixtures" / "overpass_kenya.json"
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients (the enricher) hang up once they have the <title>
+
+
+class StubSite:
+    def __init__(self, latency_s: float = 0.02, page_size: int = 64 * 1024):
+        self.latency_s = latency_s
+        self.page_size = page_size
+        self.requests = 0
+        self.not_modified = 0
+        self._pages: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def _page(self, path: str) -> bytes:
+        with self._lock:
+            if path not in self._pages:
+                self._pages[path] = make_html_page(f"Stub page {path}", size=self.page_size)
+            return self._pages[path]
+
+    def start(self) -> 'StubSite':
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                time.sleep(site.latency_s)
+                body = site._page(self.path)
+                etag = f'"{len(body)}-{hash(self.path) & 0xffffffff:x}"'
+                with site._lock:
+                    site.requests += 1
+                    if self.headers.get('If-None-Match') == etag:
+                        site.not_modified += 1
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = _QuietServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def urls(self, n: int) -> List[str]:
+        return [f"{self.base_url}/page/{i}" for i in range(n)]
+
+
+class StubSites:
+    """A handful of ``StubSite`` hosts, started and stopped together."""
+
+    def __init__(self, hosts: int = 4, **kwargs):
+        self.sites = [StubSite(**kwargs) for _ in range(hosts)]
+
+    def __enter__(self) -> 'StubSites':
+        for site in self.sites:
+            site.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for site in self.sites:
+            site.stop()
+
+    @property
+    def requests(self) -> int:
+        return sum(site.requests for site in self.sites)
+
+    def urls(self, n: int) -> List[str]:
+        """``n`` page URLs spread round-robin over the hosts."""
+        return [f"{self.sites[i % len(self.sites)].base_url}/page/{i}" for i in range(n)]
+
+
+class OverpassStub:
+    """
+    Minimal Overpass interpreter for the harvester's two query shapes: element
+    queries (``out tags center``) return the elements inside the query's bbox,
+    streamed in small writes; count probes (``out count``) return the bbox total and
+    how many of those elements were ``edit``-ed. Counts requests of each kind.
+    """
+
+    def __init__(self, extra_elements: int = 0, latency_s: float = 0.02, write_chunk: int = 16 * 1024):
+        with open(OVERPASS_FIXTURE, encoding="utf-8") as f:
+            self.fixture = json.load(f)
+        self.elements: List[Dict[str, Any]] = self.fixture["elements"] + make_overpass_elements(extra_elements)
+        self.latency_s = latency_s
+        self.write_chunk = write_chunk
+        self.edited: Set[str] = set()
+        self.queries = 0
+        self.probes = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/api/interpreter"
+
+    def edit(self, count: int) -> None:
+        """Mark the first ``count`` elements as edited since the recorded snapshot."""
+        self.edited.update(f"{el['type']}/{el['id']}" for el in self.elements[:count])
+
+    def _in_bbox(self, query: str) -> List[Dict[str, Any]]:
+        match = re.search(r"\(area\.ke\)\(([^)]+)\)", query)
+        south, west, north, east = (float(v) for v in match.group(1).split(","))
+        inside = []
+        for el in self.elements:
+            point = el.get("center") or el
+            # Closed, as in Overpass: an object on a shared edge comes back from every tile
+            if south <= point["lat"] <= north and west <= point["lon"] <= east:
+                inside.append(el)
+        return inside
+
+    def _respond(self, query: str) -> bytes:
+        inside = self._in_bbox(query)
+        head = {k: v for k, v in self.fixture.items() if k != "elements"}
+        if "out count" in query:
+            with self._lock:
+                self.probes += 1
+            edited = sum(f"{el['type']}/{el['id']}" in self.edited for el in inside)
+            head["elements"] = [
+                {"type": "count", "id": 0, "tags": {"total": str(len(inside))}},
+                {"type": "count", "id": 0, "tags": {"total": str(edited)}},
+            ]
+            return json.dumps(head).encode("utf-8")
+        with self._lock:
+            self.queries += 1
+        head["elements"] = inside
+        return json.dumps(head, indent=1).encode("utf-8")
+
+    def start(self) -> "OverpassStub":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                time.sleep(stub.latency_s)
+                length = int(self.headers.get("Content-Length", "0"))
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                body = stub._respond(form["data"][0])
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for i in range(0, len(body), stub.write_chunk):
+                    self.wfile.write(body[i:i + stub.write_chunk])
+
+        self._server = _QuietServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "OverpassStub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Run the scraper benchmark suite and optionally compare against a previous run.
+
+    cd scraper
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --only dedup title_scan --scale 0.1
+    python -m benchmarks.run --compare bench.json --tolerance 0.25
+
+Results are written as JSON (``meta`` plus one entry per benchmark). With
+``--compare``, each benchmark's best time is checked against the baseline's.
+The exit status is 1 when any benchmark is slower by more than ``--tolerance``.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from benchmarks.suite import BENCHMARKS
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Pair results with baseline entries of the same benchmark and size."""
+    previous = {(r["benchmark"], r["size"]): r for r in baseline.get("results", [])}
+    rows = []
+    for r in results:
+        old = previous.get((r["benchmark"], r["size"]))
+        if not old or not old.get("best_s") or not r.get("best_s"):
+            continue
+        ratio = r["best_s"] / old["best_s"]
+        rows.append({
+            "benchmark": r["benchmark"],
+            "size": r["size"],
+            "baseline_s": old["best_s"],
+            "current_s": r["best_s"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1.0 + tolerance,
+        })
+    return rows
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every default size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results JSON here (default: stdout only)")
+    parser.add_argument("--compare", help="Baseline results JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown vs baseline before failing (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.only or list(BENCHMARKS):
+        fn, default_size = BENCHMARKS[name]
+        size = max(1, int(default_size * args.scale))
+        print(f"⏱️  {name} (size {size})...", file=sys.stderr)
+        result = fn(size, args.repeat)
+        print(json.dumps(result))
+        results.append(result)
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "scale": args.scale,
+        },
+        "results": results,
+    }
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["comparison"] = compare(results, baseline, args.tolerance)
+        for row in report["comparison"]:
+            marker = "❌" if row["regression"] else "✅"
+            print(f"{marker} {row['benchmark']} (size {row['size']}): "
+                  f"{row['baseline_s']}s → {row['current_s']}s (x{row['ratio']})", file=sys.stderr)
+            if row["regression"]:
+                status = 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results saved to: {args.output}", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+"""
+Benchmarks for the scraper hot paths, run by ``benchmarks.run``.
+
+Each benchmark takes a size and a repeat count and returns one flat dict with
+``benchmark``, ``size``, ``best_s`` and ``median_s`` plus whatever else it measured.
+Inputs come from ``benchmarks.synthetic``; fetch benchmarks talk to the local
+``benchmarks.http_stub`` sites, and the database benchmark needs a disposable
+Postgres (schema and migrations applied) in ``BENCH_DATABASE_URL``.
+"""
+
+import copy
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.http_stub import OverpassStub, StubSites
+from benchmarks.synthetic import (
+    make_articles,
+    make_capacity_texts,
+    make_facilities,
+    make_html_page,
+    make_listing_page,
+    make_operator_names,
+)
+from processors import country_bounds as country_bounds_module
+from processors.country_bounds import CountryBounds
+from processors.deduplicator import Deduplicator
+from processors.gazetteer import kenya_gazetteer
+from processors.geocode_backends import GazetteerBackend, GeocodeBackend
+from processors.geocode_cache import GeocodeCache
+from processors.geocoder import Geocoder, normalize_query
+from processors.location_validator import LocationValidator
+from processors.keyword_matcher import KeywordMatcher
+from scrapers.base_scraper import BaseScraper
+from scrapers.datacentermap_scraper import DataCenterMapScraper
+from scrapers.fetch import build_session
+from scrapers.http_cache import CachingHTTPAdapter, HttpCache
+from scrapers.news_monitor_scraper import NewsMonitorScraper
+from scrapers.osm_kenya_scraper import OsmKenyaScraper
+from scrapers.overpass_cache import OverpassTileCache
+from source_link_enricher import TitleScanner, enrich_sources_batch
+
+BenchResult = Dict[str, Any]
+
+READ_CHUNK = 32768  # what the enricher reads per iteration
+
+
+def measure(
+    fn: Callable[[Any], Any],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Tuple[float, float, Any]:
+    """Run ``fn(setup())`` ``repeat`` times; returns best and median seconds and the last result."""
+    times: List[float] = []
+    result = None
+    for _ in range(max(1, repeat)):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        result = fn(arg)
+        times.append(time.perf_counter() - t0)
+    return min(times), statistics.median(times), result
+
+
+def _result(name: str, size: int, best: float, median: float, **extra: Any) -> BenchResult:
+    return {
+        "benchmark": name,
+        "size": size,
+        "best_s": round(best, 6),
+        "median_s": round(median, 6),
+        "per_item_us": round(best / size * 1e6, 3) if size else None,
+        **extra,
+    }
+
+
+def bench_dedup(size: int, repeat: int) -> BenchResult:
+    rows = make_facilities(size)
+    best, median, unique = measure(
+        lambda data: Deduplicator().deduplicate(data), repeat, lambda: copy.deepcopy(rows)
+    )
+    return _result("dedup", size, best, median, unique=len(unique))
+
+
+def bench_extract_capacity(size: int, repeat: int) -> BenchResult:
+    texts = make_capacity_texts(size)
+    scraper = BaseScraper("bench")
+    best, median, found = measure(
+        lambda _: sum(1 for t in texts if scraper.extract_capacity(t)), repeat
+    )
+    return _result("extract_capacity", size, best, median, with_capacity=found)
+
+
+def bench_normalize_ownership(size: int, repeat: int) -> BenchResult:
+    operators = make_operator_names(size)
+    scraper = BaseScraper("bench")
+    best, median, _ = measure(lambda _: [scraper.normalize_ownership(op) for op in operators], repeat)
+    return _result("normalize_ownership", size, best, median)
+
+
+def bench_filter_relevant(size: int, repeat: int) -> BenchResult:
+    """The news keyword filter with today's keyword list, and with 300 keywords."""
+    articles = make_articles(size)
+    monitor = NewsMonitorScraper()
+    best, median, relevant = measure(
+        lambda batch: monitor._filter_relevant(batch), repeat, lambda: copy.deepcopy(articles)
+    )
+    monitor.keywords = monitor.keywords + make_operator_names(300 - len(monitor.keywords))
+    monitor.keyword_matcher = KeywordMatcher(monitor.keywords)
+    many_best, many_median, _ = measure(
+        lambda batch: monitor._filter_relevant(batch), repeat, lambda: copy.deepcopy(articles)
+    )
+    return _result("filter_relevant", size, best, median, relevant=len(relevant),
+                   keywords_300_best_s=round(many_best, 6), keywords_300_median_s=round(many_median, 6))
+
+
+def bench_listing_parse(size: int, repeat: int) -> BenchResult:
+    """Streamed listing extraction plus ``parse_listing``, vs a full html.parser tree."""
+    from bs4 import BeautifulSoup
+
+    html = make_listing_page(size)
+    scraper = DataCenterMapScraper()
+    url = "https://www.datacentermap.com/kenya/"
+    best, median, rows = measure(
+        lambda _: [scraper.parse_listing(listing, url)
+                   for listing in scraper.iter_listings(html, 'div', 'data-center-item')],
+        repeat,
+    )
+    full_best, full_median, _ = measure(
+        lambda _: [scraper.parse_listing(listing, url)
+                   for listing in BeautifulSoup(html, 'html.parser').find_all('div', class_='data-center-item')],
+        repeat,
+    )
+    return _result("listing_parse", size, best, median, rows=len(rows),
+                   full_tree_best_s=round(full_best, 6), full_tree_median_s=round(full_median, 6))
+
+
+def bench_title_scan(size: int, repeat: int) -> BenchResult:
+    pages = [make_html_page(f"Facility {i}", size=96 * 1024, title_offset=512 + (i % 8) * 4096)
+             for i in range(size)]
+
+    def scan(_):
+        found = 0
+        for page in pages:
+            scanner = TitleScanner()
+            for i in range(0, len(page), READ_CHUNK):
+                if scanner.feed(page[i:i + READ_CHUNK]):
+                    break
+            found += scanner.title() is not None
+        return found
+
+    best, median, found = measure(scan, repeat)
+    return _result("title_scan", size, best, median, titles=found)
+
+
+def bench_get_pages(size: int, repeat: int) -> BenchResult:
+    """``BaseScraper.get_pages`` against four local hosts with 20 ms per response."""
+    with StubSites(hosts=4, latency_s=0.02) as sites:
+        urls = sites.urls(size)
+        scraper = BaseScraper("bench")
+        scraper.session = build_session(scraper.user_agent, cache=False)
+        best, median, pages = measure(lambda _: scraper.get_pages(urls, delay=0.01), repeat)
+        return _result("get_pages", size, best, median,
+                       fetched=sum(p is not None for p in pages), requests=sites.requests)
+
+
+def bench_enrich_sources(size: int, repeat: int) -> BenchResult:
+    """
+    Curated source enrichment against local hosts, cold and then through the HTTP
+    cache. The enricher stops reading at ``</title>``, which leaves partial entries;
+    ``not_modified`` counts the repeat requests those answered with a 304.
+    """
+    with StubSites(hosts=4, latency_s=0.02) as sites:
+        urls = sites.urls(size)
+
+        def facilities():
+            return [{"name": f"Facility {i}", "sources": [{"url": url, "name": "Stub"}]}
+                    for i, url in enumerate(urls)]
+
+        cold_session = build_session("bench", pool_size=8, cache=False)
+        best, median, _ = measure(
+            lambda batch: enrich_sources_batch(cold_session, batch, delay_s=0.01, max_workers=8),
+            repeat, facilities,
+        )
+
+        cached_session = build_session("bench", pool_size=8, cache=False)
+        adapter = CachingHTTPAdapter(HttpCache(":memory:"), pool_connections=8, pool_maxsize=8)
+        cached_session.mount("http://", adapter)
+        enrich_sources_batch(cached_session, facilities(), delay_s=0.01, max_workers=8)  # warm
+        before = sum(site.not_modified for site in sites.sites)
+        warm_best, warm_median, _ = measure(
+            lambda batch: enrich_sources_batch(cached_session, batch, delay_s=0.01, max_workers=8),
+            repeat, facilities,
+        )
+        revalidated = sum(site.not_modified for site in sites.sites) - before
+        return _result("enrich_sources", size, best, median,
+                       revalidated_best_s=round(warm_best, 6),
+                       revalidated_median_s=round(warm_median, 6),
+                       not_modified=revalidated)
+
+
+def bench_osm_tiles(size: int, repeat: int) -> BenchResult:
+    """
+    Tiled Overpass harvest against the local stand-in: every tile fetched (cold),
+    served from fresh cache, and after the TTL with one changed tile (probe + refetch).
+    """
+    with OverpassStub(extra_elements=size, latency_s=0.02) as stub:
+        def scraper(cache: OverpassTileCache) -> OsmKenyaScraper:
+            return OsmKenyaScraper(overpass_url=stub.url, cache=cache, tile_workers=4, delay=0)
+
+        best, median, rows = measure(
+            lambda _: scraper(OverpassTileCache(":memory:")).scrape(), repeat
+        )
+        cold_queries = stub.queries // repeat
+
+        cache = OverpassTileCache(":memory:")
+        warm = scraper(cache)
+        warm.scrape()
+        cached_best, cached_median, _ = measure(lambda _: warm.scrape(), repeat)
+
+        stub.edit(1)
+        cache.ttl_s = 0
+        queries, probes = stub.queries, stub.probes
+        probed_best, probed_median, probed = measure(lambda _: warm.scrape(), 1)
+        return _result("osm_tiles", size, best, median, rows=len(rows), tiles=len(warm.tiles),
+                       cold_queries=cold_queries,
+                       cached_best_s=round(cached_best, 6), cached_median_s=round(cached_median, 6),
+                       expired_s=round(probed_best, 6), expired_rows=len(probed),
+                       expired_probes=stub.probes - probes, expired_queries=stub.queries - queries)
+
+
+def bench_db_write(size: int, repeat: int) -> BenchResult:
+    """
+    Row-by-row (each committed, or all in one ``transaction()``) vs batched Tier A
+    upserts and candidate inserts on ``BENCH_DATABASE_URL``, and the content-hash
+    check that lets an unchanged catalogue skip the write, and restaging unchanged
+    candidates through a preloaded ``candidate_index``.
+    """
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        return {"benchmark": "db_write", "size": size, "skipped": "BENCH_DATABASE_URL not set"}
+    os.environ["DATABASE_URL"] = url
+    from db.database import Database
+    from scrapers.manual_data_scraper import content_hash, curated_changes
+
+    db = Database()
+    tag = f"bench-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    rows = make_facilities(size, dup_rate=0.0)
+    for i, row in enumerate(rows):
+        row["name"] = f"{tag} {i} {row['name']}"
+        row["latitude"], row["longitude"] = -1.28, 36.82
+        row["content_hash"] = content_hash(row)
+
+    def cleanup():
+        with db.transaction() as cur:
+            cur.execute("DELETE FROM data_centers WHERE name LIKE %s", (f"{tag} %",))
+            cur.execute("DELETE FROM ingestion_candidates WHERE source_system = %s", (tag,))
+
+    def per_row_curated(_):
+        for row in rows:
+            db.upsert_curated(row)
+
+    def per_row_curated_one_transaction(_):
+        with db.transaction():
+            for row in rows:
+                db.upsert_curated(row)
+
+    def per_row_candidates(_):
+        for row in rows:
+            db.insert_candidate(row, tag)
+
+    def unchanged_candidates(_):
+        index = db.candidate_index(tag)
+        db.insert_candidates_many(rows, tag, index=index)
+        assert index.unchanged == len(rows)
+
+    def unchanged_check(_):
+        changed, _removed = curated_changes(rows, db.curated_hashes() or {})
+        assert not changed
+
+    try:
+        timings: Dict[str, float] = {}
+        for label, fn in (
+            ("curated_per_row", per_row_curated),
+            ("curated_per_row_one_tx", per_row_curated_one_transaction),
+            ("curated_batch", lambda _: db.upsert_curated_many(rows)),
+            ("candidates_per_row", per_row_candidates),
+            ("candidates_batch", lambda _: db.insert_candidates_many(rows, tag)),
+        ):
+            # Every repeat starts from an empty slate, so all of them time the insert path
+            best, median, _ = measure(fn, repeat, cleanup)
+            timings[f"{label}_best_s"] = round(best, 6)
+            timings[f"{label}_median_s"] = round(median, 6)
+        if db.has_content_hash:
+            db.upsert_curated_many(rows)
+            best, median, _ = measure(unchanged_check, repeat)
+            timings["curated_unchanged_best_s"] = round(best, 6)
+            timings["curated_unchanged_median_s"] = round(median, 6)
+        if db.has_payload_hash:
+            db.insert_candidates_many(rows, tag)
+            best, median, _ = measure(unchanged_candidates, repeat)
+            timings["candidates_unchanged_best_s"] = round(best, 6)
+            timings["candidates_unchanged_median_s"] = round(median, 6)
+        cleanup()
+    finally:
+        db.close()
+    return _result("db_write", size, timings["curated_batch_best_s"], timings["curated_batch_median_s"],
+                   **timings)
+
+
+class _CityBackend(GeocodeBackend):
+    """Stands in for Nominatim: knows cities only, 1 ms per request."""
+
+    name = "city_stub"
+    rate_limited = True
+
+    def lookup(self, query: str):
+        time.sleep(0.001)
+        parts = [p.strip() for p in query.split(",")]
+        if len(parts) != 2:
+            return None
+        return -1.0 - len(parts[0]) / 100, 36.0
+
+
+def bench_geocode_many(size: int, repeat: int) -> BenchResult:
+    """
+    ``Geocoder.geocode_many`` on rows whose street addresses the service cannot find,
+    so each falls back to its city; spelling varies in case and punctuation.
+    """
+    rows = make_facilities(size)
+    for i, row in enumerate(rows):
+        if i % 3 == 0:
+            row["address"] = row["address"].upper() + "."
+        elif i % 3 == 1:
+            row["address"] = row["address"].replace(", ", " ,  ")
+
+    def batch():
+        return [dict(row) for row in rows]
+
+    def cold(items):
+        geocoder = Geocoder(cache=GeocodeCache(":memory:"), backends=[_CityBackend()], min_interval_s=0)
+        geocoder.geocode_many(items)
+        return geocoder
+
+    best, median, geocoder = measure(cold, repeat, batch)
+    cold_requests = geocoder.requests
+    geocoder.geocode_many(batch())  # same places again: all from the cache
+    places = {normalize_query(f"{r['address']}, {r['city']}, {r['country']}") for r in rows}
+
+    # Default order: the gazetteer answers the Kenyan city fallbacks offline
+    with_gazetteer = Geocoder(cache=GeocodeCache(":memory:"),
+                              backends=[GazetteerBackend(), _CityBackend()], min_interval_s=0)
+    with_gazetteer.geocode_many(batch())
+    return _result("geocode_many", size, best, median,
+                   distinct_addresses=len(places),
+                   cities=len({(r["city"], r["country"]) for r in rows}),
+                   requests=cold_requests,
+                   warm_requests=geocoder.requests - cold_requests,
+                   gazetteer_requests=with_gazetteer.requests,
+                   gazetteer_hits=with_gazetteer.backend_hits["gazetteer"])
+
+
+def bench_gazetteer_lookup(size: int, repeat: int) -> BenchResult:
+    """``Gazetteer.locate`` on place names as they appear in listings, misspellings included."""
+    gazetteer = kenya_gazetteer()
+    names = ["Westlands, Nairobi, Kenya", "Westland, Nairobi", "Upperhil, Nairobi, Kenya",
+             "Konza, Machakos", "Tatu City, Ruiru, Kenya", "Nyali, Mombasa", "Eldoret, Kenya",
+             "Kampala, Uganda", "12 Mombasa Road, Nairobi, Kenya"]
+    queries = [names[i % len(names)] for i in range(size)]
+    found = sum(1 for q in queries if gazetteer.locate(q))
+    best, median, _ = measure(lambda _: [gazetteer.locate(q) for q in queries], repeat)
+    return _result("gazetteer_lookup", size, best, median, places=len(gazetteer), found=found)
+
+
+def bench_bounds_check(size: int, repeat: int) -> BenchResult:
+    """
+    ``LocationValidator`` on harvested-size batches: Kenyan rows with coordinates
+    scattered over the Kenya bounding box and beyond, about a third outside the
+    outline. No geocoder, so outliers are only flagged.
+    """
+    import random
+
+    rng = random.Random(7)
+    rows = [
+        {"name": f"dc {i}", "country": "Kenya",
+         "latitude": rng.uniform(-6.0, 6.0), "longitude": rng.uniform(33.0, 43.0)}
+        for i in range(size)
+    ]
+    def check_with(bounds):
+        def check(_):
+            validator = LocationValidator(bounds=bounds)
+            for start in range(0, size, 500):  # harvest_pipeline batch size
+                validator.outliers(rows[start:start + 500])
+            return validator
+        return check
+
+    build_best, _, _ = measure(lambda _: CountryBounds.load(), 3)
+    bounds = CountryBounds.load()
+    best, median, _ = measure(check_with(bounds), repeat)
+    outside = len(LocationValidator(bounds=bounds).outliers(rows))
+
+    # Same build and batches without NumPy, for comparison
+    saved = country_bounds_module.NUMPY_AVAILABLE
+    country_bounds_module.NUMPY_AVAILABLE = False
+    try:
+        plain_build_best, _, _ = measure(lambda _: CountryBounds.load(), 3)
+        plain_bounds = CountryBounds.load()
+        plain_best, _, _ = measure(check_with(plain_bounds), repeat)
+        plain_outside = len(LocationValidator(bounds=plain_bounds).outliers(rows))
+    finally:
+        country_bounds_module.NUMPY_AVAILABLE = saved
+    return _result("bounds_check", size, best, median,
+                   outside=outside,
+                   numpy=saved,
+                   build_s=round(build_best, 6),
+                   plain_python_best_s=round(plain_best, 6),
+                   plain_python_build_s=round(plain_build_best, 6),
+                   plain_python_outside=plain_outside)
+
+
+# name -> (function, default size)
+BENCHMARKS: Dict[str, Tuple[Callable[[int, int], BenchResult], int]] = {
+    "dedup": (bench_dedup, 2000),
+    "extract_capacity": (bench_extract_capacity, 20000),
+    "normalize_ownership": (bench_normalize_ownership, 50000),
+    "filter_relevant": (bench_filter_relevant, 5000),
+    "listing_parse": (bench_listing_parse, 2000),
+    "title_scan": (bench_title_scan, 500),
+    "get_pages": (bench_get_pages, 40),
+    "enrich_sources": (bench_enrich_sources, 40),
+    "osm_tiles": (bench_osm_tiles, 5000),
+    "geocode_many": (bench_geocode_many, 2000),
+    "gazetteer_lookup": (bench_gazetteer_lookup, 5000),
+    "bounds_check": (bench_bounds_check, 20000),
+    "db_write": (bench_db_write, 500),
+}
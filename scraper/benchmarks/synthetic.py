@@ -0,0 +1,224 @@
+"""
+Synthetic inputs for offline benchmarks.
+
+Facility rows look like what the Tier B/C harvesters emit (name, operator, address,
+city, country, sources). A configurable share are near-duplicates of earlier rows
+with the kinds of noise seen across directory sites: case, suffix and one-letter
+typos. The other generators produce capacity blurbs, operator names, news articles
+and HTML pages for the extraction and fetch benchmarks. All are seeded.
+"""
+
+import random
+from datetime import datetime
+from typing import Any, Dict, List
+
+OPERATORS = [
+    'Safaricom', 'Africa Data Centres', 'iXAfrica', 'Raxio Group', 'Wingu.Africa',
+    'Liquid Intelligent Technologies', 'Equinix', 'Teraco', 'MainOne', 'Airtel Africa',
+    'Wananchi Group', 'Jamii Telecom', 'Kenya Data Networks', 'Digital Realty',
+    'Global Switch', 'Microsoft Corporation', 'Google', 'Amazon Web Services', 'Unknown',
+]
+
+CITIES = [
+    ('Nairobi', 'Kenya'), ('Mombasa', 'Kenya'), ('Kisumu', 'Kenya'), ('Nakuru', 'Kenya'),
+    ('Eldoret', 'Kenya'), ('Thika', 'Kenya'), ('Kampala', 'Uganda'), ('Kigali', 'Rwanda'),
+    ('Dar es Salaam', 'Tanzania'), ('Addis Ababa', 'Ethiopia'), ('Lagos', 'Nigeria'),
+    ('Accra', 'Ghana'), ('Johannesburg', 'South Africa'), ('Cape Town', 'South Africa'),
+    ('Cairo', 'Egypt'), ('Casablanca', 'Morocco'),
+]
+
+STREETS = [
+    'Mombasa Road', 'Waiyaki Way', 'Ngong Road', 'Kenyatta Avenue', 'Moi Avenue',
+    'Industrial Area', 'Upper Hill', 'Westlands', 'Tatu City', 'Konza Technopolis',
+]
+
+SYLLABLES = ['ka', 'ri', 'mo', 'ta', 'zu', 'ne', 'lo', 'vi', 'sa', 'po', 'ke', 'du', 'xi', 'ra']
+
+SUFFIXES = ['Data Center', 'Data Centre', 'DC', 'Campus', 'Facility']
+
+OPERATOR_KINDS = ['Networks', 'Telecom', 'Cloud', 'Hosting', 'Digital', 'Connect']
+
+# Real directories list a few dozen facilities per operator at most
+ROWS_PER_OPERATOR = 25
+
+
+def _brand(rng: random.Random) -> str:
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def _typo(rng: random.Random, text: str) -> str:
+    if len(text) < 5:
+        return text
+    i = rng.randrange(1, len(text) - 1)
+    op = rng.random()
+    if op < 0.4:
+        return text[:i] + text[i + 1:]
+    if op < 0.8:
+        return text[:i] + text[i] + text[i:]
+    return text.upper() if rng.random() < 0.5 else text.lower()
+
+
+def make_operators(rng: random.Random, n: int) -> List[str]:
+    extra = max(0, n // ROWS_PER_OPERATOR - len(OPERATORS))
+    return OPERATORS + [f"{_brand(rng)} {rng.choice(OPERATOR_KINDS)}" for _ in range(extra)]
+
+
+def make_facility(rng: random.Random, idx: int, operators: List[str] = OPERATORS) -> Dict[str, Any]:
+    operator = rng.choice(operators)
+    city, country = rng.choice(CITIES)
+    name = f"{_brand(rng)} {city.split()[0]} {rng.choice(SUFFIXES)} {idx % 97 + 1}"
+    street = rng.choice(STREETS)
+    return {
+        'name': name,
+        'operator': operator,
+        'address': f"{rng.randint(1, 400)} {street}, {city}, {country}",
+        'city': city,
+        'country': country,
+        'status': 'operational',
+        'ownership_type': 'foreign',
+        'sources': [{
+            'url': f"https://directory.example/{country.lower()}/{idx}",
+            'name': 'Synthetic directory',
+            'scraped_at': datetime(2025, 1, 1).isoformat(),
+            'verified': False,
+        }],
+    }
+
+
+def make_duplicate(rng: random.Random, original: Dict[str, Any], idx: int) -> Dict[str, Any]:
+    dup = make_facility(rng, idx)
+    dup.update({
+        'name': _typo(rng, original['name']),
+        'operator': original['operator'],
+        'address': original['address'],
+        'city': original['city'],
+        'country': original['country'],
+    })
+    return dup
+
+
+def make_facilities(n: int, dup_rate: float = 0.2, seed: int = 7) -> List[Dict[str, Any]]:
+    """``n`` rows, roughly ``dup_rate`` of which are noisy copies of earlier rows."""
+    rng = random.Random(seed)
+    operators = make_operators(rng, n)
+    rows: List[Dict[str, Any]] = []
+    for idx in range(n):
+        if rows and rng.random() < dup_rate:
+            rows.append(make_duplicate(rng, rng.choice(rows), idx))
+        else:
+            rows.append(make_facility(rng, idx, operators))
+    return rows
+
+
+CAPACITY_TEMPLATES = [
+    "{name} offers {mw} MW of IT load across {sqm} sqm of white space with {racks} racks.",
+    "The {sqft} sq ft facility will deliver {mw}MW when complete.",
+    "Phase one: {racks} racks, {mw} MW critical power, Tier III design.",
+    "{name} is a carrier-neutral colocation site in {city} with {sqm} square meters.",
+    "Located in {city}, the campus spans {sqft} square feet and hosts {racks} rack positions.",
+    "{name} provides interconnection and cloud on-ramps in {city}.",
+]
+
+NEWS_TOPICS = [
+    "{op} opens new data center in {city}",
+    "{op} expands hyperscale colocation capacity",
+    "Government announces AI infrastructure plan for {city}",
+    "{op} partners with Microsoft Azure on cloud infrastructure",
+    "Central bank holds rates steady in {city}",
+    "Football: {city} side wins derby",
+    "Farmers in {city} report bumper harvest",
+    "Startup in {city} raises seed round",
+]
+
+
+def make_capacity_texts(n: int, seed: int = 7) -> List[str]:
+    """Blurbs in the shapes directory and news pages use; some carry no figures."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        city, _country = rng.choice(CITIES)
+        texts.append(rng.choice(CAPACITY_TEMPLATES).format(
+            name=f"{_brand(rng)} {rng.choice(SUFFIXES)}",
+            city=city,
+            mw=rng.choice(['1.5', '4', '10', '20', '60']),
+            sqm=f"{rng.randint(1, 40) * 250:,}",
+            sqft=f"{rng.randint(1, 400) * 500:,}",
+            racks=rng.randint(50, 3000),
+        ))
+    return texts
+
+
+def make_operator_names(n: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    pool = OPERATORS + [f"{_brand(rng)} {rng.choice(OPERATOR_KINDS)}" for _ in range(200)]
+    pool += [f"{rng.choice(OPERATORS)} & {rng.choice(OPERATORS)}" for _ in range(20)]
+    return [rng.choice(pool) for _ in range(n)]
+
+
+def make_articles(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """RSS-entry-shaped dicts; roughly half mention data center keywords."""
+    rng = random.Random(seed)
+    articles = []
+    for i in range(n):
+        city, _country = rng.choice(CITIES)
+        title = rng.choice(NEWS_TOPICS).format(op=rng.choice(OPERATORS), city=city)
+        filler = ' '.join(_brand(rng).lower() for _ in range(rng.randint(20, 60)))
+        articles.append({
+            'title': title,
+            'url': f"https://news.example/{i}",
+            'published': datetime(2025, 1, 1).isoformat(),
+            'summary': f"{title}. {filler}",
+            'source': 'Synthetic news',
+        })
+    return articles
+
+
+def make_html_page(title: str, size: int = 64 * 1024, title_offset: int = 2048) -> bytes:
+    """An HTML document of about ``size`` bytes with ``<title>`` after ``title_offset`` bytes of head."""
+    head_filler = '<meta name="x" content="' + 'y' * max(0, title_offset - 40) + '">'
+    body_filler = '<p>' + 'lorem ipsum ' * max(0, (size - title_offset) // 12) + '</p>'
+    return (
+        f"<!doctype html><html><head>{head_filler}<title>{title}</title></head>"
+        f"<body>{body_filler}</body></html>"
+    ).encode('utf-8')
+
+
+def make_listing_page(n: int, class_: str = 'data-center-item', seed: int = 7) -> str:
+    """A directory page with ``n`` listing cards between navigation and ad blocks."""
+    rng = random.Random(seed)
+    cards = []
+    for idx in range(n):
+        row = make_facility(rng, idx)
+        cards.append(
+            f'<div class="{class_} card"><h3>{row["name"]}</h3>'
+            f'<div class="company">{row["operator"]}</div><div class="operator">{row["operator"]}</div>'
+            f'<div class="address">{row["address"]}</div><div class="location">{row["city"]}, {row["country"]}</div>'
+            f'<div class="specs">{rng.randint(1, 40)} MW, {rng.randint(50, 900)} racks</div></div>'
+            f'<div class="ad"><p>{"sponsored " * 30}</p></div>'
+        )
+    nav = '<a href="#">link</a>' * 300
+    return f'<html><head><title>Directory</title></head><body><nav>{nav}</nav>{"".join(cards)}</body></html>'
+
+
+def make_overpass_elements(n: int, bbox=(-4.72, 33.90, 5.03, 41.91), seed: int = 7) -> List[Dict[str, Any]]:
+    """``n`` Overpass ``out tags center`` elements (nodes and ways) spread over ``bbox``."""
+    rng = random.Random(seed)
+    south, west, north, east = bbox
+    elements = []
+    for idx in range(n):
+        row = make_facility(rng, idx)
+        lat, lon = round(rng.uniform(south, north), 7), round(rng.uniform(west, east), 7)
+        tags = {
+            'telecom': 'data_center',
+            'name': row['name'],
+            'operator': row['operator'],
+            'addr:street': rng.choice(STREETS),
+            'addr:city': row['city'],
+            'description': f"{rng.randint(1, 40)} MW, {rng.randint(50, 900)} racks",
+        }
+        if idx % 3:
+            elements.append({'type': 'node', 'id': 10_000_000 + idx, 'lat': lat, 'lon': lon, 'tags': tags})
+        else:
+            elements.append({'type': 'way', 'id': 20_000_000 + idx,
+                             'center': {'lat': lat, 'lon': lon}, 'tags': tags})
+    return elements
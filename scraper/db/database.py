@@ -1,44 +1,237 @@
 """
 Database handler for storing scraped data
+
+Connections come from a process-wide ``ThreadedConnectionPool`` per DSN. Every
+method runs inside ``Database.transaction()``, which checks a connection out for the
+calling thread, commits or rolls back, and hands it back. Harvester threads
+therefore write concurrently on their own connections, and a process that runs
+the pipeline repeatedly (the scheduler) reuses warm connections instead of
+reconnecting. Calls made inside an open ``transaction()`` on the same thread join
+it, so several writes can be committed together.
 """
 
 from __future__ import annotations
 
 import os
+import json
 import hashlib
-from typing import Dict, Any, List, Optional
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.extras import RealDictCursor, Json, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 
 load_dotenv()
 
+DEFAULT_DATABASE_URL = "postgresql://localhost:5432/datacenter_map"
+POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN", "1"))
+POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX", "8"))
+
 
-def _fingerprint_source_item(source_system: str, item: Dict[str, Any]) -> str:
+def candidate_external_id(source_system: str, item: Dict[str, Any]) -> str:
+    """
+    ``external_id`` a harvested row is staged under: a fingerprint of its name, city
+    and address, unless the caller pinned one in ``_external_id`` (a record staged
+    again after a merge filled those in must still update the same candidate).
+    """
+    pinned = item.get("_external_id")
+    if pinned:
+        return str(pinned)
     payload = f"{source_system}|{item.get('name', '')}|{item.get('city', '')}|{item.get('address', '')}"
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:40]
 
 
+def _payload_hash(clean: Dict[str, Any], raw_payload: Optional[Dict[str, Any]], urls: List[str], confidence: int) -> str:
+    """
+    Hash of what a candidate upsert would write. Source ``scraped_at`` stamps change
+    on every run without the row changing, so they are left out.
+    """
+    payload = dict(clean)
+    payload["sources"] = [
+        {k: v for k, v in s.items() if k != "scraped_at"} if isinstance(s, dict) else s
+        for s in clean.get("sources") or []
+    ]
+    blob = json.dumps(
+        [payload, raw_payload, urls, confidence],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:40]
+
+
+def _candidate_fields(item: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    clean = {k: v for k, v in item.items() if not str(k).startswith("_")}
+    urls: List[str] = []
+    for s in item.get("sources") or []:
+        u = s.get("url") if isinstance(s, dict) else None
+        if u:
+            urls.append(u)
+    return clean, urls
+
+
+class CandidateIndex:
+    """
+    Existing ``ingestion_candidates`` of one ``source_system``, loaded in one query:
+    ``external_id -> (id, status, payload_hash)``. ``insert_candidates_many`` checks
+    it to leave reviewed rows and unchanged pending rows alone, and keeps it current
+    with what it writes. ``unchanged`` counts the rows it let skip the database,
+    ``written`` the candidates actually inserted or updated.
+    """
+
+    def __init__(self, source_system: str, rows: Dict[str, Tuple[str, str, Optional[str]]]):
+        self.source_system = source_system
+        self.rows = rows
+        self.unchanged = 0
+        self.written = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def skip(self, external_id: str, payload_hash: str) -> Optional[str]:
+        """Candidate id when writing the row would change nothing, else None."""
+        existing = self.rows.get(external_id)
+        if existing is None:
+            return None
+        cid, status, stored_hash = existing
+        if status != "pending" or stored_hash == payload_hash:
+            return cid
+        return None
+
+
+def _ping(conn) -> None:
+    if conn.closed:
+        raise psycopg2.InterfaceError("connection already closed")
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+    conn.rollback()
+
+
+class ConnectionPool:
+    """
+    ``ThreadedConnectionPool`` that waits for a free connection instead of raising
+    when all ``maxconn`` are checked out. A connection is pinged with ``SELECT 1`` on
+    checkout and discarded if that fails, so one the server dropped while it sat idle
+    (restart, idle timeout, ``pg_terminate_backend``) is replaced before use.
+    """
+
+    def __init__(self, dsn: str, minconn: int = POOL_MIN_CONN, maxconn: int = POOL_MAX_CONN):
+        self.dsn = dsn
+        self.maxconn = max(1, maxconn)
+        self._pool = ThreadedConnectionPool(min(minconn, self.maxconn), self.maxconn, dsn)
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+
+    def getconn(self):
+        self._slots.acquire()
+        try:
+            # Every idle connection may be stale after a server restart; a fresh one
+            # failing the ping means the server is really unreachable
+            for attempt in range(self.maxconn + 1):
+                conn = self._pool.getconn()
+                try:
+                    _ping(conn)
+                    return conn
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    self._pool.putconn(conn, close=True)
+                    if attempt == self.maxconn:
+                        raise
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, close: bool = False) -> None:
+        try:
+            self._pool.putconn(conn, close=close or bool(conn.closed))
+        finally:
+            self._slots.release()
+
+    @property
+    def closed(self) -> bool:
+        return self._pool.closed
+
+    def close(self) -> None:
+        if not self._pool.closed:
+            self._pool.closeall()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def shared_pool(dsn: Optional[str] = None) -> ConnectionPool:
+    """The process-wide pool for ``dsn`` (default ``DATABASE_URL``), created on first use."""
+    dsn = dsn or os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
+    with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None or pool.closed:
+            pool = _pools[dsn] = ConnectionPool(dsn)
+        return pool
+
+
+def close_shared_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
 class Database:
-    def __init__(self):
-        self.conn = psycopg2.connect(
-            os.getenv("DATABASE_URL", "postgresql://localhost:5432/datacenter_map")
-        )
-        self.conn.autocommit = False
-        self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
+    def __init__(self, pool: Optional[ConnectionPool] = None):
+        self.pool = pool or shared_pool()
+        self._local = threading.local()
+        self._columns: Dict[Tuple[str, str], bool] = {}
+
+    @contextmanager
+    def transaction(self) -> Iterator[RealDictCursor]:
+        """
+        Cursor on a pooled connection for one transaction: committed when the block
+        exits, rolled back if it raises. Nested use on the same thread joins the
+        outer transaction under a savepoint, so a failed inner block can be caught
+        without aborting the outer one.
+        """
+        outer = getattr(self._local, "cursor", None)
+        if outer is not None:
+            outer.execute("SAVEPOINT nested")
+            try:
+                yield outer
+            except BaseException:
+                outer.execute("ROLLBACK TO SAVEPOINT nested")
+                raise
+            outer.execute("RELEASE SAVEPOINT nested")
+            return
+
+        conn = self.pool.getconn()
+        broken = False
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                self._local.cursor = cursor
+                try:
+                    yield cursor
+                finally:
+                    self._local.cursor = None
+            conn.commit()
+        except BaseException as e:
+            broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
+            raise
+        finally:
+            self.pool.putconn(conn, close=broken)
 
     def start_scrape_log(self, source_name: str) -> str:
-        self.cursor.execute(
-            """
-            INSERT INTO scrape_logs (source_name, started_at, status)
-            VALUES (%s, NOW(), 'running')
-            RETURNING id
-        """,
-            (source_name,),
-        )
-        rid = self.cursor.fetchone()["id"]
-        self.conn.commit()
+        with self.transaction() as cur:
+            cur.execute(
+                """
+                INSERT INTO scrape_logs (source_name, started_at, status)
+                VALUES (%s, NOW(), 'running')
+                RETURNING id
+            """,
+                (source_name,),
+            )
+            rid = cur.fetchone()["id"]
         return str(rid)
 
     def complete_scrape_log(
@@ -49,21 +242,94 @@ class Database:
         records_new: int,
         records_updated: int,
         error_message: Optional[str] = None,
+        metrics: Optional[Dict[str, Any]] = None,
     ) -> None:
-        self.cursor.execute(
+        """``metrics`` is stored in ``scrape_logs.metrics`` (migration 003) when given."""
+        metrics_sql = ",\n                metrics = %s" if metrics is not None else ""
+        params: List[Any] = [status, records_found, records_new, records_updated, error_message]
+        if metrics is not None:
+            params.append(Json(metrics))
+        params.append(log_id)
+        with self.transaction() as cur:
+            cur.execute(
+                f"""
+                UPDATE scrape_logs SET
+                    completed_at = NOW(),
+                    status = %s,
+                    records_found = %s,
+                    records_new = %s,
+                    records_updated = %s,
+                    error_message = %s{metrics_sql}
+                WHERE id = %s::uuid
+            """,
+                params,
+            )
+
+    def _has_column(self, table: str, column: str) -> bool:
+        """Whether a column added by a later migration exists yet (checked once)."""
+        key = (table, column)
+        if key not in self._columns:
+            with self.transaction() as cur:
+                cur.execute(
+                    """
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = %s AND column_name = %s
+                """,
+                    key,
+                )
+                self._columns[key] = cur.fetchone() is not None
+        return self._columns[key]
+
+    @property
+    def has_content_hash(self) -> bool:
+        """Whether ``data_centers.content_hash`` exists (migration 004)."""
+        return self._has_column("data_centers", "content_hash")
+
+    @property
+    def has_payload_hash(self) -> bool:
+        """Whether ``ingestion_candidates.payload_hash`` exists (migration 005)."""
+        return self._has_column("ingestion_candidates", "payload_hash")
+
+    def curated_hashes(self) -> Optional[Dict[Tuple[str, str], str]]:
+        """
+        ``content_hash`` of every row published from the curated catalogue, keyed by
+        ``(LOWER(name), LOWER(city))``; None before migration 004.
+        """
+        if not self.has_content_hash:
+            return None
+        with self.transaction() as cur:
+            cur.execute(
+                """
+                SELECT LOWER(name) AS name_key, LOWER(city) AS city_key, content_hash
+                FROM data_centers
+                WHERE content_hash IS NOT NULL
             """
-            UPDATE scrape_logs SET
-                completed_at = NOW(),
-                status = %s,
-                records_found = %s,
-                records_new = %s,
-                records_updated = %s,
-                error_message = %s
-            WHERE id = %s::uuid
-        """,
-            (status, records_found, records_new, records_updated, error_message, log_id),
-        )
-        self.conn.commit()
+            )
+            return {(row["name_key"], row["city_key"]): row["content_hash"] for row in cur.fetchall()}
+
+    def retire_curated(self, keys: List[Tuple[str, str]]) -> int:
+        """
+        Unpublish rows whose record left the curated catalogue (``verified = false``,
+        the row and its sources stay for admins). Returns the number of rows changed.
+        """
+        if not keys or not self.has_content_hash:
+            return 0
+        with self.transaction() as cur:
+            execute_values(
+                cur,
+                """
+                UPDATE data_centers dc SET
+                    verified = false,
+                    content_hash = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM (VALUES %s) AS k (name_key, city_key)
+                WHERE LOWER(dc.name) = k.name_key AND LOWER(dc.city) = k.city_key
+                    AND dc.content_hash IS NOT NULL
+            """,
+                keys,
+                page_size=1000,
+            )
+            return cur.rowcount
 
     def upsert_curated(self, data: Dict[str, Any]) -> bool:
         """
@@ -72,48 +338,40 @@ class Database:
         """
         return self._upsert_datacenter(data, facility_verified=True, sources_verified=True)
 
-    def _upsert_datacenter(
-        self,
-        data: Dict[str, Any],
-        *,
-        facility_verified: bool,
-        sources_verified: bool,
-    ) -> bool:
-        self.cursor.execute(
-            """
-            SELECT id FROM data_centers
-            WHERE LOWER(name) = LOWER(%s) AND LOWER(city) = LOWER(%s)
-        """,
-            (data["name"], data["city"]),
-        )
+    def upsert_curated_many(self, items: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Tier A batch upsert: all rows and their sources in one transaction, matched on
+        ``(LOWER(name), LOWER(city))`` (migration 002). Returns ``(new, updated)``.
+        Rows repeating a name/city earlier in the batch count as updates, last one wins.
+        Each row's ``content_hash`` is stored when migration 004 is applied.
+        """
+        if not items:
+            return 0, 0
 
-        existing = self.cursor.fetchone()
-        capacity = data.get("capacity") or {}
-        metadata = data.get("metadata") or {}
+        with_hash = self.has_content_hash
+        hash_column = ",\n                    content_hash" if with_hash else ""
+        hash_update = "\n                    content_hash = EXCLUDED.content_hash," if with_hash else ""
 
-        if existing:
-            dc_id = existing["id"]
-            self.cursor.execute(
-                """
-                UPDATE data_centers SET
-                    operator = %s,
-                    address = %s,
-                    country = %s,
-                    latitude = %s,
-                    longitude = %s,
-                    status = %s,
-                    ownership_type = %s,
-                    power_capacity_mw = %s,
-                    floor_space_sqm = %s,
-                    rack_count = %s,
-                    year_established = %s,
-                    verified = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-            """,
-                (
+        with self.transaction() as cur:
+            # Keys come from Postgres LOWER(), the unique index's own folding; Python's
+            # lower() can disagree with it outside ASCII
+            keys = self._lower_keys(cur, items)
+            by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            sources_by_key: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+            for key, data in zip(keys, items):
+                by_key[key] = data
+                sources_by_key.setdefault(key, []).extend(data.get("sources") or [])
+            repeats = len(items) - len(by_key)
+
+            rows = []
+            for data in by_key.values():
+                capacity = data.get("capacity") or {}
+                metadata = data.get("metadata") or {}
+                rows.append((
+                    data.get("name"),
                     data.get("operator"),
                     data.get("address"),
+                    data.get("city"),
                     data.get("country"),
                     data.get("latitude"),
                     data.get("longitude"),
@@ -123,75 +381,243 @@ class Database:
                     capacity.get("floor_space_sqm"),
                     capacity.get("racks"),
                     data.get("year_established"),
-                    facility_verified,
-                    dc_id,
-                ),
-            )
-            is_new = False
-        else:
-            self.cursor.execute(
-                """
+                    metadata.get("tier"),
+                    True,
+                ) + ((data.get("content_hash"),) if with_hash else ()))
+
+            returned = execute_values(
+                cur,
+                f"""
                 INSERT INTO data_centers (
                     name, operator, address, city, country,
                     latitude, longitude,
                     status, ownership_type,
                     power_capacity_mw, floor_space_sqm, rack_count,
                     year_established, tier_rating,
-                    verified
-                ) VALUES (
-                    %s, %s, %s, %s, %s,
-                    %s, %s,
-                    %s, %s,
-                    %s, %s, %s,
-                    %s, %s,
-                    %s
-                )
-                RETURNING id
+                    verified{hash_column}
+                ) VALUES %s
+                ON CONFLICT (LOWER(name), LOWER(city)) DO UPDATE SET
+                    operator = EXCLUDED.operator,
+                    address = EXCLUDED.address,
+                    country = EXCLUDED.country,
+                    latitude = EXCLUDED.latitude,
+                    longitude = EXCLUDED.longitude,
+                    status = EXCLUDED.status,
+                    ownership_type = EXCLUDED.ownership_type,
+                    power_capacity_mw = EXCLUDED.power_capacity_mw,
+                    floor_space_sqm = EXCLUDED.floor_space_sqm,
+                    rack_count = EXCLUDED.rack_count,
+                    year_established = EXCLUDED.year_established,
+                    verified = EXCLUDED.verified,{hash_update}
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING id, (xmax = 0) AS inserted, LOWER(name) AS name_key, LOWER(city) AS city_key
             """,
-                (
-                    data.get("name"),
-                    data.get("operator"),
-                    data.get("address"),
-                    data.get("city"),
-                    data.get("country"),
-                    data.get("latitude"),
-                    data.get("longitude"),
-                    data.get("status", "operational"),
-                    data.get("ownership_type", "foreign"),
-                    capacity.get("power_mw"),
-                    capacity.get("floor_space_sqm"),
-                    capacity.get("racks"),
-                    data.get("year_established"),
-                    metadata.get("tier"),
-                    facility_verified,
-                ),
+                rows,
+                page_size=1000,
+                fetch=True,
             )
-            dc_id = self.cursor.fetchone()["id"]
-            is_new = True
+            ids: Dict[Tuple[str, str], Any] = {}
+            new = 0
+            for row in returned:
+                ids[(row["name_key"], row["city_key"])] = row["id"]
+                new += 1 if row["inserted"] else 0
+            if ids.keys() != by_key.keys():
+                raise RuntimeError(f"Curated upsert returned {len(ids)} keys for {len(by_key)} rows")
 
-        for source in data.get("sources", []):
-            self.cursor.execute(
-                """
-                INSERT INTO sources (data_center_id, url, name, scraped_at, verified)
-                SELECT %s, %s, %s, %s::timestamptz, %s
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM sources WHERE data_center_id = %s AND url = %s
+            source_rows = []
+            seen = set()
+            for key, sources in sources_by_key.items():
+                dc_id = ids[key]
+                for source in sources:
+                    if (dc_id, source["url"]) in seen:
+                        continue
+                    seen.add((dc_id, source["url"]))
+                    source_rows.append((dc_id, source["url"], source["name"], source["scraped_at"], True))
+
+            if source_rows:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO sources (data_center_id, url, name, scraped_at, verified)
+                    SELECT v.data_center_id, v.url, v.name, v.scraped_at::timestamptz, v.verified
+                    FROM (VALUES %s) AS v (data_center_id, url, name, scraped_at, verified)
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM sources s
+                        WHERE s.data_center_id = v.data_center_id AND s.url = v.url
+                    )
+                """,
+                    source_rows,
+                    template="(%s::uuid, %s, %s, %s, %s)",
+                    page_size=1000,
                 )
+
+        return new, len(by_key) - new + repeats
+
+    def _lower_keys(self, cur: RealDictCursor, items: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """``(LOWER(name), LOWER(city))`` of each item as Postgres computes it, in input order."""
+        returned = execute_values(
+            cur,
+            """
+            SELECT v.pos, LOWER(v.name) AS name_key, LOWER(v.city) AS city_key
+            FROM (VALUES %s) AS v (pos, name, city)
+        """,
+            [(i, str(data["name"]), str(data["city"])) for i, data in enumerate(items)],
+            template="(%s, %s::text, %s::text)",
+            page_size=1000,
+            fetch=True,
+        )
+        keys: List[Tuple[str, str]] = [("", "")] * len(items)
+        for row in returned:
+            keys[row["pos"]] = (row["name_key"], row["city_key"])
+        return keys
+
+    def _upsert_datacenter(
+        self,
+        data: Dict[str, Any],
+        *,
+        facility_verified: bool,
+        sources_verified: bool,
+    ) -> bool:
+        with self.transaction() as cur:
+            cur.execute(
+                """
+                SELECT id FROM data_centers
+                WHERE LOWER(name) = LOWER(%s) AND LOWER(city) = LOWER(%s)
             """,
-                (
-                    dc_id,
-                    source["url"],
-                    source["name"],
-                    source["scraped_at"],
-                    sources_verified,
-                    dc_id,
-                    source["url"],
-                ),
+                (data["name"], data["city"]),
             )
 
-        self.conn.commit()
+            existing = cur.fetchone()
+            capacity = data.get("capacity") or {}
+            metadata = data.get("metadata") or {}
+
+            if existing:
+                dc_id = existing["id"]
+                cur.execute(
+                    """
+                    UPDATE data_centers SET
+                        operator = %s,
+                        address = %s,
+                        country = %s,
+                        latitude = %s,
+                        longitude = %s,
+                        status = %s,
+                        ownership_type = %s,
+                        power_capacity_mw = %s,
+                        floor_space_sqm = %s,
+                        rack_count = %s,
+                        year_established = %s,
+                        verified = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """,
+                    (
+                        data.get("operator"),
+                        data.get("address"),
+                        data.get("country"),
+                        data.get("latitude"),
+                        data.get("longitude"),
+                        data.get("status", "operational"),
+                        data.get("ownership_type", "foreign"),
+                        capacity.get("power_mw"),
+                        capacity.get("floor_space_sqm"),
+                        capacity.get("racks"),
+                        data.get("year_established"),
+                        facility_verified,
+                        dc_id,
+                    ),
+                )
+                is_new = False
+            else:
+                cur.execute(
+                    """
+                    INSERT INTO data_centers (
+                        name, operator, address, city, country,
+                        latitude, longitude,
+                        status, ownership_type,
+                        power_capacity_mw, floor_space_sqm, rack_count,
+                        year_established, tier_rating,
+                        verified
+                    ) VALUES (
+                        %s, %s, %s, %s, %s,
+                        %s, %s,
+                        %s, %s,
+                        %s, %s, %s,
+                        %s, %s,
+                        %s
+                    )
+                    RETURNING id
+                """,
+                    (
+                        data.get("name"),
+                        data.get("operator"),
+                        data.get("address"),
+                        data.get("city"),
+                        data.get("country"),
+                        data.get("latitude"),
+                        data.get("longitude"),
+                        data.get("status", "operational"),
+                        data.get("ownership_type", "foreign"),
+                        capacity.get("power_mw"),
+                        capacity.get("floor_space_sqm"),
+                        capacity.get("racks"),
+                        data.get("year_established"),
+                        metadata.get("tier"),
+                        facility_verified,
+                    ),
+                )
+                dc_id = cur.fetchone()["id"]
+                is_new = True
+
+            if facility_verified and data.get("content_hash") and self.has_content_hash:
+                cur.execute(
+                    "UPDATE data_centers SET content_hash = %s WHERE id = %s",
+                    (data["content_hash"], dc_id),
+                )
+
+            for source in data.get("sources", []):
+                cur.execute(
+                    """
+                    INSERT INTO sources (data_center_id, url, name, scraped_at, verified)
+                    SELECT %s, %s, %s, %s::timestamptz, %s
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM sources WHERE data_center_id = %s AND url = %s
+                    )
+                """,
+                    (
+                        dc_id,
+                        source["url"],
+                        source["name"],
+                        source["scraped_at"],
+                        sources_verified,
+                        dc_id,
+                        source["url"],
+                    ),
+                )
+
         return is_new
 
+    def candidate_index(self, source_system: str) -> Optional[CandidateIndex]:
+        """
+        Every candidate of ``source_system`` with its status and payload hash, for
+        ``insert_candidates_many(index=...)``; None before migration 005.
+        """
+        if not self.has_payload_hash:
+            return None
+        with self.transaction() as cur:
+            cur.execute(
+                """
+                SELECT id, external_id, status, payload_hash FROM ingestion_candidates
+                WHERE source_system = %s
+            """,
+                (source_system,),
+            )
+            rows = {
+                row["external_id"]: (str(row["id"]), row["status"], row["payload_hash"])
+                for row in cur.fetchall()
+            }
+        return CandidateIndex(source_system, rows)
+
     def insert_candidate(
         self,
         item: Dict[str, Any],
@@ -200,59 +626,119 @@ class Database:
         country_scope: str = "Kenya",
         confidence: int = 55,
         raw_payload: Optional[Dict[str, Any]] = None,
+        index: Optional[CandidateIndex] = None,
     ) -> str:
         """
         Tier B/C: stage a harvested row for admin review.
-        Returns candidate id (uuid str). Upserts pending rows by (source_system, external_id).
+        Returns candidate id (uuid str). Upserts pending rows by (source_system, external_id);
+        a pending row whose payload hash is unchanged is not rewritten. A write is
+        counted on ``index`` when given.
         """
-        ext = _fingerprint_source_item(source_system, item)
-        clean = {k: v for k, v in item.items() if not str(k).startswith("_")}
-        urls: List[str] = []
-        for s in item.get("sources") or []:
-            u = s.get("url") if isinstance(s, dict) else None
-            if u:
-                urls.append(u)
-
-        self.cursor.execute(
-            """
-            SELECT id, status FROM ingestion_candidates
-            WHERE source_system = %s AND external_id = %s
-        """,
-            (source_system, ext),
-        )
-        existing = self.cursor.fetchone()
-
-        if existing and existing["status"] != "pending":
-            return str(existing["id"])
+        ext = candidate_external_id(source_system, item)
+        clean, urls = _candidate_fields(item)
+        with_hash = self.has_payload_hash
+        payload_hash = _payload_hash(clean, raw_payload, urls, confidence) if with_hash else None
+        hash_select = ", payload_hash" if with_hash else ""
+        hash_column = ",\n                        payload_hash = %s" if with_hash else ""
 
-        if existing:
-            self.cursor.execute(
-                """
-                UPDATE ingestion_candidates SET
-                    candidate_payload = %s,
-                    raw_payload = %s,
-                    source_urls = %s,
-                    confidence = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
+        with self.transaction() as cur:
+            cur.execute(
+                f"""
+                SELECT id, status{hash_select} FROM ingestion_candidates
+                WHERE source_system = %s AND external_id = %s
             """,
-                (Json(clean), Json(raw_payload) if raw_payload is not None else None, urls, confidence, existing["id"]),
+                (source_system, ext),
             )
-            self.conn.commit()
-            return str(existing["id"])
+            existing = cur.fetchone()
 
-        self.cursor.execute(
-            """
-            INSERT INTO ingestion_candidates (
-                status, source_system, external_id, country_scope,
-                candidate_payload, raw_payload, source_urls, confidence
-            ) VALUES (
-                'pending', %s, %s, %s,
-                %s, %s, %s, %s
-            )
-            RETURNING id
-        """,
-            (
+            if existing and existing["status"] != "pending":
+                return str(existing["id"])
+            if existing and with_hash and existing["payload_hash"] == payload_hash:
+                return str(existing["id"])
+
+            if existing:
+                cur.execute(
+                    f"""
+                    UPDATE ingestion_candidates SET
+                        candidate_payload = %s,
+                        raw_payload = %s,
+                        source_urls = %s,
+                        confidence = %s{hash_column},
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """,
+                    (Json(clean), Json(raw_payload) if raw_payload is not None else None, urls, confidence)
+                    + ((payload_hash,) if with_hash else ())
+                    + (existing["id"],),
+                )
+                cid = str(existing["id"])
+            else:
+                cur.execute(
+                    f"""
+                    INSERT INTO ingestion_candidates (
+                        status, source_system, external_id, country_scope,
+                        candidate_payload, raw_payload, source_urls, confidence{hash_select}
+                    ) VALUES (
+                        'pending', %s, %s, %s,
+                        %s, %s, %s, %s{", %s" if with_hash else ""}
+                    )
+                    RETURNING id
+                """,
+                    (
+                        source_system,
+                        ext,
+                        country_scope,
+                        Json(clean),
+                        Json(raw_payload) if raw_payload is not None else None,
+                        urls,
+                        confidence,
+                    ) + ((payload_hash,) if with_hash else ()),
+                )
+                cid = str(cur.fetchone()["id"])
+
+        if index is not None:
+            index.written += 1
+            index.rows[ext] = (cid, "pending", payload_hash)
+        return cid
+
+    def insert_candidates_many(
+        self,
+        items: List[Dict[str, Any]],
+        source_system: str,
+        *,
+        country_scope: str = "Kenya",
+        confidence: int = 55,
+        raw_payloads: Optional[List[Optional[Dict[str, Any]]]] = None,
+        index: Optional[CandidateIndex] = None,
+    ) -> List[str]:
+        """
+        Batch form of ``insert_candidate``: one statement for the whole harvest.
+        Pending rows are refreshed, reviewed rows (approved/rejected/duplicate) are never
+        touched. With ``index`` (``candidate_index``), rows it shows as reviewed or
+        unchanged are not sent at all, so a harvest that found nothing new only reads.
+        Returns candidate ids in input order; repeated items share an id.
+        """
+        if not items:
+            return []
+
+        with_hash = self.has_payload_hash
+        externals = [candidate_external_id(source_system, item) for item in items]
+        ids: Dict[str, str] = {}
+        rows_by_ext: Dict[str, tuple] = {}
+        hashes: Dict[str, Optional[str]] = {}
+        for i, (ext, item) in enumerate(zip(externals, items)):
+            raw_payload = raw_payloads[i] if raw_payloads is not None else None
+            clean, urls = _candidate_fields(item)
+            payload_hash = _payload_hash(clean, raw_payload, urls, confidence) if with_hash else None
+            known = index.skip(ext, payload_hash) if index is not None and with_hash else None
+            if known is not None:
+                ids[ext] = known
+                rows_by_ext.pop(ext, None)  # a later identical repeat overrides an earlier edit
+                continue
+            ids.pop(ext, None)
+            # Last occurrence wins, as with sequential insert_candidate calls
+            hashes[ext] = payload_hash
+            rows_by_ext[ext] = (
                 source_system,
                 ext,
                 country_scope,
@@ -260,13 +746,64 @@ class Database:
                 Json(raw_payload) if raw_payload is not None else None,
                 urls,
                 confidence,
-            ),
-        )
-        row = self.cursor.fetchone()
-        self.conn.commit()
-        return str(row["id"])
-
-    def close(self):
-        """Close database connection"""
-        self.cursor.close()
-        self.conn.close()
+            ) + ((payload_hash,) if with_hash else ())
+        if index is not None:
+            index.unchanged += len(set(externals)) - len(rows_by_ext)
+
+        if rows_by_ext:
+            hash_column = ", payload_hash" if with_hash else ""
+            hash_update = "\n                    payload_hash = EXCLUDED.payload_hash," if with_hash else ""
+            with self.transaction() as cur:
+                returned = execute_values(
+                    cur,
+                    f"""
+                    INSERT INTO ingestion_candidates (
+                        status, source_system, external_id, country_scope,
+                        candidate_payload, raw_payload, source_urls, confidence{hash_column}
+                    ) VALUES %s
+                    ON CONFLICT (source_system, external_id) DO UPDATE SET
+                        candidate_payload = EXCLUDED.candidate_payload,
+                        raw_payload = EXCLUDED.raw_payload,
+                        source_urls = EXCLUDED.source_urls,
+                        confidence = EXCLUDED.confidence,{hash_update}
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE ingestion_candidates.status = 'pending'
+                    RETURNING id, external_id
+                """,
+                    list(rows_by_ext.values()),
+                    template="('pending', %s, %s, %s, %s, %s, %s::text[], %s" + (", %s)" if with_hash else ")"),
+                    page_size=len(rows_by_ext),
+                    fetch=True,
+                )
+                written = {row["external_id"]: str(row["id"]) for row in returned}
+                ids.update(written)
+
+                # Reviewed rows are skipped by the WHERE above and not returned
+                reviewed = [ext for ext in rows_by_ext if ext not in written]
+                if reviewed:
+                    cur.execute(
+                        """
+                        SELECT id, external_id, status FROM ingestion_candidates
+                        WHERE source_system = %s AND external_id = ANY(%s)
+                    """,
+                        (source_system, reviewed),
+                    )
+                    for row in cur.fetchall():
+                        ids[row["external_id"]] = str(row["id"])
+                        if index is not None:
+                            index.rows[row["external_id"]] = (str(row["id"]), row["status"], None)
+
+            if index is not None:
+                index.written += len(written)
+                for ext, cid in written.items():
+                    index.rows[ext] = (cid, "pending", hashes[ext])
+
+        return [ids[ext] for ext in externals]
+
+    def close(self, close_pool: bool = False):
+        """
+        Release this handle. The shared pool stays open for the next run in this
+        process unless ``close_pool`` is set.
+        """
+        if close_pool:
+            self.pool.close()
@@ -0,0 +1,404 @@
+"""
+Streaming Tier B/C harvest: scrape → dedup → geocode → check location → stage candidates.
+
+Each stage runs on its own thread and hands rows to the next through a bounded
+queue, so candidates start landing in ``ingestion_candidates`` while later pages
+are still being fetched and geocoded, and at most ``queue_size`` rows wait between
+any two stages. Rows are normalized by the scrapers' ``parse_listing``, so scraping
+and normalizing are one stage.
+
+``run_harvesters`` runs every harvester's stream at once (they hit different hosts),
+each with its own deadline; one failing or timing out does not affect the others.
+
+Staging starts by loading the harvester's existing candidates (``candidate_index``),
+so rows already staged with the same payload, or already reviewed, never reach the
+database again. Each batch is checked against the country outline first
+(``LocationValidator``); rows outside are re-geocoded by city or staged with
+``location_check = 'outside_bounds'``.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from db.database import CandidateIndex, Database, candidate_external_id
+from instrumentation import RunMetrics
+from processors.deduplicator import Deduplicator
+from processors.geocoder import Geocoder
+from processors.location_validator import LocationValidator
+from scrapers.base_scraper import BaseScraper
+from scrapers.fetch import run_bounded
+
+DEFAULT_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+DEFAULT_BATCH_SIZE = int(os.getenv("PIPELINE_BATCH_SIZE", "100"))
+DEFAULT_BATCH_WAIT_S = float(os.getenv("PIPELINE_BATCH_WAIT_S", "2.0"))
+DEFAULT_HARVEST_TIMEOUT_S = float(os.getenv("HARVEST_TIMEOUT_S", "900"))
+
+StageFn = Callable[[Any], Iterable[Any]]
+FlushFn = Callable[[], Iterable[Any]]
+
+_END = object()
+
+
+class HarvestTimeout(Exception):
+    """A harvester ran past its deadline; rows staged before it are kept."""
+
+
+class _Failure:
+    """Carries an exception from a stage thread to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class StreamPipeline:
+    """
+    ``source`` feeds a chain of stages; each stage maps one item to zero or more.
+    ``flush`` (optional) runs when its input is exhausted and may emit more items.
+    The consumer pulls the output in batches. An exception in any stage stops the
+    pipeline and is re-raised to the consumer.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[Any],
+        *,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        metrics: Optional[RunMetrics] = None,
+        prefix: str = "pipeline",
+    ):
+        self.source = source
+        self.queue_size = queue_size
+        self.metrics = metrics
+        self.prefix = prefix
+        self._stages: List[Tuple[str, StageFn, Optional[FlushFn]]] = []
+        self._stop = threading.Event()
+
+    def stage(self, name: str, fn: StageFn, flush: Optional[FlushFn] = None) -> "StreamPipeline":
+        self._stages.append((name, fn, flush))
+        return self
+
+    def _put(self, q: "queue.Queue[Any]", item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _timed(self, name: str, fn: Callable[[], Iterable[Any]]) -> List[Any]:
+        if self.metrics is None:
+            return list(fn())
+        with self.metrics.stage(f"{self.prefix}.{name}", items_in=1) as st:
+            out = list(fn())
+            st.items_out = len(out)
+        return out
+
+    def _run_source(self, out_q: "queue.Queue[Any]") -> None:
+        try:
+            it = iter(self.source)
+            while not self._stop.is_set():
+                items = self._timed("scrape", lambda: _next_or_empty(it))
+                if not items:
+                    break
+                if not self._put(out_q, items[0]):
+                    return
+            self._put(out_q, _END)
+        except BaseException as e:  # noqa: BLE001 — forwarded to the consumer
+            self._put(out_q, _Failure(e))
+
+    def _run_stage(
+        self,
+        name: str,
+        fn: StageFn,
+        flush: Optional[FlushFn],
+        in_q: "queue.Queue[Any]",
+        out_q: "queue.Queue[Any]",
+    ) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = in_q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if isinstance(item, _Failure):
+                    self._put(out_q, item)
+                    return
+                if item is _END:
+                    if flush is not None:
+                        for out in self._timed(f"{name}_flush", flush):
+                            if not self._put(out_q, out):
+                                return
+                    self._put(out_q, _END)
+                    return
+                for out in self._timed(name, lambda: fn(item)):
+                    if not self._put(out_q, out):
+                        return
+        except BaseException as e:  # noqa: BLE001 — forwarded to the consumer
+            self._put(out_q, _Failure(e))
+
+    def batches(
+        self,
+        size: int = DEFAULT_BATCH_SIZE,
+        max_wait_s: float = DEFAULT_BATCH_WAIT_S,
+        deadline: Optional[float] = None,
+    ) -> Iterator[List[Any]]:
+        """
+        Yield output in lists of up to ``size`` items; a partial batch is released
+        after ``max_wait_s`` so slow sources still trickle into the database.
+        Past ``deadline`` (``time.monotonic()``) the stages are stopped and
+        ``HarvestTimeout`` is raised.
+        """
+        queues: List["queue.Queue[Any]"] = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self._stages) + 1)
+        ]
+        threads = [threading.Thread(target=self._run_source, args=(queues[0],), daemon=True)]
+        for i, (name, fn, flush) in enumerate(self._stages):
+            threads.append(threading.Thread(
+                target=self._run_stage, args=(name, fn, flush, queues[i], queues[i + 1]), daemon=True
+            ))
+        for t in threads:
+            t.start()
+
+        out_q = queues[-1]
+        batch: List[Any] = []
+        first_at = 0.0
+        try:
+            while True:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    if batch:
+                        yield batch
+                    raise HarvestTimeout(f"{self.prefix} timed out")
+                flush_at = first_at + max_wait_s if batch else float("inf")
+                wait_until = min(flush_at, deadline if deadline is not None else float("inf"))
+                timeout = None if wait_until == float("inf") else max(0.0, wait_until - now)
+                try:
+                    item = out_q.get(timeout=timeout)
+                except queue.Empty:
+                    if batch and time.monotonic() >= flush_at:
+                        yield batch
+                        batch = []
+                    continue
+                if isinstance(item, _Failure):
+                    raise item.error
+                if item is _END:
+                    if batch:
+                        yield batch
+                    return
+                if not batch:
+                    first_at = time.monotonic()
+                batch.append(item)
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+        finally:
+            self._stop.set()
+            for t in threads:
+                t.join(timeout=5)
+
+
+def _next_or_empty(it: Iterator[Any]) -> List[Any]:
+    for item in it:
+        return [item]
+    return []
+
+
+def _snapshot(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a deduplicated record to pass downstream. Later merges mutate the kept
+    record (sources, capacity) while geocoding and staging may be reading the copy.
+    """
+    out = dict(record)
+    out["sources"] = list(record.get("sources") or [])
+    if isinstance(record.get("capacity"), dict):
+        out["capacity"] = dict(record["capacity"])
+    return out
+
+
+class HarvestResult:
+    def __init__(self, source_system: str, name: str):
+        self.source_system = source_system
+        self.name = name
+        self.raw_rows = 0
+        self.staged = 0
+        self.unchanged = 0
+        self.written = 0  # candidates actually inserted or updated
+        self.outside_bounds = 0
+        self.seconds = 0.0
+        self.error: Optional[BaseException] = None
+
+
+def stream_harvest(
+    scraper: BaseScraper,
+    db: Database,
+    deduplicator: Deduplicator,
+    geocoder: Geocoder,
+    *,
+    confidence: int,
+    country_scope: str = "Kenya",
+    metrics: Optional[RunMetrics] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    timeout_s: Optional[float] = None,
+    progress: Optional[HarvestResult] = None,
+) -> Tuple[int, int]:
+    """
+    Stage one harvester's rows as they arrive. Records that absorb a later duplicate
+    are staged again when the scrape ends, with the merged sources. Each record keeps
+    the candidate key it was first staged under, so that is an update of the same
+    pending row even when the merge filled in its name, city or address.
+    Each batch is written in its own pooled transaction, so harvests sharing ``db``
+    write concurrently; ``progress`` is kept up to date so counts survive a timeout
+    or failure part-way.
+    Returns ``(raw rows scraped, distinct candidates staged)``; ``progress.unchanged``
+    counts those that needed no write and ``progress.written`` the real inserts and
+    updates.
+    """
+    state = deduplicator.incremental()
+    progress = progress or HarvestResult(scraper.source_system, scraper.name)
+    try:
+        index = db.candidate_index(scraper.source_system)
+    except Exception as e:
+        print(f"⚠️  Could not load existing candidates for {scraper.source_system}: {e}")
+        # Every row is sent; the empty index still counts what gets written
+        index = CandidateIndex(scraper.source_system, {})
+
+    def dedup(row: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        progress.raw_rows += 1
+        if state.add(row):
+            row["_external_id"] = candidate_external_id(scraper.source_system, row)
+            yield _snapshot(row)
+
+    def dedup_flush() -> Iterator[Dict[str, Any]]:
+        for record in state.pop_updated():
+            yield _snapshot(record)
+
+    def geocode(row: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        try:
+            geocoded = geocoder.geocode(row)
+        except Exception as e:
+            print(f"⚠️  Geocoding failed for {row.get('name', 'unknown')}: {e}")
+            return
+        if geocoded:
+            yield geocoded
+
+    pipeline = (
+        StreamPipeline(
+            scraper.iter_scrape(),
+            queue_size=queue_size,
+            metrics=metrics,
+            prefix=f"harvest.{scraper.source_system}",
+        )
+        .stage("dedup", dedup, flush=dedup_flush)
+        .stage("geocode", geocode)
+    )
+
+    # Out-of-country coordinates are re-geocoded by city or flagged for the reviewer
+    validator = LocationValidator(geocoder)
+    deadline = time.monotonic() + timeout_s if timeout_s else None
+    staged: Set[str] = set()
+    for batch in pipeline.batches(batch_size, deadline=deadline):
+        validator.validate(batch, default_country=country_scope)
+        progress.outside_bounds = validator.flagged
+        staged.update(_stage_batch(db, batch, scraper.source_system, country_scope, confidence, metrics, index))
+        progress.staged = len(staged)
+        progress.unchanged = index.unchanged
+        progress.written = index.written
+    if metrics is not None:
+        metrics.count(f"harvest.{scraper.source_system}.unchanged", index.unchanged)
+        metrics.count(f"harvest.{scraper.source_system}.written", index.written)
+        metrics.count(f"harvest.{scraper.source_system}.regeocoded", validator.regeocoded)
+        metrics.count(f"harvest.{scraper.source_system}.outside_bounds", validator.flagged)
+    return progress.raw_rows, progress.staged
+
+
+def run_harvesters(
+    harvesters: List[BaseScraper],
+    db: Database,
+    deduplicator: Deduplicator,
+    geocoder: Geocoder,
+    *,
+    confidence_for: Callable[[str], int],
+    country_scope: str = "Kenya",
+    metrics: Optional[RunMetrics] = None,
+    timeout_s: float = DEFAULT_HARVEST_TIMEOUT_S,
+) -> List[HarvestResult]:
+    """
+    Run all harvesters in parallel, each deduplicated and staged under its own
+    ``source_system``. Results come back in ``harvesters`` order; a failure or
+    timeout is recorded on that harvester's result and never raised.
+    """
+    def harvest(scraper: BaseScraper) -> HarvestResult:
+        result = HarvestResult(scraper.source_system, scraper.name)
+        start = time.perf_counter()
+        try:
+            stream_harvest(
+                scraper,
+                db,
+                deduplicator,
+                geocoder,
+                confidence=confidence_for(scraper.source_system),
+                country_scope=country_scope,
+                metrics=metrics,
+                timeout_s=timeout_s,
+                progress=result,
+            )
+        except Exception as e:  # noqa: BLE001 — isolated per harvester
+            result.error = e
+        result.seconds = time.perf_counter() - start
+        return result
+
+    outcomes = run_bounded(harvest, harvesters, max_workers=max(1, len(harvesters)))
+    return [result for result, _error in outcomes]
+
+
+def _stage_batch(
+    db: Database,
+    batch: List[Dict[str, Any]],
+    source_system: str,
+    country_scope: str,
+    confidence: int,
+    metrics: Optional[RunMetrics],
+    index: Optional[CandidateIndex] = None,
+) -> List[str]:
+    stage = f"harvest.{source_system}.db_write"
+    if metrics is None:
+        return _insert_candidates(db, batch, source_system, country_scope, confidence, metrics, index)
+    with metrics.stage(stage, items_in=len(batch)) as st:
+        ids = _insert_candidates(db, batch, source_system, country_scope, confidence, metrics, index)
+        st.items_out = len(ids)
+    return ids
+
+
+def _insert_candidates(
+    db: Database,
+    batch: List[Dict[str, Any]],
+    source_system: str,
+    country_scope: str,
+    confidence: int,
+    metrics: Optional[RunMetrics],
+    index: Optional[CandidateIndex] = None,
+) -> List[str]:
+    try:
+        return db.insert_candidates_many(
+            batch, source_system, country_scope=country_scope, confidence=confidence, index=index
+        )
+    except Exception as e:
+        print(f"⚠️  Batch candidate insert failed, retrying row by row: {e}")
+        if metrics is not None:
+            metrics.count(f"harvest.{source_system}.batch_fallback")
+    ids = []
+    for item in batch:
+        try:
+            ids.append(db.insert_candidate(
+                item, source_system, country_scope=country_scope, confidence=confidence, index=index
+            ))
+        except Exception as e:
+            print(f"⚠️  Candidate insert failed {item.get('name', 'unknown')}: {e}")
+    return ids
@@ -0,0 +1,221 @@
+"""
+Run metrics for the scraper pipeline: stage timers, item counts and HTTP latency.
+
+One ``RunMetrics`` lives for a pipeline run. Stages are timed with
+``metrics.stage("tier_a.geocode", items_in=n)``; sessions report every response
+through a ``requests`` hook once passed to ``instrument_session``. At the end the
+snapshot is written as JSON next to the run, stored on the ``scrape_logs`` row,
+and optionally as a Prometheus textfile for node_exporter's textfile collector.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+from scrapers.fetch import host_of
+
+# Upper bounds (seconds) of the HTTP latency histogram buckets; +Inf is implied
+LATENCY_BUCKETS_S = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class StageTimer:
+    """Handle yielded by ``RunMetrics.stage``; set ``items_out`` once known."""
+
+    def __init__(self, items_in: Optional[int] = None):
+        self.items_in = items_in
+        self.items_out: Optional[int] = None
+
+
+class RunMetrics:
+    def __init__(self, run_name: str):
+        self.run_name = run_name
+        self.scrape_log_id: Optional[str] = None
+        self.started_at = datetime.now(timezone.utc)
+        self.completed_at: Optional[datetime] = None
+        self.status = "running"
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+        self.sections: Dict[str, Any] = {}
+        self.http_requests = 0
+        self.http_by_status: Dict[str, int] = {}
+        self.http_by_cache: Dict[str, int] = {}
+        self.http_by_host: Dict[str, int] = {}
+        self.http_latency_buckets: List[int] = [0] * (len(LATENCY_BUCKETS_S) + 1)
+        self.http_latency_sum_s = 0.0
+
+    @contextmanager
+    def stage(self, name: str, items_in: Optional[int] = None) -> Iterator[StageTimer]:
+        """Time a block; repeated stages accumulate seconds, calls and item counts."""
+        timer = StageTimer(items_in)
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.stages.setdefault(
+                    name, {"seconds": 0.0, "calls": 0, "items_in": 0, "items_out": 0}
+                )
+                entry["seconds"] += elapsed
+                entry["calls"] += 1
+                entry["items_in"] += timer.items_in or 0
+                entry["items_out"] += timer.items_out or 0
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_section(self, name: str, data: Any) -> None:
+        """Attach an already-aggregated block, e.g. a cache's ``stats()``."""
+        with self._lock:
+            self.sections[name] = data
+
+    def instrument_session(self, session: requests.Session) -> requests.Session:
+        if self._on_response not in session.hooks["response"]:
+            session.hooks["response"].append(self._on_response)
+        return session
+
+    def _on_response(self, response: requests.Response, *args: Any, **kwargs: Any) -> None:
+        # ``elapsed`` runs from sending to parsing the headers; cache hits report 0
+        latency = response.elapsed.total_seconds()
+        bucket = len(LATENCY_BUCKETS_S)
+        for i, bound in enumerate(LATENCY_BUCKETS_S):
+            if latency <= bound:
+                bucket = i
+                break
+        status = f"{response.status_code // 100}xx"
+        cache = response.headers.get("X-Cache", "NONE")
+        host = host_of(response.url or "")
+        with self._lock:
+            self.http_requests += 1
+            self.http_by_status[status] = self.http_by_status.get(status, 0) + 1
+            self.http_by_cache[cache] = self.http_by_cache.get(cache, 0) + 1
+            self.http_by_host[host] = self.http_by_host.get(host, 0) + 1
+            self.http_latency_buckets[bucket] += 1
+            self.http_latency_sum_s += latency
+
+    def finish(self, status: str) -> None:
+        self.status = status
+        self.completed_at = datetime.now(timezone.utc)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            duration = time.perf_counter() - self._t0
+            stages = {
+                name: {
+                    **entry,
+                    "seconds": round(entry["seconds"], 4),
+                    # Throughput over what the stage consumed, or produced for sources
+                    "items_per_s": (
+                        round((entry["items_in"] or entry["items_out"]) / entry["seconds"], 2)
+                        if entry["seconds"] > 0 else None
+                    ),
+                }
+                for name, entry in self.stages.items()
+            }
+            cumulative = 0
+            histogram = {}
+            for bound, n in zip([*map(str, LATENCY_BUCKETS_S), "+Inf"], self.http_latency_buckets):
+                cumulative += n
+                histogram[bound] = cumulative
+            return {
+                "run": self.run_name,
+                "scrape_log_id": self.scrape_log_id,
+                "status": self.status,
+                "started_at": self.started_at.isoformat(),
+                "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+                "duration_s": round(duration, 3),
+                "stages": stages,
+                "counters": dict(self.counters),
+                "http": {
+                    "requests": self.http_requests,
+                    "by_status": dict(self.http_by_status),
+                    "by_cache": dict(self.http_by_cache),
+                    "by_host": dict(self.http_by_host),
+                    "latency_sum_s": round(self.http_latency_sum_s, 4),
+                    "latency_histogram": histogram,
+                },
+                **self.sections,
+            }
+
+    def write_json(self, directory: Optional[str] = None) -> str:
+        directory = directory or os.getenv("METRICS_DIR") or "."
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(
+            directory, f"run_metrics_{self.started_at.astimezone().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def write_prometheus(self, path: str) -> None:
+        """Textfile collector format; written to a temp file and renamed so it is never read half-done."""
+        snap = self.to_dict()
+        run = _label(self.run_name)
+        lines = [
+            "# HELP dcmap_scraper_run_duration_seconds Wall time of the last scraper run.",
+            "# TYPE dcmap_scraper_run_duration_seconds gauge",
+            f'dcmap_scraper_run_duration_seconds{{run="{run}"}} {snap["duration_s"]}',
+            "# HELP dcmap_scraper_run_success Whether the last scraper run completed.",
+            "# TYPE dcmap_scraper_run_success gauge",
+            f'dcmap_scraper_run_success{{run="{run}"}} {int(self.status == "completed")}',
+            "# HELP dcmap_scraper_stage_seconds Time spent per pipeline stage in the last run.",
+            "# TYPE dcmap_scraper_stage_seconds gauge",
+        ]
+        for name, entry in snap["stages"].items():
+            lines.append(f'dcmap_scraper_stage_seconds{{run="{run}",stage="{_label(name)}"}} {entry["seconds"]}')
+        lines += [
+            "# HELP dcmap_scraper_stage_items Items entering each pipeline stage in the last run.",
+            "# TYPE dcmap_scraper_stage_items gauge",
+        ]
+        for name, entry in snap["stages"].items():
+            lines.append(f'dcmap_scraper_stage_items{{run="{run}",stage="{_label(name)}"}} {entry["items_in"]}')
+        lines += [
+            "# HELP dcmap_scraper_count Pipeline counters from the last run.",
+            "# TYPE dcmap_scraper_count gauge",
+        ]
+        for name, value in snap["counters"].items():
+            lines.append(f'dcmap_scraper_count{{run="{run}",name="{_label(name)}"}} {value}')
+
+        http = snap["http"]
+        lines += [
+            "# HELP dcmap_scraper_http_request_seconds HTTP latency (time to response headers) in the last run.",
+            "# TYPE dcmap_scraper_http_request_seconds histogram",
+        ]
+        for bound, cumulative in http["latency_histogram"].items():
+            lines.append(f'dcmap_scraper_http_request_seconds_bucket{{run="{run}",le="{bound}"}} {cumulative}')
+        lines.append(f'dcmap_scraper_http_request_seconds_sum{{run="{run}"}} {http["latency_sum_s"]}')
+        lines.append(f'dcmap_scraper_http_request_seconds_count{{run="{run}"}} {http["requests"]}')
+        lines += [
+            "# HELP dcmap_scraper_http_cache_responses HTTP responses by cache outcome in the last run.",
+            "# TYPE dcmap_scraper_http_cache_responses gauge",
+        ]
+        for outcome, n in http["by_cache"].items():
+            lines.append(f'dcmap_scraper_http_cache_responses{{run="{run}",outcome="{_label(outcome)}"}} {n}')
+
+        geocode = snap.get("geocode_cache") or {}
+        if geocode.get("hit_rate") is not None:
+            lines += [
+                "# HELP dcmap_scraper_geocode_cache_hit_ratio Geocode cache hit rate in the last run.",
+                "# TYPE dcmap_scraper_geocode_cache_hit_ratio gauge",
+                f'dcmap_scraper_geocode_cache_hit_ratio{{run="{run}"}} {geocode["hit_rate"]}',
+            ]
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
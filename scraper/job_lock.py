@@ -0,0 +1,89 @@
+"""
+Per-job lock files so scheduled runs never overlap
+
+Each job name maps to ``<JOB_LOCK_DIR>/<name>.lock``, which holds the PID of the
+process running it. Where ``fcntl`` exists the file carries an advisory
+``flock``: the kernel drops it when the process exits, so a crashed run never
+leaves a stale lock behind. Elsewhere the file itself is the lock (created with
+``O_EXCL``), and one older than ``JOB_LOCK_STALE_S`` counts as abandoned.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_LOCK_DIR = Path(__file__).resolve().parent / ".cache" / "locks"
+JOB_LOCK_STALE_S = float(os.getenv("JOB_LOCK_STALE_S", str(12 * 3600)))
+
+
+class JobLock:
+    def __init__(self, name: str, lock_dir: Optional[str] = None):
+        self.name = name
+        directory = Path(lock_dir or os.getenv("JOB_LOCK_DIR") or DEFAULT_LOCK_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"{name}.lock"
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        """Take the lock without waiting; False when another process holds it."""
+        if self._fd is not None:
+            return True
+        if fcntl is not None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            os.ftruncate(fd, 0)
+        else:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                if time.time() - self.path.stat().st_mtime < JOB_LOCK_STALE_S:
+                    return False
+                print(f"⚠️  Removing stale lock {self.path}")
+                self.path.unlink()
+                return self.acquire()
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        os.fsync(fd)
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        if fcntl is not None:
+            # Unlocked but kept on disk: unlinking a flock'd path races with a waiter
+            os.ftruncate(fd, 0)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        else:
+            os.close(fd)
+            self.path.unlink()
+
+    def holder(self) -> Optional[int]:
+        """PID written by the current holder, if any."""
+        try:
+            return int(self.path.read_text(encoding="ascii").strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def __enter__(self) -> "JobLock":
+        if not self.acquire():
+            raise RuntimeError(f"job '{self.name}' is already running (pid {self.holder()})")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
@@ -8,39 +8,69 @@ Tier B/C (web/OSM harvesters): inserts ingestion_candidates for admin review onl
 
 import os
 import sys
-import time
 import argparse
-import requests
 from datetime import datetime
+from typing import Optional
 
-from source_link_enricher import enrich_facility_sources
+from source_link_enricher import enrich_sources_batch, DEFAULT_MAX_WORKERS as SOURCE_FETCH_WORKERS
+from scrapers.fetch import build_session
+from scrapers.http_cache import http_cache_enabled, shared_http_cache
 from scrapers.datacentermap_scraper import DataCenterMapScraper
 from scrapers.datacenterscom_scraper import DataCentersComScraper
 from scrapers.osm_kenya_scraper import OsmKenyaScraper
-from scrapers.manual_data_scraper import ManualDataScraper
+from scrapers.manual_data_scraper import ManualDataScraper, curated_changes, mark_unenriched
 from scrapers.news_monitor_scraper import NewsMonitorScraper
 from processors.deduplicator import Deduplicator
 from processors.geocoder import Geocoder
+from processors.location_validator import LocationValidator
 from db.database import Database
+from instrumentation import RunMetrics
+from harvest_pipeline import run_harvesters
 
 
-def _run_geocode(geocoder: Geocoder, items: list) -> list:
-    out = []
-    for item in items:
+def _finish_run(db: Database, log_id: Optional[str], metrics: RunMetrics, args, status: str, *counts, error=None) -> None:
+    """Close the scrape log (if it was opened) with the run's metrics and write them next to the run."""
+    metrics.finish(status)
+    snapshot = metrics.to_dict()
+    if log_id is not None:
         try:
-            geocoded = geocoder.geocode(item)
-            if geocoded:
-                out.append(geocoded)
+            db.complete_scrape_log(log_id, status, *counts, error, metrics=snapshot)
         except Exception as e:
-            print(f"⚠️  Geocoding failed for {item.get('name', 'unknown')}: {e}")
-            continue
-    return out
+            # scrape_logs.metrics comes with migration 003; still close the log without it
+            print(f"⚠️  Could not store run metrics on scrape log: {e}")
+            db.complete_scrape_log(log_id, status, *counts, error)
+    try:
+        print(f"📈 Run metrics saved to: {metrics.write_json(args.metrics_dir)}")
+        if args.prom_textfile:
+            metrics.write_prometheus(args.prom_textfile)
+    except OSError as e:
+        print(f"⚠️  Could not write run metrics: {e}")
+
+
+def _run_geocode(geocoder: Geocoder, items: list) -> list:
+    try:
+        # One lookup per distinct place, however many rows share it
+        results = geocoder.geocode_many(items)
+    except Exception as e:
+        print(f"⚠️  Batch geocoding failed, retrying row by row: {e}")
+        results = []
+        for item in items:
+            try:
+                results.append(geocoder.geocode(item))
+            except Exception as e:
+                print(f"⚠️  Geocoding failed for {item.get('name', 'unknown')}: {e}")
+    return [item for item in results if item]
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description='Data Center Scraper Pipeline')
-    parser.add_argument('--news-only', action='store_true',
-                        help='Only run news monitor (no database updates)')
+    only = parser.add_mutually_exclusive_group()
+    only.add_argument('--news-only', action='store_true',
+                      help='Only run news monitor (no database updates)')
+    only.add_argument('--curated-only', action='store_true',
+                      help='Only publish the Tier A curated catalogue (no harvesters)')
+    only.add_argument('--harvest-only', action='store_true',
+                      help='Only run the Tier B/C harvesters into ingestion_candidates')
     parser.add_argument('--include-news', action='store_true',
                         help='Include news monitor in main pipeline')
     parser.add_argument(
@@ -48,7 +78,13 @@ def main():
         action='store_true',
         help='Skip HTTP requests for curated sources (use JSON URLs/names as-is; faster/offline)',
     )
-    args = parser.parse_args()
+    parser.add_argument('--full-resync', action='store_true',
+                        help='Republish every curated record, even those whose content hash is unchanged')
+    parser.add_argument('--metrics-dir', default=os.getenv('METRICS_DIR'),
+                        help='Directory for the run_metrics_*.json file (default: current directory)')
+    parser.add_argument('--prom-textfile', default=os.getenv('METRICS_PROM_FILE'),
+                        help='Also write metrics as a Prometheus textfile (node_exporter textfile collector)')
+    args = parser.parse_args(argv)
 
     if args.news_only:
         print("📰 Running News Monitor Only...")
@@ -63,22 +99,39 @@ def main():
         print(f"💾 Report saved to: {report_file}")
         return 0
 
-    print("🚀 Starting data center scraping pipeline (Kenya-focused)...")
+    run_curated = not args.harvest_only
+    run_harvest = not args.curated_only
+    if args.curated_only:
+        job_name = 'curated Kenya'
+    elif args.harvest_only:
+        job_name = 'harvest Kenya'
+    else:
+        job_name = 'full_pipeline Kenya'
+
+    print(f"🚀 Starting data center scraping pipeline ({job_name})...")
     print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     db = Database()
-    log_id = db.start_scrape_log('full_pipeline Kenya')
+    metrics = RunMetrics(job_name)
+    log_id = None
     records_found = 0
     new_dc = 0
     updated_dc = 0
     candidates_upserted = 0
+    geocoder = None
 
     try:
+        log_id = db.start_scrape_log(job_name)
+        metrics.scrape_log_id = log_id
+
         if args.include_news:
             print("\n📰 Running News Monitor (for review only)...")
             monitor = NewsMonitorScraper()
+            metrics.instrument_session(monitor.session)
             try:
-                articles = monitor.scrape()
+                with metrics.stage('news.scrape') as st:
+                    articles = monitor.scrape()
+                    st.items_out = len(articles)
                 if articles:
                     report = monitor.generate_review_report(articles)
                     print(report)
@@ -94,83 +147,143 @@ def main():
         deduplicator = Deduplicator()
 
         # —— Tier A: curated Kenya catalogue → published DCs ——
-        print("\n📚 Tier A — Manual / kenya_curated.json ...")
-        curated = ManualDataScraper().scrape()
-        print(f"   Loaded {len(curated)} curated records")
-        records_found += len(curated)
-
-        geocoded_curated = _run_geocode(geocoder, curated)
-        print(f"   Geocoded curated: {len(geocoded_curated)}")
-
-        skip_source_fetch = args.no_fetch_source_pages or os.getenv(
-            "SKIP_SOURCE_PAGE_FETCH", ""
-        ).lower() in ("1", "true", "yes")
-        if not skip_source_fetch:
-            print("   Fetching curated source pages (redirects + titles)...")
-            src_session = requests.Session()
-            src_session.headers.update(
-                {"User-Agent": os.getenv("USER_AGENT", "Mozilla/5.0")}
+        if run_curated:
+            print("\n📚 Tier A — Manual / kenya_curated.json ...")
+            with metrics.stage('tier_a.load') as st:
+                curated = ManualDataScraper().scrape()
+                st.items_out = len(curated)
+            loaded = len(curated)
+            print(f"   Loaded {loaded} curated records")
+            records_found += loaded
+
+            # Only records added or edited since the last publish go further
+            published = db.curated_hashes()
+            if published is None:
+                print("⚠️  data_centers.content_hash missing (migration 004); republishing all curated records")
+            skip_source_fetch = args.no_fetch_source_pages or os.getenv(
+                "SKIP_SOURCE_PAGE_FETCH", ""
+            ).lower() in ("1", "true", "yes")
+            curated, removed = curated_changes(
+                curated,
+                published or {},
+                force=args.full_resync or published is None,
+                enrich=not skip_source_fetch,
             )
-            for item in geocoded_curated:
-                enrich_facility_sources(src_session, item)
-        else:
-            print("   Skipping curated source page fetch (--no-fetch-source-pages or SKIP_SOURCE_PAGE_FETCH)")
+            unchanged = loaded - len(curated)
+            metrics.count('tier_a.unchanged', unchanged)
+            print(f"   Changed: {len(curated)}, unchanged: {unchanged}, removed: {len(removed)}"
+                  + (" (--full-resync)" if args.full_resync else ""))
+            if removed:
+                retired = db.retire_curated(removed)
+                metrics.count('tier_a.retired', retired)
+                print(f"   Unpublished {retired} rows no longer in the catalogue")
 
-        for item in geocoded_curated:
-            try:
-                if db.upsert_curated(item):
-                    new_dc += 1
-                else:
-                    updated_dc += 1
-            except Exception as e:
-                print(f"⚠️  Failed curated upsert {item.get('name', 'unknown')}: {e}")
+            if not curated:
+                print("   Catalogue unchanged since the last publish; nothing to write")
+            else:
+                with metrics.stage('tier_a.geocode', items_in=len(curated)) as st:
+                    geocoded_curated = _run_geocode(geocoder, curated)
+                    st.items_out = len(geocoded_curated)
+                print(f"   Geocoded curated: {len(geocoded_curated)}")
 
-        # —— Tier B/C: harvesters → ingestion_candidates ——
-        harvesters = [
-            DataCenterMapScraper(),
-            DataCentersComScraper(),
-            OsmKenyaScraper(),
-        ]
-
-        for scraper in harvesters:
-            print(f"\n📊 Tier B/C — {scraper.name} ({scraper.source_system})...")
-            try:
-                raw = scraper.scrape()
-                print(f"   Raw rows: {len(raw)}")
-                records_found += len(raw)
-                if not raw:
-                    continue
+                # Published directly, so rows still outside Kenya after re-geocoding are held back
+                validator = LocationValidator(geocoder)
+                with metrics.stage('tier_a.validate_location', items_in=len(geocoded_curated)) as st:
+                    geocoded_curated = validator.validate(geocoded_curated, default_country='Kenya', drop=True)
+                    st.items_out = len(geocoded_curated)
+                metrics.count('tier_a.regeocoded', validator.regeocoded)
+                metrics.count('tier_a.outside_bounds', validator.dropped)
+                if validator.regeocoded or validator.dropped:
+                    print(f"   Location check: {validator.regeocoded} moved to their city, "
+                          f"{validator.dropped} left out (outside country bounds)")
 
-                deduped = deduplicator.deduplicate(raw)
-                geocoded_h = _run_geocode(geocoder, deduped)
-                print(f"   Unique + geocoded: {len(geocoded_h)}")
+                if not skip_source_fetch:
+                    print("   Fetching curated source pages (redirects + titles)...")
+                    src_session = metrics.instrument_session(build_session(
+                        os.getenv("USER_AGENT", "Mozilla/5.0"), pool_size=SOURCE_FETCH_WORKERS
+                    ))
+                    with metrics.stage('tier_a.enrich_sources', items_in=len(geocoded_curated)) as st:
+                        resolved = enrich_sources_batch(src_session, geocoded_curated)
+                        st.items_out = resolved
+                    print(f"   Resolved {resolved} source links")
+                else:
+                    print("   Skipping curated source page fetch (--no-fetch-source-pages or SKIP_SOURCE_PAGE_FETCH)")
+                    # Raw source URLs; no-fetch runs skip these rows, the next fetching run republishes them
+                    mark_unenriched(geocoded_curated)
 
-                for item in geocoded_h:
+                with metrics.stage('tier_a.db_write', items_in=len(geocoded_curated)) as st:
                     try:
-                        db.insert_candidate(
-                            item,
-                            scraper.source_system,
-                            country_scope='Kenya',
-                            confidence=45 if scraper.source_system == 'osm_kenya' else 50,
-                        )
-                        candidates_upserted += 1
+                        new_dc, updated_dc = db.upsert_curated_many(geocoded_curated)
                     except Exception as e:
-                        print(f"⚠️  Candidate insert failed {item.get('name', 'unknown')}: {e}")
-            except Exception as e:
-                print(f"❌ {scraper.name} failed: {str(e)}")
-                continue
-            time.sleep(0.5)
+                        # One bad row (or migration 002 not applied yet) fails the whole batch;
+                        # fall back to row-by-row so the rest still publish
+                        print(f"⚠️  Batch curated upsert failed, retrying row by row: {e}")
+                        metrics.count('tier_a.batch_fallback')
+                        for item in geocoded_curated:
+                            try:
+                                if db.upsert_curated(item):
+                                    new_dc += 1
+                                else:
+                                    updated_dc += 1
+                            except Exception as e:
+                                print(f"⚠️  Failed curated upsert {item.get('name', 'unknown')}: {e}")
+                    st.items_out = new_dc + updated_dc
+            metrics.count('tier_a.new', new_dc)
+            metrics.count('tier_a.updated', updated_dc)
+
+        # —— Tier B/C: harvesters → ingestion_candidates ——
+        if run_harvest:
+            harvesters = [
+                DataCenterMapScraper(),
+                DataCentersComScraper(),
+                OsmKenyaScraper(),
+            ]
+
+            for scraper in harvesters:
+                metrics.instrument_session(scraper.session)
+
+            print(f"\n📊 Tier B/C — {', '.join(h.name for h in harvesters)} (in parallel)...")
+            with metrics.stage('harvest.all', items_in=len(harvesters)):
+                results = run_harvesters(
+                    harvesters,
+                    db,
+                    deduplicator,
+                    geocoder,
+                    confidence_for=lambda source_system: 45 if source_system == 'osm_kenya' else 50,
+                    country_scope='Kenya',
+                    metrics=metrics,
+                )
+            for result in results:
+                records_found += result.raw_rows
+                # Hash-skipped and already-reviewed rows are staged but not written
+                candidates_upserted += result.written
+                if result.error is not None:
+                    print(f"❌ {result.name} failed after {result.seconds:.1f}s: {result.error}")
+                    metrics.count(f'harvest.{result.source_system}.failed')
+                else:
+                    print(f"   {result.name} ({result.source_system}): {result.raw_rows} raw rows, "
+                          f"{result.staged} candidates staged ({result.written} written, "
+                          f"{result.unchanged} unchanged, {result.outside_bounds} outside bounds) "
+                          f"in {result.seconds:.1f}s")
 
-        db.complete_scrape_log(
+        metrics.count('records_found', records_found)
+        metrics.count('candidates_upserted', candidates_upserted)
+        metrics.record_section('geocode_cache', geocoder.stats())
+        if http_cache_enabled():
+            metrics.record_section('http_cache', shared_http_cache().stats())
+        _finish_run(
+            db,
             log_id,
+            metrics,
+            args,
             'completed',
             records_found,
             new_dc,
             updated_dc + candidates_upserted,
-            None,
         )
 
-        print(f"\n✅ New published DC rows: {new_dc}")
+        print(f"\n🗺️  Geocode cache: {geocoder.stats()}")
+        print(f"✅ New published DC rows: {new_dc}")
         print(f"✅ Updated published DC rows: {updated_dc}")
         print(f"✅ Harvest candidate writes (insert/update pending): {candidates_upserted}")
         print(f"\n🎉 Scraping completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -183,18 +296,23 @@ def main():
         import traceback
         traceback.print_exc()
         try:
-            db.complete_scrape_log(
+            _finish_run(
+                db,
                 log_id,
+                metrics,
+                args,
                 'failed',
                 records_found,
                 new_dc,
                 updated_dc + candidates_upserted,
-                str(e),
+                error=str(e),
             )
         except Exception:
             pass
         return 1
     finally:
+        if geocoder is not None:
+            geocoder.close()
         db.close()
 
 
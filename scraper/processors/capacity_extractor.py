@@ -0,0 +1,95 @@
+"""
+Capacity figures from free text
+
+Pulls power, floor space and rack counts out of listing snippets, detail pages and
+news bodies, normalized to ``power_mw``, ``floor_space_sqm`` and ``racks``:
+
+- power in kW, MW or GW (also spelled out: "megawatts"), not energy ("MWh");
+- floor space in m², sqm, "square metres/meters", ft², sqft, "square feet";
+- thousands separators ("1,400 racks", no-break spaces) and ranges ("10-20 MW",
+  "5 to 8 MW"), where the upper bound is kept: the figure a site is built out to.
+
+The first figure of each kind wins, and a metric floor area beats an imperial one.
+The pattern is compiled once at import; ``extract_capacity_many`` runs a batch
+without per-call setup.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Loose on purpose (cheap to scan); ``_number`` rejects what does not parse
+_NUM = r'\d[\d,.\u00a0\u202f]*'
+_SEPARATORS = re.compile(r'[,\u00a0\u202f]')
+_RANGE_SEP = r'\s*(?:-|–|—|to)\s*'
+
+_POWER_UNIT = r'[kmg]w(?![a-z])|(?:kilo|mega|giga)[- ]?watts?'
+_SQM_UNIT = r'm²|m2\b|sq\.?\s*m(?:eters?|etres?)?\b|square\s+m(?:eters?|etres?)\b'
+_SQFT_UNIT = r'ft²|ft2\b|sq\.?\s*f(?:ee)?t\b|square\s+f(?:ee|oo)t\b'
+_RACK_UNIT = r'(?:racks?|cabinets?)\b'
+
+_UNITS = {'power': _POWER_UNIT, 'sqm': _SQM_UNIT, 'sqft': _SQFT_UNIT, 'racks': _RACK_UNIT}
+
+# One pass over the lower-cased text finds every "<number or range> <unit>" and names
+# the unit's kind. It starts on a digit so the regex engine can skip ahead; the
+# character before the number is checked in ``_figures`` instead of a lookbehind.
+QUANTITY_RE = re.compile(
+    rf'(?P<low>{_NUM})'
+    rf'(?:(?:\s*(?:{"|".join(_UNITS.values())}))?{_RANGE_SEP}(?P<high>{_NUM}))?\s*'  # "2MW-4MW"
+    + '(?:' + '|'.join(f'(?P<{kind}>{unit})' for kind, unit in _UNITS.items()) + ')'
+)
+
+SQFT_TO_SQM = 0.092903
+POWER_TO_MW = {'k': 0.001, 'm': 1.0, 'g': 1000.0}  # by the unit's first letter
+
+
+def _number(figure: str) -> Optional[float]:
+    try:
+        return float(_SEPARATORS.sub('', figure).rstrip('.'))
+    except ValueError:
+        return None
+
+
+def _figures(text: str) -> Dict[str, Any]:
+    """First non-zero figure of each kind, keyed by kind, as ``(value, unit)``."""
+    found: Dict[str, Any] = {}
+    lowered = text.lower()
+    for match in QUANTITY_RE.finditer(lowered):
+        start = match.start()
+        if start and lowered[start - 1] in '0123456789.,':
+            continue  # the tail of a longer number or a version string
+        value = _number(match.group('high') or match.group('low'))
+        kind = match.lastgroup
+        # A bare "000" is usually the tail of "2 000"
+        if value and kind not in found:
+            found[kind] = (value, match.group(kind))
+            if len(found) == len(_UNITS):
+                break
+    return found
+
+
+def extract_capacity(text: str) -> Optional[Dict[str, Any]]:
+    """Capacity dict for ``text``, or None when it mentions no figures."""
+    if not text:
+        return None
+    figures = _figures(text)
+    if not figures:
+        return None
+    capacity: Dict[str, Any] = {}
+
+    if 'power' in figures:
+        value, unit = figures['power']
+        capacity['power_mw'] = round(value * POWER_TO_MW[unit[0].lower()], 6)
+
+    if 'sqm' in figures:
+        capacity['floor_space_sqm'] = figures['sqm'][0]
+    elif 'sqft' in figures:
+        capacity['floor_space_sqm'] = round(figures['sqft'][0] * SQFT_TO_SQM, 2)
+
+    if 'racks' in figures:
+        capacity['racks'] = int(figures['racks'][0])
+
+    return capacity
+
+
+def extract_capacity_many(texts: Iterable[str]) -> List[Optional[Dict[str, Any]]]:
+    return [extract_capacity(text) for text in texts]
@@ -1,13 +1,253 @@
 """
 Deduplication processor using fuzzy matching
+
+Small batches are compared against every unique record, as before. Large batches
+(more than ``exhaustive_max_rows``) go through a blocking index first: a record is
+only compared with records that share a blocking key, in insertion order, so the
+first match and the merge are the same as in the full scan for any pair that shares
+a key. The keys are built from the ways the fuzzy rules can fire (see
+``blocking_keys``), so the output does not depend on which path a batch takes;
+``tests/test_deduplicator.py`` holds both to the same result on 10,000 synthetic
+rows, and ``benchmarks/bench_dedup.py`` measures speed and agreement.
 """
 
-from typing import List, Dict, Any
+import re
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set, Tuple
 from fuzzywuzzy import fuzz
 
+# Both rules in ``is_duplicate`` also need these scores
+LOCATION_MIN_SCORE = 70
+SIMILAR_SCORE = 70
+
+MatchKeys = Tuple[str, str, str]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Facility boilerplate, folded to one spelling for the name skeleton key
+GENERIC_WORDS = {
+    'data': 'data', 'center': 'center', 'centre': 'center', 'centers': 'center',
+    'centres': 'center', 'datacenter': 'data center', 'datacentre': 'data center',
+    'datacenters': 'data center', 'datacentres': 'data center', 'dc': 'data center',
+    'the': '', 'of': '', 'and': '', 'at': '', 'ltd': '', 'limited': '', 'inc': '',
+    'plc': '', 'co': '', 'facility': 'facility', 'campus': 'campus', 'site': 'site',
+}
+
+UNKNOWN_VALUES = frozenset({'', 'unknown', 'n/a', 'na', 'none'})
+
+
+def _match_keys(item: Dict[str, Any]) -> MatchKeys:
+    """Lower-cased name, location and operator strings compared by ``is_duplicate``"""
+    return (
+        item.get('name', '').lower(),
+        f"{item.get('city', '')} {item.get('address', '')}".lower(),
+        item.get('operator', '').lower(),
+    )
+
+
+def _words(value: Any) -> List[str]:
+    return _TOKEN_RE.findall(str(value or '').lower())
+
+
+def _deletions(word: str) -> Set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _typo_of(word: str, vocabulary: Dict[str, str]) -> Optional[str]:
+    """
+    What ``word`` reads as in ``vocabulary`` when it is a known word one letter
+    deleted or inserted away ("Johanesburg", "Datta") or two known words run
+    together ("NakuruData"); None otherwise.
+    """
+    if len(word) < 3:
+        return None
+    for variant in _deletions(word):
+        if variant in vocabulary:
+            return vocabulary[variant]
+    for known, folded in vocabulary.items():
+        if len(known) == len(word) + 1 and word in _deletions(known):
+            return folded
+    for i in range(2, len(word) - 1):
+        head, tail = vocabulary.get(word[:i]), vocabulary.get(word[i:])
+        if head is not None and tail is not None:
+            return f"{head} {tail}".strip()
+    return None
+
+
+def blocking_keys(item: Dict[str, Any]) -> Set[str]:
+    """
+    Keys under which ``item`` is indexed; records are only compared when they share
+    one. Five families cover the ways the fuzzy rules fire:
+
+    - ``t:`` distinctive name words, plus every one-letter deletion of them, so
+      spellings one typo apart meet ("Raxio" / "Raxxio");
+    - ``s:`` the name skeleton within a city: place names and facility boilerplate
+      with the distinctive words removed (and each one-word-shorter variant). That
+      is what makes "Telkom Kenya Data Center" and "SEACOM Kenya Data Center" score
+      as similar;
+    - ``p:`` the place names in the name within a city: a long city name carries
+      the name score on its own, whatever boilerplate follows it;
+    - ``a:`` the boilerplate alone with the street part of the address, for rows in
+      different cities whose locations still score as similar because they share a
+      street name;
+    - ``o:`` the same operator in the same city.
+
+    Boilerplate and place words one typo off, or run together ("NakuruData"), are
+    folded to their spelling first, so a typo there does not move a row out of its
+    skeleton.
+    """
+    keys: Set[str] = set()
+    city_words = _words(item.get('city'))
+    place_words = set(city_words) | set(_words(item.get('country')))
+    vocabulary = dict(GENERIC_WORDS, **{word: word for word in place_words})
+
+    skeleton: List[str] = []
+    for word in _words(item.get('name')):
+        if word in GENERIC_WORDS:
+            if GENERIC_WORDS[word]:
+                skeleton.append(GENERIC_WORDS[word])
+        elif word in place_words:
+            skeleton.append(word)
+        elif not word.isdigit() and len(word) >= 2:
+            keys.add('t:' + word)
+            if len(word) >= 4:
+                for variant in _deletions(word):
+                    keys.add('t:' + variant)
+            folded = _typo_of(word, vocabulary)
+            if folded:
+                skeleton.append(folded)
+    city = ' '.join(city_words)
+    if skeleton:
+        keys.add(f"s:{' '.join(skeleton)}|{city}")
+        # A typo in one boilerplate word turns it into a distinctive one; drop-one
+        # variants still meet the correctly spelled skeleton
+        if len(skeleton) >= 2:
+            for i in range(len(skeleton)):
+                keys.add(f"s:{' '.join(skeleton[:i] + skeleton[i + 1:])}|{city}")
+
+    # "Ramosazu Johannesburg Data Center" / "Poratazu Johannesburg Facility"
+    places_named = [word for word in skeleton if word in place_words]
+    if places_named:
+        keys.add(f"p:{' '.join(places_named)}|{city}")
+
+    boilerplate = [word for word in skeleton if word not in place_words]
+    # The street is what is left of the address once numbers and the trailing
+    # city/country parts are dropped ("12 Mombasa Road, Mombasa" -> "mombasa road")
+    street_parts = []
+    for part in str(item.get('address') or '').split(','):
+        words = [word for word in _words(part) if not word.isdigit()]
+        if words and not set(words) <= place_words:
+            street_parts.append(' '.join(words))
+    street = ' '.join(street_parts)
+    if boilerplate and street:
+        keys.add(f"a:{' '.join(boilerplate)}|{street}")
+        if len(boilerplate) >= 2:
+            for i in range(len(boilerplate)):
+                keys.add(f"a:{' '.join(boilerplate[:i] + boilerplate[i + 1:])}|{street}")
+
+    operator = ' '.join(_words(item.get('operator')))
+    if operator not in UNKNOWN_VALUES:
+        keys.add(f"o:{operator}|{city}")
+    return keys
+
+
+class IncrementalDeduplicator:
+    """
+    Deduplicate rows one at a time, for pipelines that stream rows through.
+
+    ``add`` returns True when the row is a new unique record (it is kept and may be
+    passed on) and False when it was merged into an earlier one. Merges change
+    records that may already have been passed on; ``pop_updated`` returns those
+    since the last call, so the caller can send them again.
+
+    Rows are compared exhaustively until ``blocked_after`` unique records exist,
+    then through the blocking index (None never switches).
+    """
+    
+    def __init__(self, dedup: 'Deduplicator', blocked_after: Optional[int] = None):
+        self.dedup = dedup
+        self.blocked_after = blocked_after
+        self.unique: List[Dict[str, Any]] = []
+        self._unique_keys: List[MatchKeys] = []
+        self._indexed: List[Set[str]] = []
+        self._index: Optional[Dict[str, List[int]]] = None
+        self._updated: Set[int] = set()
+        if blocked_after is not None and blocked_after <= 0:
+            self._build_index()
+    
+    def _build_index(self) -> None:
+        self._index = defaultdict(list)
+        self._indexed = []
+        for pos, record in enumerate(self.unique):
+            block = blocking_keys(record)
+            for key in block:
+                self._index[key].append(pos)
+            self._indexed.append(block)
+    
+    def add(self, item: Dict[str, Any]) -> bool:
+        keys = _match_keys(item)
+        if self._index is None:
+            match = self._find_exhaustive(keys)
+            block: Set[str] = set()
+        else:
+            block = blocking_keys(item)
+            match = self._find_blocked(keys, block)
+        
+        if match is None:
+            if self._index is not None:
+                for key in block:
+                    self._index[key].append(len(self.unique))
+                self._indexed.append(block)
+            self.unique.append(item)
+            self._unique_keys.append(keys)
+            if self.blocked_after is not None and self._index is None and len(self.unique) >= self.blocked_after:
+                self._build_index()
+            return True
+        
+        existing = self.unique[match]
+        # Merge sources, then update with more complete data
+        existing['sources'].extend(item.get('sources', []))
+        self.dedup.merge_data(existing, item)
+        self._unique_keys[match] = _match_keys(existing)
+        self._updated.add(match)
+        if self._index is not None:
+            # merge_data may fill in name/city/operator, which adds blocking keys
+            for key in blocking_keys(existing) - self._indexed[match]:
+                self._index[key].append(match)
+                self._indexed[match].add(key)
+        return False
+    
+    def pop_updated(self) -> List[Dict[str, Any]]:
+        """Records changed by a merge since the last call, in insertion order"""
+        updated = [self.unique[pos] for pos in sorted(self._updated)]
+        self._updated.clear()
+        return updated
+    
+    def _find_exhaustive(self, keys: MatchKeys) -> Optional[int]:
+        for pos, existing_keys in enumerate(self._unique_keys):
+            if self.dedup._keys_duplicate(keys, existing_keys):
+                return pos
+        return None
+    
+    def _find_blocked(self, keys: MatchKeys, block: Set[str]) -> Optional[int]:
+        candidates: Set[int] = set()
+        for key in block:
+            bucket = self._index.get(key)
+            if bucket:
+                candidates.update(bucket)
+        # Same order as the exhaustive scan, so the first match is the same record
+        for pos in sorted(candidates):
+            if self.dedup._keys_duplicate(keys, self._unique_keys[pos]):
+                return pos
+        return None
+
+
 class Deduplicator:
-    def __init__(self, threshold: int = 85):
+    def __init__(self, threshold: int = 85, blocking: bool = True, exhaustive_max_rows: int = 2000):
         self.threshold = threshold
+        self.blocking = blocking
+        self.exhaustive_max_rows = exhaustive_max_rows
+        self.min_name_score = min(threshold, SIMILAR_SCORE)
     
     def deduplicate(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -15,57 +255,47 @@ class Deduplicator:
         """
         if not data:
             return []
-        
-        unique = []
-        seen = []
-        
+        blocked = self.blocking and len(data) > self.exhaustive_max_rows
+        state = IncrementalDeduplicator(self, blocked_after=0 if blocked else None)
         for item in data:
-            is_duplicate = False
-            
-            for existing in unique:
-                if self.is_duplicate(item, existing):
-                    # Merge sources
-                    existing['sources'].extend(item.get('sources', []))
-                    # Update with more complete data
-                    existing = self.merge_data(existing, item)
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique.append(item)
-        
-        return unique
+            state.add(item)
+        return state.unique
+    
+    def incremental(self) -> IncrementalDeduplicator:
+        """
+        Streaming form of ``deduplicate``. The row count is not known up front, so the
+        exhaustive scan is used until ``exhaustive_max_rows`` unique records exist.
+        """
+        return IncrementalDeduplicator(
+            self, blocked_after=self.exhaustive_max_rows if self.blocking else None
+        )
     
     def is_duplicate(self, item1: Dict[str, Any], item2: Dict[str, Any]) -> bool:
         """
         Check if two data centers are duplicates
         """
+        return self._keys_duplicate(_match_keys(item1), _match_keys(item2))
+    
+    def _keys_duplicate(self, keys1: MatchKeys, keys2: MatchKeys) -> bool:
+        # Scores are computed lazily, cheapest and most selective first
+        
         # Compare names
-        name_score = fuzz.ratio(
-            item1.get('name', '').lower(),
-            item2.get('name', '').lower()
-        )
+        name_score = fuzz.ratio(keys1[0], keys2[0])
+        if name_score < self.min_name_score:
+            return False
         
         # Compare addresses/cities
-        location1 = f"{item1.get('city', '')} {item1.get('address', '')}".lower()
-        location2 = f"{item2.get('city', '')} {item2.get('address', '')}".lower()
-        location_score = fuzz.partial_ratio(location1, location2)
-        
-        # Compare operators
-        operator_score = fuzz.ratio(
-            item1.get('operator', '').lower(),
-            item2.get('operator', '').lower()
-        )
+        location_score = fuzz.partial_ratio(keys1[1], keys2[1])
+        if location_score < LOCATION_MIN_SCORE:
+            return False
         
         # Consider duplicate if name is very similar AND location matches
-        if name_score >= self.threshold and location_score >= 70:
-            return True
-        
-        # Or if all three are reasonably similar
-        if name_score >= 70 and location_score >= 70 and operator_score >= 70:
+        if name_score >= self.threshold:
             return True
         
-        return False
+        # Or if all three are reasonably similar (name_score >= 70 holds here)
+        operator_score = fuzz.ratio(keys1[2], keys2[2])
+        return operator_score >= SIMILAR_SCORE
     
     def merge_data(self, existing: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -88,4 +318,3 @@ class Deduplicator:
                             existing['capacity'][cap_key] = cap_value
         
         return existing
-
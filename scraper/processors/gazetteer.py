@@ -0,0 +1,167 @@
+"""
+Offline Kenya gazetteer for geocoding
+
+``data/kenya_gazetteer.tsv`` lists counties, towns, Nairobi and Mombasa areas and the
+big business parks with approximate coordinates. Names and aliases are indexed
+three ways: exact (normalized), by prefix ("Konza" finds "Konza Technopolis") and
+by trigram, for misspellings ("Westland", "Upperhil").
+
+``Gazetteer.locate`` reads a geocoding query ("Westlands, Nairobi, Kenya") from its
+most specific part outwards. It answers only when that most specific part is a
+place it knows and is consistent with the town named after it; for a street
+address it returns None, so a street-level backend can try the full query, and
+the ``city, country`` fallback is then answered here without a network call.
+"""
+
+import bisect
+import csv
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+GAZETTEER_PATH = Path(__file__).resolve().parent.parent / 'data' / 'kenya_gazetteer.tsv'
+
+MIN_SIMILARITY = float(os.getenv('GAZETTEER_MIN_SIMILARITY', '0.7'))
+MIN_PREFIX_LEN = 4
+
+COUNTRY = 'kenya'
+
+# Most specific first; a name shared by a town and its county means the town
+KIND_RANK = {'park': 0, 'area': 0, 'town': 1, 'county': 2, 'country': 3}
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+class Place(NamedTuple):
+    name: str
+    kind: str
+    parent: str
+    latitude: float
+    longitude: float
+    aliases: Tuple[str, ...] = ()
+
+
+def normalize_name(text: str) -> str:
+    return ' '.join(_NON_WORD.sub(' ', text.lower()).split())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    def __init__(self, places: List[Place]):
+        self.places = places
+        self._by_key: Dict[str, List[int]] = {}
+        for i, place in enumerate(places):
+            for key in {normalize_name(n) for n in (place.name,) + place.aliases}:
+                self._by_key.setdefault(key, []).append(i)
+        for ids in self._by_key.values():
+            ids.sort(key=lambda i: KIND_RANK.get(places[i].kind, len(KIND_RANK)))
+
+        self._sorted_keys = sorted(self._by_key)
+        self._key_trigrams = {key: _trigrams(key) for key in self._sorted_keys}
+        self._trigram_index: Dict[str, List[str]] = {}
+        for key, grams in self._key_trigrams.items():
+            for gram in grams:
+                self._trigram_index.setdefault(gram, []).append(key)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'Gazetteer':
+        path = Path(path or os.getenv('GAZETTEER_PATH') or GAZETTEER_PATH)
+        places: List[Place] = []
+        with path.open(encoding='utf-8', newline='') as f:
+            for row in csv.reader(f, delimiter='\t'):
+                if not row or row[0].startswith('#'):
+                    continue
+                name, kind, parent, lat, lon = row[:5]
+                aliases = tuple(a for a in (row[5] if len(row) > 5 else '').split('|') if a)
+                places.append(Place(name, kind, parent, float(lat), float(lon), aliases))
+        return cls(places)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def lookup(self, name: str) -> List[Place]:
+        """Places called ``name`` (exact, else unique prefix, else closest trigram match), most specific first."""
+        key = normalize_name(name)
+        if not key:
+            return []
+        ids = self._by_key.get(key) or self._prefix_match(key) or self._trigram_match(key)
+        return [self.places[i] for i in ids or ()]
+
+    def _prefix_match(self, key: str) -> Optional[List[int]]:
+        if len(key) < MIN_PREFIX_LEN:
+            return None
+        found: Set[int] = set()
+        start = bisect.bisect_left(self._sorted_keys, key + ' ')
+        for candidate in self._sorted_keys[start:]:
+            if not candidate.startswith(key + ' '):
+                break
+            found.update(self._by_key[candidate])
+        return sorted(found) if len(found) == 1 else None
+
+    def _trigram_match(self, key: str) -> Optional[List[int]]:
+        grams = _trigrams(key)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._trigram_index.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        best, best_score = None, MIN_SIMILARITY
+        for candidate, n in shared.items():
+            score = n / (len(grams) + len(self._key_trigrams[candidate]) - n)  # Jaccard
+            if score >= best_score:
+                best, best_score = candidate, score
+        return self._by_key[best] if best is not None else None
+
+    def locate(self, query: str) -> Optional[Place]:
+        """The place a ``"place, town, country"`` query names, or None."""
+        parts = [p for p in (normalize_name(p) for p in query.split(',')) if p]
+        if len(parts) > 1 and parts[-1] == COUNTRY:
+            parts.pop()
+        if not parts or parts[0][0].isdigit():
+            return None  # "12 Mombasa Road": a street address, not a place
+
+        # Every part after the most specific one has to be known as well, or this is
+        # not a Kenyan query ("Kampala, Uganda")
+        context: List[Place] = []
+        for part in parts[1:]:
+            matches = self.lookup(part)
+            if not matches:
+                return None
+            context.append(matches[0])
+
+        for place in self.lookup(parts[0]):
+            if all(self._within(place, outer) for outer in context):
+                return place
+        return None
+
+    def _within(self, place: Place, outer: Place) -> bool:
+        """``outer`` is ``place`` itself, contains it, or is a town in the same county."""
+        if outer.kind == 'country' or outer.name == place.name:
+            return True
+        ancestors = self._ancestors(place)
+        return outer.name in ancestors or (outer.kind == 'town' and outer.parent in ancestors)
+
+    def _ancestors(self, place: Place) -> Set[str]:
+        names: Set[str] = set()
+        while place.parent and place.parent not in names:
+            names.add(place.parent)
+            ids = self._by_key.get(normalize_name(place.parent))
+            if not ids:
+                break
+            place = self.places[ids[0]]  # "Mombasa" is the town, whose parent is the county
+        return names
+
+
+_shared_gazetteer: Optional[Gazetteer] = None
+
+
+def kenya_gazetteer() -> Gazetteer:
+    """Process-wide gazetteer, loaded on first use."""
+    global _shared_gazetteer
+    if _shared_gazetteer is None:
+        _shared_gazetteer = Gazetteer.load()
+    return _shared_gazetteer
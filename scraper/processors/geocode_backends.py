@@ -0,0 +1,88 @@
+"""
+Geocoding backends for ``Geocoder``
+
+A backend turns a query string into coordinates, or None when it does not know the
+place. ``Geocoder`` asks its backends in order and stops at the first answer;
+backends marked ``rate_limited`` are called one at a time, at most once per
+``GEOCODE_MIN_INTERVAL_S``.
+
+``GEOCODE_BACKENDS`` picks and orders them (default ``gazetteer,nominatim``): the
+offline Kenya gazetteer answers towns, areas and business parks in microseconds,
+and Nominatim handles street addresses and anything outside the gazetteer.
+``GEOCODE_BACKENDS=gazetteer`` runs without network access.
+"""
+
+import os
+from typing import Dict, List, Optional, Type
+
+from geopy.geocoders import Nominatim
+
+from .gazetteer import Gazetteer, kenya_gazetteer
+from .geocode_cache import Coords
+
+DEFAULT_BACKENDS = os.getenv('GEOCODE_BACKENDS', 'gazetteer,nominatim')
+NOMINATIM_TIMEOUT_S = int(os.getenv('NOMINATIM_TIMEOUT_S', '10'))
+
+
+class GeocodeBackend:
+    name = 'backend'
+    rate_limited = False
+
+    def lookup(self, query: str) -> Optional[Coords]:
+        """Coordinates for ``query``, or None when the place is unknown here."""
+        raise NotImplementedError
+
+
+class NominatimBackend(GeocodeBackend):
+    """The public OpenStreetMap geocoder (network; one request per second)"""
+
+    name = 'nominatim'
+    rate_limited = True
+
+    def __init__(self, user_agent: str = 'datacenter_mapper', timeout: int = NOMINATIM_TIMEOUT_S):
+        self.geolocator = Nominatim(user_agent=user_agent)
+        self.timeout = timeout
+
+    def lookup(self, query: str) -> Optional[Coords]:
+        location = self.geolocator.geocode(query, timeout=self.timeout)
+        if location:
+            return location.latitude, location.longitude
+        return None
+
+
+class GazetteerBackend(GeocodeBackend):
+    """Offline lookup in the bundled Kenya gazetteer"""
+
+    name = 'gazetteer'
+
+    def __init__(self, gazetteer: Optional[Gazetteer] = None):
+        self.gazetteer = gazetteer or kenya_gazetteer()
+
+    def lookup(self, query: str) -> Optional[Coords]:
+        place = self.gazetteer.locate(query)
+        if place is None:
+            return None
+        return place.latitude, place.longitude
+
+
+BACKENDS: Dict[str, Type[GeocodeBackend]] = {
+    'gazetteer': GazetteerBackend,
+    'nominatim': NominatimBackend,
+}
+
+
+def default_backends(spec: str = DEFAULT_BACKENDS) -> List[GeocodeBackend]:
+    """Backends named in ``spec`` (comma-separated, in order); unknown names are skipped."""
+    backends: List[GeocodeBackend] = []
+    for name in (n.strip().lower() for n in spec.split(',')):
+        if not name:
+            continue
+        if name not in BACKENDS:
+            print(f"⚠️  Unknown geocoding backend '{name}' (known: {', '.join(BACKENDS)})")
+            continue
+        try:
+            backends.append(BACKENDS[name]())
+        except OSError as e:
+            # A missing gazetteer file should not stop the pipeline
+            print(f"⚠️  Geocoding backend '{name}' unavailable: {e}")
+    return backends
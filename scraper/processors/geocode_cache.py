@@ -0,0 +1,149 @@
+"""
+Persistent geocode cache backed by SQLite
+
+Positive and negative (no match) results are kept with separate TTLs so a place
+Nominatim could not find is retried sooner than a known location expires. The table
+is bounded: once it grows past ``max_entries`` the least recently used rows go.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "geocode.sqlite3"
+
+Coords = Tuple[float, float]
+
+EVICT_EVERY_PUTS = 64
+
+
+class GeocodeCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_s: float = float(os.getenv("GEOCODE_CACHE_TTL_S", str(90 * 86400))),
+        negative_ttl_s: float = float(os.getenv("GEOCODE_CACHE_NEGATIVE_TTL_S", str(7 * 86400))),
+        max_entries: int = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "50000")),
+    ):
+        self.path = str(path or os.getenv("GEOCODE_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.max_entries = max_entries
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                query TEXT PRIMARY KEY,
+                latitude REAL,
+                longitude REAL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_geocode_cache_accessed ON geocode_cache (accessed_at)"
+        )
+        self.conn.commit()
+
+    def lookup(self, query: str) -> Tuple[bool, Optional[Coords]]:
+        """
+        Return ``(found, coords)``. ``found`` with ``coords`` None is a cached negative
+        result; ``found`` False means the caller has to ask the geocoding service.
+        """
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT latitude, longitude, created_at FROM geocode_cache WHERE query = ?",
+                (query,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+
+            lat, lon, created_at = row
+            ttl = self.ttl_s if lat is not None else self.negative_ttl_s
+            if now - created_at > ttl:
+                self.conn.execute("DELETE FROM geocode_cache WHERE query = ?", (query,))
+                self.conn.commit()
+                self.misses += 1
+                return False, None
+
+            self.conn.execute(
+                "UPDATE geocode_cache SET accessed_at = ? WHERE query = ?", (now, query)
+            )
+            self.conn.commit()
+            if lat is None:
+                self.negative_hits += 1
+                return True, None
+            self.hits += 1
+            return True, (lat, lon)
+
+    def put(self, query: str, coords: Optional[Coords]) -> None:
+        """Store a location, or ``None`` to remember that the query has no match."""
+        now = time.time()
+        lat, lon = coords if coords else (None, None)
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO geocode_cache (query, latitude, longitude, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(query) DO UPDATE SET
+                    latitude = excluded.latitude,
+                    longitude = excluded.longitude,
+                    created_at = excluded.created_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (query, lat, lon, now, now),
+            )
+            self._puts_since_evict += 1
+            if self._puts_since_evict >= EVICT_EVERY_PUTS:
+                self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        self._puts_since_evict = 0
+        (size,) = self.conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()
+        excess = size - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                """
+                DELETE FROM geocode_cache WHERE query IN (
+                    SELECT query FROM geocode_cache ORDER BY accessed_at ASC LIMIT ?
+                )
+                """,
+                (excess,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else None,
+            "entries": len(self),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._evict()
+            self.conn.commit()
+            self.conn.close()
@@ -1,66 +1,186 @@
 """
 Geocoding processor using geopy
+
+Lookups go through pluggable backends (``geocode_backends``): the offline Kenya
+gazetteer first, Nominatim as the fallback. ``geocode_many`` resolves a batch by
+distinct place rather than by row: queries are normalized (case, whitespace,
+punctuation) and collapsed before any lookup, and
+results are cached under both the full address and its ``city, country`` fallback,
+so every row that ends up at "Nairobi, Kenya" shares one lookup.
 """
 
-from typing import Dict, Any, Optional
-from geopy.geocoders import Nominatim
+import os
+import re
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+import threading
 import time
 
+from .geocode_backends import GeocodeBackend, default_backends
+from .geocode_cache import Coords, GeocodeCache
+
+# Nominatim's usage policy: at most one request per second
+MIN_INTERVAL_S = float(os.getenv("GEOCODE_MIN_INTERVAL_S", "1.0"))
+
+_PUNCTUATION = re.compile(r"[^\w\s,]+")
+_COMMAS = re.compile(r"\s*,[\s,]*")
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a geocoding query: case-, whitespace- and punctuation-insensitive"""
+    key = " ".join(_PUNCTUATION.sub(" ", query.lower()).split())
+    return _COMMAS.sub(", ", key).strip(", ")
+
+
+def _queries(data: Dict[str, Any]) -> Tuple[str, str]:
+    """Full-address query and its ``city, country`` fallback."""
+    address = data.get('address') or ''
+    city = data.get('city') or ''
+    country = data.get('country') or ''
+    return f"{address}, {city}, {country}".strip(', '), f"{city}, {country}".strip(', ')
+
+
 class Geocoder:
-    def __init__(self):
-        self.geolocator = Nominatim(user_agent="datacenter_mapper")
-        self.cache = {}
-    
+    def __init__(
+        self,
+        cache: Optional[GeocodeCache] = None,
+        backends: Optional[Sequence[GeocodeBackend]] = None,
+        min_interval_s: float = MIN_INTERVAL_S,
+    ):
+        self.backends = list(backends) if backends is not None else default_backends()
+        self.cache = cache if cache is not None else GeocodeCache()
+        self.min_interval_s = min_interval_s
+        self.requests = 0  # sent to rate-limited (network) backends
+        self.backend_hits = {backend.name: 0 for backend in self.backends}
+        # Harvesters geocode concurrently; Nominatim allows one request per second
+        self._service_lock = threading.Lock()
+        self._last_request = 0.0
+
     def geocode(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Add latitude and longitude to data center record
         """
-        # Return if already has coordinates
-        if data.get('latitude') and data.get('longitude'):
-            return data
-        
-        # Build search query
-        address = data.get('address', '')
-        city = data.get('city', '')
-        country = data.get('country', '')
-        
-        query = f"{address}, {city}, {country}".strip(', ')
-        
-        if not query:
-            return None
-        
-        # Check cache
-        if query in self.cache:
-            lat, lon = self.cache[query]
-            data['latitude'] = lat
-            data['longitude'] = lon
-            return data
-        
-        # Geocode
-        try:
-            time.sleep(1)  # Rate limiting
-            location = self.geolocator.geocode(query, timeout=10)
-            
-            if location:
-                data['latitude'] = location.latitude
-                data['longitude'] = location.longitude
-                self.cache[query] = (location.latitude, location.longitude)
-                return data
+        return self.geocode_many([data])[0]
+
+    def geocode_many(self, items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Geocode a batch in place; returns the items in order, None where no location
+        was found. Each distinct normalized query is looked up at most once.
+        """
+        resolved: Dict[str, Optional[Coords]] = {}
+        out: List[Optional[Dict[str, Any]]] = []
+        for data in items:
+            # Return if already has coordinates
+            if data.get('latitude') and data.get('longitude'):
+                out.append(data)
+                continue
+
+            query, fallback_query = _queries(data)
+            if not query:
+                out.append(None)
+                continue
+
+            key = normalize_query(query)
+            if key in resolved:
+                coords = resolved[key]
             else:
-                # Try with just city and country
-                fallback_query = f"{city}, {country}"
-                time.sleep(1)
-                location = self.geolocator.geocode(fallback_query, timeout=10)
-                
-                if location:
-                    data['latitude'] = location.latitude
-                    data['longitude'] = location.longitude
-                    self.cache[query] = (location.latitude, location.longitude)
-                    return data
-        
+                coords, transient = self._resolve(key, query, fallback_query, resolved)
+                if not transient:
+                    resolved[key] = coords
+            if coords is None:
+                out.append(None)
+                continue
+            data['latitude'], data['longitude'] = coords
+            out.append(data)
+        return out
+
+    def _resolve(
+        self,
+        key: str,
+        query: str,
+        fallback_query: str,
+        resolved: Dict[str, Optional[Coords]],
+    ) -> Tuple[Optional[Coords], bool]:
+        """
+        Full address first, then its city; both levels are cached. Returns the
+        coordinates and whether a transient service error left them unknown.
+        """
+        # A cached negative result skips both lookups
+        found, coords = self.cache.lookup(key)
+        if found:
+            return coords, False
+
+        transient = False
+        try:
+            coords = self._request(query)
         except (GeocoderTimedOut, GeocoderServiceError) as e:
             print(f"⚠️  Geocoding error for {query}: {e}")
-        
+            transient, coords = True, None
+        if coords is None:
+            city_key = normalize_query(fallback_query)
+            if city_key and city_key != key:
+                if city_key in resolved:
+                    coords = resolved[city_key]
+                else:
+                    try:
+                        coords = resolved[city_key] = self._resolve_city(city_key, fallback_query)
+                    except (GeocoderTimedOut, GeocoderServiceError) as e:
+                        print(f"⚠️  Geocoding error for {fallback_query}: {e}")
+                        transient = True
+
+        # Transient service errors are neither cached nor remembered for the batch;
+        # the next row or run asks again
+        if not transient:
+            self.cache.put(key, coords)
+        return coords, transient
+
+    def _resolve_city(self, city_key: str, fallback_query: str) -> Optional[Coords]:
+        """Service errors are raised, so the caller does not cache the address as not found."""
+        found, coords = self.cache.lookup(city_key)
+        if found:
+            return coords
+        coords = self._request(fallback_query)
+        self.cache.put(city_key, coords)
+        return coords
+
+    def _request(self, query: str) -> Optional[Coords]:
+        """First answer from the backends, in order; a service error surfaces only if none answers."""
+        error: Optional[Exception] = None
+        for backend in self.backends:
+            try:
+                coords = self._ask(backend, query)
+            except (GeocoderTimedOut, GeocoderServiceError) as e:
+                error = e
+                continue
+            if coords is not None:
+                self.backend_hits[backend.name] += 1
+                return coords
+        if error is not None:
+            raise error
         return None
 
+    def _ask(self, backend: GeocodeBackend, query: str) -> Optional[Coords]:
+        if not backend.rate_limited:
+            return backend.lookup(query)
+        # Offline backends and cache hits never wait for the lock
+        with self._service_lock:
+            wait = self._last_request + self.min_interval_s - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)  # Rate limiting
+            try:
+                return backend.lookup(query)
+            finally:
+                self._last_request = time.monotonic()
+                self.requests += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache stats, requests sent to rate-limited services, and answers per backend"""
+        return {
+            **self.cache.stats(),
+            "requests": self.requests,
+            **{f"{name}_hits": hits for name, hits in self.backend_hits.items()},
+        }
+
+    def close(self) -> None:
+        """Flush and close the persistent cache"""
+        self.cache.close()
@@ -0,0 +1,132 @@
+"""
+Batch check that coordinates fall inside the row's country
+
+Runs after geocoding and before any database write, on curated and harvested rows
+alike. Rows whose country has an outline in ``country_bounds`` are checked in one
+vectorized pass per country. An outlier (a bad geocoder match, swapped latitude and
+longitude, a scraped pin in the wrong country) is re-geocoded at ``city, country``
+level, which the offline gazetteer usually answers, and kept if that lands inside.
+Otherwise the row is flagged with ``location_check = 'outside_bounds'`` for review,
+or dropped when the caller publishes directly.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .country_bounds import CountryBounds, CountryGrid, country_bounds
+from .geocoder import Geocoder
+
+OUTSIDE_BOUNDS = 'outside_bounds'
+REGEOCODED = 'regeocoded'
+
+
+def _coordinate(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan  # Unparseable coordinates count as outside
+
+
+class LocationValidator:
+    def __init__(self, geocoder: Optional[Geocoder] = None, bounds: Optional[CountryBounds] = None):
+        self.geocoder = geocoder
+        self.bounds = bounds if bounds is not None else country_bounds()
+        self.checked = 0
+        self.regeocoded = 0
+        self.flagged = 0
+        self.dropped = 0
+
+    def outliers(self, items: List[Dict[str, Any]], default_country: Optional[str] = None) -> List[int]:
+        """Indexes of rows whose coordinates are outside their country's outline."""
+        return self._check(items, default_country)[1]
+
+    def _check(self, items: List[Dict[str, Any]], default_country: Optional[str]) -> Tuple[int, List[int]]:
+        checked = 0
+        groups: Dict[int, Tuple[CountryGrid, List[int]]] = {}
+        grids: Dict[str, Optional[CountryGrid]] = {}  # a batch names few countries
+        for i, item in enumerate(items):
+            if item.get('latitude') is None or item.get('longitude') is None:
+                continue
+            country = item.get('country') or default_country or ''
+            if country not in grids:
+                grids[country] = self.bounds.grid(country)
+            grid = grids[country]
+            if grid is not None:
+                groups.setdefault(id(grid), (grid, []))[1].append(i)
+
+        out: List[int] = []
+        for grid, indexes in groups.values():
+            checked += len(indexes)
+            inside = grid.contains_many(
+                [_coordinate(items[i]['latitude']) for i in indexes],
+                [_coordinate(items[i]['longitude']) for i in indexes],
+            )
+            out.extend(i for i, ok in zip(indexes, inside) if not ok)
+        return checked, sorted(out)
+
+    def validate(
+        self,
+        items: List[Dict[str, Any]],
+        default_country: Optional[str] = None,
+        drop: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Check a batch in place. Outliers are re-geocoded by city; those still outside
+        are flagged, or left out of the returned list when ``drop`` is set.
+        """
+        checked, bad = self._check(items, default_country)
+        self.checked += checked
+        if not bad:
+            return items
+
+        fixed = self._regeocode(items, bad, default_country)
+        self.regeocoded += len(fixed)
+        still_bad: Set[int] = set(bad) - fixed
+        for i in sorted(still_bad):
+            item = items[i]
+            where = f"({item.get('latitude')}, {item.get('longitude')})"
+            country = item.get('country') or default_country
+            if drop:
+                print(f"⚠️  Dropping {item.get('name', 'unknown')}: {where} is outside {country}")
+            else:
+                item['location_check'] = OUTSIDE_BOUNDS
+        if not drop:
+            self.flagged += len(still_bad)
+            return items
+        self.dropped += len(still_bad)
+        return [item for i, item in enumerate(items) if i not in still_bad]
+
+    def _regeocode(self, items: List[Dict[str, Any]], bad: List[int], default_country: Optional[str]) -> Set[int]:
+        """Move outliers to their city when that lands inside; returns the indexes fixed."""
+        if self.geocoder is None:
+            return set()
+        # Without a city the only answer would be the country's centroid
+        retry = [i for i in bad if items[i].get('city')]
+        probes = [
+            {'city': items[i]['city'], 'country': items[i].get('country') or default_country}
+            for i in retry
+        ]
+        try:
+            results = self.geocoder.geocode_many(probes)
+        except Exception as e:
+            print(f"⚠️  Re-geocoding {len(probes)} out-of-bounds rows failed: {e}")
+            return set()
+
+        found = [(i, probe) for i, probe in zip(retry, results) if probe is not None]
+        still_out = set(self.outliers([probe for _, probe in found], default_country))
+        fixed: Set[int] = set()
+        for n, (i, probe) in enumerate(found):
+            if n in still_out:
+                continue
+            items[i]['latitude'], items[i]['longitude'] = probe['latitude'], probe['longitude']
+            items[i]['location_check'] = REGEOCODED
+            fixed.add(i)
+        return fixed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'checked': self.checked,
+            'regeocoded': self.regeocoded,
+            'flagged': self.flagged,
+            'dropped': self.dropped,
+        }
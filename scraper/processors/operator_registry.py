@@ -0,0 +1,115 @@
+"""
+Operator registry: ownership and status vocabulary loaded from data
+
+``data/operator_registry.json`` (next to ``kenya_curated.json``) lists, per
+classification, ordered categories of keywords; the first category with a keyword
+contained in the lower-cased text wins, otherwise the default applies. That is the
+rule ``normalize_ownership`` / ``normalize_status`` always used, with the lists moved
+out of Python so the data team can extend them.
+
+Each vocabulary is compiled into one ``KeywordMatcher`` pattern, used whatever the
+vocabulary size: a text that is exactly a keyword ("safaricom") is answered from a
+dict, anything else by one pattern scan keeping the earliest keyword found. Lookups
+are memoized per normalized string, so the thousands of harvested rows naming the
+same few operators cost one dict lookup each after the first.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .keyword_matcher import KeywordMatcher
+
+REGISTRY_PATH = Path(__file__).resolve().parent.parent / "data" / "operator_registry.json"
+
+CACHE_SIZE = 4096
+
+# Used when the data file is missing, like the inline list in manual_data_scraper.py
+FALLBACK_REGISTRY: Dict[str, Any] = {
+    'ownership': {
+        'default': 'foreign',
+        'categories': [
+            {'value': 'foreign', 'keywords': [
+                'microsoft', 'google', 'amazon', 'facebook', 'meta', 'equinix', 'digital realty',
+                'global switch', 'colt', 'teraco', 'mainone', 'liquid',
+            ]},
+            {'value': 'local', 'keywords': ['safaricom', 'kenya data', 'wananchi', 'jamii']},
+            {'value': 'joint-venture', 'keywords': ['joint', '&', '-']},
+        ],
+    },
+    'status': {
+        'default': 'operational',
+        'categories': [
+            {'value': 'operational', 'keywords': ['operational', 'active', 'live']},
+            {'value': 'under-construction', 'keywords': ['construction', 'building']},
+            {'value': 'planned', 'keywords': ['planned', 'future']},
+            {'value': 'decommissioned', 'keywords': ['closed', 'decommissioned']},
+        ],
+    },
+}
+
+
+class Vocabulary:
+    """Ordered keyword categories compiled into one matcher, with memoized lookups"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.default = spec['default']
+        keywords: List[str] = []
+        self._value_of: Dict[str, str] = {}
+        for category in spec.get('categories') or []:
+            for keyword in category.get('keywords') or []:
+                needle = keyword.lower()
+                if needle not in self._value_of:  # an earlier category keeps it
+                    self._value_of[needle] = category['value']
+                    keywords.append(needle)
+        # Keywords are in category order, so the lowest-ranked hit names the category
+        self._rank = {needle: i for i, needle in enumerate(keywords)}
+        self._matcher = KeywordMatcher(keywords)
+        # A text equal to a keyword may still contain an earlier one ("a-b" and "-")
+        self._exact = {needle: self._scan(needle) for needle in keywords}
+        self.classify = lru_cache(maxsize=CACHE_SIZE)(self._classify)
+
+    def _scan(self, normalized: str) -> str:
+        hits = self._matcher.find_all(normalized)
+        if not hits:
+            return self.default
+        return self._value_of[min((hit.keyword for hit in hits), key=self._rank.__getitem__)]
+
+    def _classify(self, normalized: str) -> str:
+        value = self._exact.get(normalized)
+        return value if value is not None else self._scan(normalized)
+
+
+class OperatorRegistry:
+    def __init__(self, data: Dict[str, Any]):
+        self.ownership_vocabulary = Vocabulary(data['ownership'])
+        self.status_vocabulary = Vocabulary(data['status'])
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'OperatorRegistry':
+        path = Path(path or os.getenv('OPERATOR_REGISTRY_PATH') or REGISTRY_PATH)
+        if not path.is_file():
+            print(f"⚠️  Operator registry not found at {path}; using built-in defaults")
+            return cls(FALLBACK_REGISTRY)
+        return cls(json.loads(path.read_text(encoding='utf-8')))
+
+    def ownership(self, operator: str) -> str:
+        """'foreign' / 'local' / 'joint-venture' for an operator name"""
+        return self.ownership_vocabulary.classify(operator.lower())
+
+    def status(self, status_str: str) -> str:
+        """Standard status value for free-text status"""
+        return self.status_vocabulary.classify(status_str.lower().strip())
+
+
+_shared_registry: Optional[OperatorRegistry] = None
+
+
+def operator_registry() -> OperatorRegistry:
+    """Process-wide registry, loaded on first use."""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = OperatorRegistry.load()
+    return _shared_registry
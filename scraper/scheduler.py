@@ -1,58 +1,190 @@
 #!/usr/bin/env python3
 """
 Scheduled scraping jobs for data center mapping
+
+Jobs run a slice of the ``main`` pipeline:
+
+- ``news``: news monitor report only (daily)
+- ``curated``: Tier A curated catalogue; incremental, so only changed records fetch source pages (daily)
+- ``harvest``: Tier B/C harvesters into ingestion_candidates (on demand)
+- ``full``: everything, news included (weekly)
+
+Each job holds lock files for the parts it touches (``job_lock``), so a slow run
+is never overlapped by the next one, whether that comes from this scheduler, a
+second instance or cron: a job whose lock is taken is skipped. Start times get
+a random jitter, and on start-up any job whose last successful run is older
+than its period is run once to catch up.
 """
 
-import schedule
+import argparse
+import json
+import os
+import random
+import sys
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import schedule
 from main import main as run_scraper
+from db.database import close_shared_pools, shared_pool
+from job_lock import JobLock
+
+FULL_RUN_DAY = os.getenv("SCHEDULE_FULL_DAY", "monday")
+FULL_RUN_AT = os.getenv("SCHEDULE_FULL_AT", "02:00")
+DAILY_RUN_AT = os.getenv("SCHEDULE_DAILY_AT", "08:00")
+JITTER_S = float(os.getenv("SCHEDULER_JITTER_S", "300"))
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parent / ".cache" / "scheduler_state.json"
+
+DAY = timedelta(days=1)
+WEEK = timedelta(days=7)
+
+
+class Job(NamedTuple):
+    name: str
+    argv: List[str]
+    locks: Tuple[str, ...]  # pipeline parts it touches
+    period: timedelta  # catch-up when the last success is older than this
+
+    @property
+    def covers(self) -> Tuple[str, ...]:
+        """Jobs whose work a successful run of this one also did."""
+        return tuple(name for name, job in JOBS.items() if set(job.locks) <= set(self.locks))
+
+
+JOBS: Dict[str, Job] = {
+    'news': Job('news', ['--news-only'], ('news',), DAY),
+    'curated': Job('curated', ['--curated-only'], ('curated',), DAY),
+    'harvest': Job('harvest', ['--harvest-only'], ('harvest',), WEEK),
+    'full': Job('full', ['--include-news'], ('news', 'curated', 'harvest'), WEEK),
+}
+
+# Catch-up order: ``full`` first, since it covers the daily jobs
+SCHEDULED = ('full', 'news', 'curated')
+
+
+class SchedulerState:
+    """Last successful run per job, kept in a small JSON file"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv("SCHEDULER_STATE_PATH") or DEFAULT_STATE_PATH)
+        try:
+            self.last_success = {
+                name: datetime.fromisoformat(ts)
+                for name, ts in json.loads(self.path.read_text(encoding="utf-8")).items()
+            }
+        except (OSError, ValueError):
+            self.last_success = {}
+
+    def is_due(self, job: Job, now: datetime) -> bool:
+        last = self.last_success.get(job.name)
+        return last is None or now - last >= job.period
+
+    def record_success(self, job: Job, at: datetime) -> None:
+        for name in job.covers:
+            self.last_success[name] = at
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({name: ts.isoformat() for name, ts in self.last_success.items()}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+
 
-def job():
-    """Run the scraping job"""
-    print(f"\n{'='*60}")
-    print(f"🕐 Scheduled scrape started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*60}\n")
-    
+def run_job(name: str, state: SchedulerState, jitter_s: float = JITTER_S) -> Optional[int]:
+    """Run one job under its locks; None when it was skipped because one is held."""
+    job = JOBS[name]
+    if jitter_s > 0:
+        time.sleep(random.uniform(0, jitter_s))
+
+    locks = [JobLock(part) for part in sorted(job.locks)]
     try:
-        run_scraper()
-    except Exception as e:
-        print(f"❌ Scheduled job failed: {e}")
-    
-    print(f"\n{'='*60}")
-    print(f"✅ Scheduled scrape completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*60}\n")
+        for lock in locks:
+            if not lock.acquire():
+                print(f"⏭️  Skipping '{name}' job: '{lock.name}' is still running (pid {lock.holder()})")
+                return None
+
+        started = datetime.now()
+        print(f"\n{'='*60}")
+        print(f"🕐 Scheduled '{name}' job started at {started.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*60}\n")
+
+        try:
+            code = run_scraper(job.argv)
+        except Exception as e:
+            print(f"❌ Scheduled job failed: {e}")
+            code = 1
+        if code == 0:
+            state.record_success(job, started)
+
+        print(f"\n{'='*60}")
+        print(f"{'✅' if code == 0 else '❌'} Scheduled '{name}' job finished at "
+              f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"{'='*60}\n")
+        return code
+    finally:
+        for lock in locks:
+            lock.release()
 
-def main():
+
+def catch_up(state: SchedulerState) -> None:
+    """Run each scheduled job whose last success is older than its period."""
+    for name in SCHEDULED:
+        job = JOBS[name]
+        if state.is_due(job, datetime.now()):
+            last = state.last_success.get(name)
+            print(f"🔁 Catching up '{name}' job (last success: {last.strftime('%Y-%m-%d %H:%M') if last else 'never'})")
+            run_job(name, state)
+
+
+def main(argv=None):
     """Set up and run scheduled jobs"""
+    parser = argparse.ArgumentParser(description='Data Center Scraper Scheduler')
+    parser.add_argument('--run', choices=sorted(JOBS),
+                        help='Run one job now (under its lock, without jitter) and exit, e.g. from cron')
+    args = parser.parse_args(argv)
+
+    state = SchedulerState()
+    if args.run:
+        code = run_job(args.run, state, jitter_s=0)
+        return 0 if code is None else code
+
     print("🤖 Starting Data Center Scraper Scheduler")
     print("=" * 60)
-    
-    # Schedule jobs
-    # Weekly scrape on Monday at 2 AM
-    schedule.every().monday.at("02:00").do(job)
-    
-    # Daily check for news/announcements at 8 AM
-    schedule.every().day.at("08:00").do(job)
-    
+
+    getattr(schedule.every(), FULL_RUN_DAY).at(FULL_RUN_AT).do(run_job, 'full', state)
+    schedule.every().day.at(DAILY_RUN_AT).do(run_job, 'news', state)
+    schedule.every().day.at(DAILY_RUN_AT).do(run_job, 'curated', state)
+
     print("📅 Scheduled jobs:")
-    print("  - Weekly full scrape: Mondays at 2:00 AM")
-    print("  - Daily updates: Every day at 8:00 AM")
+    print(f"  - Weekly full scrape (curated + harvesters + news): {FULL_RUN_DAY.title()}s at {FULL_RUN_AT}")
+    print(f"  - Daily news check and curated sync: every day at {DAILY_RUN_AT}")
+    print(f"  - Start jitter: up to {JITTER_S:.0f}s")
+
+    # Open the connection pool once; every run reuses its connections
+    try:
+        shared_pool()
+    except Exception as e:
+        print(f"⚠️  Could not open database pool yet (will retry on first run): {e}")
+
+    catch_up(state)
+
     print("\n⏳ Waiting for scheduled jobs...")
     print("   (Press Ctrl+C to exit)\n")
-    
-    # Run immediately on start
-    print("🚀 Running initial scrape...")
-    job()
-    
+
     # Keep running
     while True:
         schedule.run_pending()
         time.sleep(60)  # Check every minute
 
+
 if __name__ == "__main__":
     try:
-        main()
+        sys.exit(main())
     except KeyboardInterrupt:
         print("\n\n👋 Scheduler stopped by user")
-
+    finally:
+        close_shared_pools()
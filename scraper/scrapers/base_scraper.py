@@ -2,104 +2,77 @@
 Base scraper class with common functionality
 """
 
-import requests
-import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 import os
 
+from .fetch import DEFAULT_MAX_WORKERS, build_session, run_bounded, shared_rate_limiter
+from .listing_parser import iter_listings
+from processors.capacity_extractor import extract_capacity
+from processors.operator_registry import operator_registry
+
 class BaseScraper:
-    def __init__(self, name: str):
+    def __init__(self, name: str, max_workers: int = DEFAULT_MAX_WORKERS):
         self.name = name
         self.user_agent = os.getenv('USER_AGENT', 'Mozilla/5.0')
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': self.user_agent
-        })
+        self.max_workers = max_workers
+        self.session = build_session(self.user_agent, pool_size=max_workers)
+        self.rate_limiter = shared_rate_limiter()
     
     def scrape(self) -> List[Dict[str, Any]]:
         """Override this method in child classes"""
         raise NotImplementedError
     
+    def iter_scrape(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield rows as they are parsed, so a streaming pipeline can start on the first
+        page while later ones are still being fetched. Scrapers that fetch in steps
+        override this and implement ``scrape`` as ``list(self.iter_scrape())``.
+        """
+        yield from self.scrape()
+    
     def get_page(self, url: str, delay: float = 1.0) -> str:
-        """Fetch a page with rate limiting"""
-        time.sleep(delay)
+        """Fetch a page, waiting at most ``delay`` seconds per request to the same host"""
+        self.rate_limiter.acquire(url, delay)
         response = self.session.get(url, timeout=30)
         response.raise_for_status()
         return response.text
     
+    def get_pages(self, urls: List[str], delay: float = 1.0) -> List[Optional[str]]:
+        """
+        Fetch many pages concurrently. Requests to one host keep the ``delay`` spacing;
+        different hosts overlap. Returns page text in input order (None on failure).
+        """
+        results = run_bounded(
+            lambda url: self.get_page(url, delay=delay),
+            urls,
+            max_workers=self.max_workers,
+        )
+        pages: List[Optional[str]] = []
+        for url, (text, error) in zip(urls, results):
+            if error is not None:
+                print(f"⚠️  Failed to fetch {url}: {error}")
+            pages.append(text)
+        return pages
+    
+    def iter_listings(self, html: str, name: str, class_: Optional[str] = None) -> Iterator[Any]:
+        """
+        Yield the ``<name class="class_">`` listing containers of a directory page
+        without building a tree of the whole page (see ``listing_parser``)
+        """
+        return iter_listings(html, name, class_)
+    
     def normalize_status(self, status_str: str) -> str:
-        """Normalize status strings to standard values"""
-        status_lower = status_str.lower().strip()
-        
-        if 'operational' in status_lower or 'active' in status_lower or 'live' in status_lower:
-            return 'operational'
-        elif 'construction' in status_lower or 'building' in status_lower:
-            return 'under-construction'
-        elif 'planned' in status_lower or 'future' in status_lower:
-            return 'planned'
-        elif 'closed' in status_lower or 'decommissioned' in status_lower:
-            return 'decommissioned'
-        else:
-            return 'operational'  # Default
+        """Normalize status strings to standard values (vocabulary in ``data/operator_registry.json``)"""
+        return operator_registry().status(status_str)
     
     def normalize_ownership(self, operator: str) -> str:
-        """Determine ownership type from operator name"""
-        operator_lower = operator.lower()
-        
-        # Foreign operators (common international companies)
-        foreign_keywords = [
-            'microsoft', 'google', 'amazon', 'facebook', 'meta',
-            'equinix', 'digital realty', 'global switch',
-            'colt', 'teraco', 'mainone', 'liquid'
-        ]
-        
-        # Local operators (Kenya-specific)
-        local_keywords = [
-            'safaricom', 'kenya data', 'wananchi', 'jamii'
-        ]
-        
-        for keyword in foreign_keywords:
-            if keyword in operator_lower:
-                return 'foreign'
-        
-        for keyword in local_keywords:
-            if keyword in operator_lower:
-                return 'local'
-        
-        # Check for joint ventures
-        if 'joint' in operator_lower or '&' in operator or '-' in operator:
-            return 'joint-venture'
-        
-        return 'foreign'  # Default for unknown
+        """Determine ownership type from operator name (see ``processors.operator_registry``)"""
+        return operator_registry().ownership(operator)
     
     def extract_capacity(self, text: str) -> Dict[str, Any]:
-        """Extract capacity information from text"""
-        import re
-        
-        capacity = {}
-        
-        # Extract MW
-        mw_match = re.search(r'(\d+(?:\.\d+)?)\s*MW', text, re.IGNORECASE)
-        if mw_match:
-            capacity['power_mw'] = float(mw_match.group(1))
-        
-        # Extract square meters or feet
-        sqm_match = re.search(r'(\d+(?:,\d+)?)\s*(?:sqm|m²|square\s+meters?)', text, re.IGNORECASE)
-        if sqm_match:
-            capacity['floor_space_sqm'] = float(sqm_match.group(1).replace(',', ''))
-        
-        sqft_match = re.search(r'(\d+(?:,\d+)?)\s*(?:sqft|sq\s*ft|square\s+feet)', text, re.IGNORECASE)
-        if sqft_match:
-            sqft = float(sqft_match.group(1).replace(',', ''))
-            capacity['floor_space_sqm'] = sqft * 0.092903  # Convert to sqm
-        
-        # Extract racks
-        rack_match = re.search(r'(\d+)\s*racks?', text, re.IGNORECASE)
-        if rack_match:
-            capacity['racks'] = int(rack_match.group(1))
-        
-        return capacity if capacity else None
+        """Extract capacity information from text (see ``processors.capacity_extractor``)"""
+        return extract_capacity(text)
     
     def create_source(self, url: str, name: str) -> Dict[str, Any]:
         """Create a source object"""
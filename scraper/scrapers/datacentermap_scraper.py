@@ -2,8 +2,7 @@
 Scraper for DataCenterMap.com
 """
 
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from .base_scraper import BaseScraper
 
 class DataCenterMapScraper(BaseScraper):
@@ -17,33 +16,30 @@ class DataCenterMapScraper(BaseScraper):
     
     def scrape(self) -> List[Dict[str, Any]]:
         """Scrape data centers from DataCenterMap.com"""
-        data_centers = []
-        
+        return list(self.iter_scrape())
+    
+    def iter_scrape(self) -> Iterator[Dict[str, Any]]:
+        """Yield data centers from DataCenterMap.com listing by listing"""
         # Kenya page
         kenya_url = f"{self.base_url}/kenya/"
         
         try:
             html = self.get_page(kenya_url)
-            soup = BeautifulSoup(html, 'html.parser')
             
             # Find data center listings
             # NOTE: This is a simplified example - actual implementation
             # would need to inspect the real HTML structure
-            listings = soup.find_all('div', class_='data-center-item')
-            
-            for listing in listings:
+            for listing in self.iter_listings(html, 'div', 'data-center-item'):
                 try:
                     dc = self.parse_listing(listing, kenya_url)
                     if dc:
-                        data_centers.append(dc)
+                        yield dc
                 except Exception as e:
                     print(f"⚠️  Failed to parse listing: {e}")
                     continue
             
         except Exception as e:
             print(f"❌ Failed to scrape Kenya page: {e}")
-        
-        return data_centers
     
     def parse_listing(self, listing, source_url: str) -> Dict[str, Any]:
         """
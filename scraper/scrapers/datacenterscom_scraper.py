@@ -2,8 +2,7 @@
 Scraper for Datacenters.com
 """
 
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from .base_scraper import BaseScraper
 
 class DataCentersComScraper(BaseScraper):
@@ -17,32 +16,29 @@ class DataCentersComScraper(BaseScraper):
     
     def scrape(self) -> List[Dict[str, Any]]:
         """Scrape data centers from Datacenters.com"""
-        data_centers = []
-        
+        return list(self.iter_scrape())
+    
+    def iter_scrape(self) -> Iterator[Dict[str, Any]]:
+        """Yield data centers from Datacenters.com listing by listing"""
         # Kenya page
         kenya_url = f"{self.base_url}/locations/kenya"
         
         try:
             html = self.get_page(kenya_url)
-            soup = BeautifulSoup(html, 'html.parser')
             
             # Find data center listings
             # NOTE: This is a simplified example
-            listings = soup.find_all('div', class_='facility-card')
-            
-            for listing in listings:
+            for listing in self.iter_listings(html, 'div', 'facility-card'):
                 try:
                     dc = self.parse_listing(listing, kenya_url)
                     if dc:
-                        data_centers.append(dc)
+                        yield dc
                 except Exception as e:
                     print(f"⚠️  Failed to parse listing: {e}")
                     continue
             
         except Exception as e:
             print(f"❌ Failed to scrape Kenya page: {e}")
-        
-        return data_centers
     
     def parse_listing(self, listing, source_url: str) -> Dict[str, Any]:
         """Parse a single data center listing"""
@@ -0,0 +1,93 @@
+"""
+Conditional-request state for news feeds, backed by SQLite
+
+For each feed URL we keep the ``ETag`` / ``Last-Modified`` validators of the last
+200 response and the articles parsed from it. The next poll sends the validators;
+on ``304 Not Modified`` the stored articles are reused and the feed is not parsed
+again.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "feeds.sqlite3"
+
+
+class FeedState:
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], articles: List[Dict[str, Any]]):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.articles = articles
+
+    def validators(self) -> Dict[str, str]:
+        """Request headers that let the server answer 304."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FeedStateStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = str(path or os.getenv("FEED_STATE_PATH") or DEFAULT_STATE_PATH)
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feed_state (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                articles TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def get(self, url: str) -> Optional[FeedState]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, articles FROM feed_state WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, articles = row
+        return FeedState(etag, last_modified, json.loads(articles))
+
+    def put(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        articles: List[Dict[str, Any]],
+    ) -> None:
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO feed_state (url, etag, last_modified, articles, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    articles = excluded.articles,
+                    fetched_at = excluded.fetched_at
+                """,
+                (url, etag, last_modified, json.dumps(articles), time.time()),
+            )
+            self.conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
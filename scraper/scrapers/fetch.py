@@ -0,0 +1,124 @@
+"""
+Concurrent HTTP fetching with per-host politeness.
+
+Every request takes a token from its host's bucket before it is sent, so requests to
+one host stay spaced out exactly as the old fixed ``time.sleep`` did, while requests
+to different hosts overlap on a bounded worker pool.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .http_cache import CachingHTTPAdapter, http_cache_enabled, shared_http_cache
+
+DEFAULT_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "8"))
+
+
+def host_of(url: str) -> str:
+    """Lower-cased ``host[:port]`` used as the rate-limit key."""
+    return (urlsplit(url).netloc or url).lower()
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host. ``interval_s`` is the steady-state spacing between requests
+    to one host; ``burst`` is how many may go out back-to-back after an idle period.
+    Thread-safe; callers sleep outside the lock so other hosts are never blocked.
+    """
+
+    def __init__(self, interval_s: float = 1.0, burst: int = 1):
+        self.interval_s = interval_s
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # host -> (tokens, last_refill)
+
+    def reserve(self, url: str, interval_s: Optional[float] = None) -> float:
+        """Take a token for ``url``'s host and return how long the caller must wait."""
+        interval = self.interval_s if interval_s is None else interval_s
+        if interval <= 0:
+            return 0.0
+        host = host_of(url)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) / interval)
+            wait = 0.0 if tokens >= 1.0 else (1.0 - tokens) * interval
+            # Tokens may go negative: that is the queue of callers already waiting.
+            self._buckets[host] = (tokens - 1.0, now)
+        return wait
+
+    def acquire(self, url: str, interval_s: Optional[float] = None) -> float:
+        """Block until a request to ``url``'s host is allowed. Returns seconds waited."""
+        wait = self.reserve(url, interval_s)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_shared_limiter = HostRateLimiter()
+
+
+def shared_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter so scrapers that hit the same host share its budget."""
+    return _shared_limiter
+
+
+def build_session(
+    user_agent: str,
+    pool_size: int = DEFAULT_MAX_WORKERS,
+    cache: Optional[bool] = None,
+) -> requests.Session:
+    """
+    Session whose connection pool is large enough for ``pool_size`` concurrent workers.
+    GETs go through the shared on-disk HTTP cache unless ``cache`` is False or
+    ``HTTP_CACHE_DISABLE`` is set.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": user_agent})
+    if cache is None:
+        cache = http_cache_enabled()
+    if cache:
+        adapter: HTTPAdapter = CachingHTTPAdapter(
+            shared_http_cache(), pool_connections=pool_size, pool_maxsize=pool_size
+        )
+    else:
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def run_bounded(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[Tuple[Any, Optional[BaseException]]]:
+    """
+    Apply ``fn`` to every item on at most ``max_workers`` threads.
+    Returns ``(result, error)`` pairs in input order; one failure never aborts the batch.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item: Any) -> Tuple[Any, Optional[BaseException]]:
+        try:
+            return fn(item), None
+        except Exception as exc:  # noqa: BLE001 — reported per item
+            return None, exc
+
+    workers = max(1, min(max_workers, len(items)))
+    if workers == 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(call, items))
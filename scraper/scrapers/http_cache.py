@@ -0,0 +1,324 @@
+"""
+On-disk HTTP cache with conditional revalidation.
+
+``CachingHTTPAdapter`` sits under a ``requests.Session``. A cached GET within
+``max_age_s`` is served without touching the network; an older one is revalidated
+with ``If-None-Match`` / ``If-Modified-Since`` and, on ``304 Not Modified``, the
+stored body is returned as a normal 200. Bodies live in SQLite next to the geocode
+cache, bounded by total size with least-recently-used eviction.
+
+Responses carry an ``X-Cache`` header: ``HIT`` (fresh, no request), ``REVALIDATED``
+(304) or ``MISS``. Requests that already carry conditional headers are passed
+through untouched so callers that track validators themselves keep full control.
+
+Streamed bodies are stored as the caller reads them. A caller that stops early
+(the source enricher stops at ``</title>``) leaves a *partial* entry: the
+validators plus the bytes it read. Partial entries are only offered to streamed
+requests, which revalidate them like any other and read the stored prefix back,
+ending where the earlier reader stopped (``X-Cache-Partial: true``); a request for
+the whole body ignores them and replaces them.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "http.sqlite3"
+DEFAULT_MAX_AGE_S = float(os.getenv("HTTP_CACHE_MAX_AGE_S", "0"))
+DEFAULT_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+DEFAULT_MAX_ENTRY_BYTES = int(os.getenv("HTTP_CACHE_MAX_ENTRY_BYTES", str(2 * 1024 * 1024)))
+
+# Stored bodies are already decoded, so these no longer describe them
+_DROP_HEADERS = {
+    "content-encoding", "content-length", "transfer-encoding", "connection",
+    "keep-alive", "set-cookie", "x-cache",
+}
+_CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+CacheEntry = Tuple[Dict[str, str], bytes, float, bool]  # headers, body, validated_at, partial
+
+
+class HttpCache:
+    """SQLite body store keyed by URL, bounded by total body bytes (LRU)."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = str(path or os.getenv("HTTP_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                validated_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                partial INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(http_cache)")}
+        if "partial" not in columns:  # cache files written before partial entries
+            self.conn.execute("ALTER TABLE http_cache ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache (accessed_at)"
+        )
+        self.conn.commit()
+        self._total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT headers, body, validated_at, partial FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE http_cache SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+        return json.loads(row[0]), bytes(row[1]), row[2], bool(row[3])
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes, partial: bool = False) -> None:
+        """Store a body; ``partial`` when it is only the first bytes a streamed reader took."""
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM http_cache WHERE url = ?", (url,)).fetchone()
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO http_cache (url, headers, body, size, validated_at, accessed_at, partial)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, json.dumps(headers), sqlite3.Binary(body), len(body), now, now, int(partial)),
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            self._evict()
+            self.conn.commit()
+
+    def mark_validated(self, url: str) -> None:
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "UPDATE http_cache SET validated_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+            )
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT url, size FROM http_cache ORDER BY accessed_at ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total = 0
+                return
+            for url, size in rows:
+                self.conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+                self._total -= size
+                if self._total <= self.max_bytes:
+                    return
+
+    def record(self, label: str) -> None:
+        with self._lock:
+            if label == "HIT":
+                self.hits += 1
+            elif label == "REVALIDATED":
+                self.revalidated += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        requests_seen = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.revalidated) / requests_seen, 4) if requests_seen else None,
+            "bytes": self._total,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+class _CachingRaw:
+    """
+    Stand-in for ``response.raw`` on a streamed response: hands the body to the
+    caller as it reads and stores it once the caller reaches the end. A caller that
+    stops early (the enricher's ``</title>`` scan, its byte cap) and closes the
+    response leaves a partial entry with what it read; a body over the entry limit
+    is stored as a partial entry of its first ``max_bytes``.
+    """
+
+    def __init__(self, raw: Any, on_store: Callable[[bytes, bool], None], max_bytes: int):
+        self._raw = raw
+        self._on_store = on_store
+        self._max_bytes = max_bytes
+        self._parts: List[bytes] = []
+        self._size = 0
+        self._truncated = False
+        self._keep = True
+        self._stored = False
+
+    def stream(self, amt: int = 2 ** 16, decode_content: Optional[bool] = None) -> Iterator[bytes]:
+        # Stored bodies are decoded; an undecoded read is passed through uncached
+        self._keep = self._keep and decode_content is not False
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            if self._keep and not self._truncated:
+                room = self._max_bytes - self._size
+                if len(chunk) > room:
+                    chunk_kept, self._truncated = chunk[:room], True
+                else:
+                    chunk_kept = chunk
+                self._parts.append(chunk_kept)
+                self._size += len(chunk_kept)
+            yield chunk
+        self._store(partial=self._truncated)
+
+    def _store(self, partial: bool) -> None:
+        if self._stored or not self._keep:
+            return
+        self._stored = True
+        self._on_store(b"".join(self._parts), partial)
+
+    def close(self) -> None:
+        # Called by ``Response.close()`` when the caller stopped before the end
+        if self._parts:
+            self._store(partial=True)
+        self._raw.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    def __init__(
+        self,
+        cache: HttpCache,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+        **kwargs: Any,
+    ):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.max_age_s = max_age_s
+        self.max_entry_bytes = max_entry_bytes
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs: Any) -> requests.Response:
+        if request.method != "GET" or any(h in request.headers for h in _CONDITIONAL_HEADERS):
+            return super().send(request, stream=stream, **kwargs)
+
+        url = request.url
+        entry = self.cache.get(url)
+        if entry is not None and entry[3] and not stream:
+            entry = None  # only the start of the body is stored; fetch all of it
+        if entry is not None:
+            headers, body, validated_at, partial = entry
+            if self.max_age_s > 0 and time.time() - validated_at < self.max_age_s:
+                return self._cached_response(request, headers, body, "HIT", partial)
+            if headers.get("etag"):
+                request.headers["If-None-Match"] = headers["etag"]
+            if headers.get("last-modified"):
+                request.headers["If-Modified-Since"] = headers["last-modified"]
+
+        resp = super().send(request, stream=stream, **kwargs)
+
+        if resp.status_code == 304 and entry is not None:
+            resp.close()
+            self.cache.mark_validated(url)
+            return self._cached_response(request, entry[0], entry[1], "REVALIDATED", entry[3])
+
+        resp.headers["X-Cache"] = "MISS"
+        self.cache.record("MISS")
+        if resp.status_code == 200 and self._cacheable(resp, stream):
+            self._store(url, resp, stream)
+        return resp
+
+    def _cacheable(self, resp: requests.Response, stream: bool) -> bool:
+        if "no-store" in resp.headers.get("Cache-Control", "").lower():
+            return False
+        has_validator = "ETag" in resp.headers or "Last-Modified" in resp.headers
+        if not has_validator and self.max_age_s <= 0:
+            return False  # could never be reused
+        if stream:
+            return True  # a long body keeps its first max_entry_bytes as a partial entry
+        length = resp.headers.get("Content-Length")
+        return not (length and length.isdigit() and int(length) > self.max_entry_bytes)
+
+    def _store(self, url: str, resp: requests.Response, stream: bool) -> None:
+        headers = {k.lower(): v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS}
+        if stream:
+            # Nothing is read here: the body is stored as far as the caller reads it
+            resp.raw = _CachingRaw(
+                resp.raw,
+                lambda body, partial: self.cache.put(url, headers, body, partial),
+                self.max_entry_bytes,
+            )
+            return
+        body = resp.content
+        if len(body) <= self.max_entry_bytes:
+            self.cache.put(url, headers, body)
+
+    def _cached_response(
+        self,
+        request: requests.PreparedRequest,
+        headers: Dict[str, str],
+        body: bytes,
+        label: str,
+        partial: bool = False,
+    ) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.reason = "OK"
+        resp.headers = CaseInsensitiveDict(headers)
+        resp.headers["Content-Length"] = str(len(body))
+        resp.headers["X-Cache"] = label
+        if partial:
+            resp.headers["X-Cache-Partial"] = "true"
+        self.cache.record(label)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.raw = io.BytesIO(body)
+        resp._content = body
+        resp._content_consumed = True
+        resp.url = request.url
+        resp.request = request
+        resp.connection = self
+        return resp
+
+
+_shared_cache: Optional[HttpCache] = None
+_shared_lock = threading.Lock()
+
+
+def http_cache_enabled() -> bool:
+    return os.getenv("HTTP_CACHE_DISABLE", "").lower() not in ("1", "true", "yes")
+
+
+def shared_http_cache() -> HttpCache:
+    """One store per process, shared by every scraper session and the source enricher."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache()
+        return _shared_cache
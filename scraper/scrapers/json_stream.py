@@ -0,0 +1,119 @@
+"""
+Incremental reader for one array inside a large JSON object.
+
+Overpass answers ``{"version": ..., "osm3s": {...}, "elements": [ ... ], "remark": ...}``
+where ``elements`` can run to hundreds of megabytes. ``iter_array_items`` walks the
+top-level object as text arrives and yields the items of one key's array one at a
+time with ``json.JSONDecoder.raw_decode``; only the item being decoded is buffered.
+Other top-level keys are decoded whole into ``meta``.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_WHITESPACE = ' \t\n\r'
+_COMPACT_AT = 64 * 1024
+
+
+class JsonStreamError(ValueError):
+    pass
+
+
+class _Reader:
+    def __init__(self, chunks: Iterable[Any]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _more(self) -> bool:
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            if chunk:
+                if self.pos > _COMPACT_AT:
+                    self.buf = self.buf[self.pos:]
+                    self.pos = 0
+                self.buf += chunk
+                return True
+        self.buf += self._decoder.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ''
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise JsonStreamError(f"expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self._more():
+                    continue
+                raise JsonStreamError(f"invalid JSON at offset {self.pos}: {e.msg}") from e
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buf) and self._more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array_items(
+    chunks: Iterable[Any],
+    key: str,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """
+    Yield the items of ``document[key]`` from a stream of ``str`` or UTF-8 ``bytes``
+    chunks holding one JSON object. Every other top-level key is stored in ``meta``
+    (as it is reached, so keys after the array are only there once iteration ends).
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.value()
+        if not isinstance(name, str):
+            raise JsonStreamError(f"expected an object key at offset {reader.pos}")
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.peek() == ',':
+                        reader.pos += 1
+                        continue
+                    reader.expect(']')
+                    break
+        else:
+            value = reader.value()
+            if meta is not None:
+                meta[name] = value
+        if reader.peek() == ',':
+            reader.pos += 1
+            continue
+        reader.expect('}')
+        return
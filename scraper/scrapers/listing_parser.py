@@ -0,0 +1,158 @@
+"""
+Targeted parsing of directory listing pages.
+
+Site scrapers only need the listing containers (``<div class="facility-card">``
+and the like), not a tree of the whole page. ``iter_listings`` feeds the page to
+lxml's pull parser in chunks and keeps only the matching containers; everything
+else is dropped as soon as it has been parsed, so memory does not grow with the
+page. Each listing is handed out as a ``ListingNode``, which supports the small
+part of BeautifulSoup's ``Tag`` API the ``parse_listing`` methods use (``find``,
+``find_all``, ``text``, ``get_text``, ``get`` / ``[]``).
+
+Without lxml installed it falls back to BeautifulSoup restricted with a
+SoupStrainer, which yields real bs4 tags.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+FEED_CHUNK = 64 * 1024
+
+
+def _has_class(value: Optional[Union[str, List[str]]], class_: Optional[str]) -> bool:
+    if class_ is None:
+        return True
+    if not value:
+        return False
+    values = value.split() if isinstance(value, str) else value
+    return class_ in values
+
+
+class ListingNode:
+    """Read-only bs4-style view of an lxml element."""
+
+    __slots__ = ('_el',)
+
+    def __init__(self, element: Any):
+        self._el = element
+
+    @property
+    def name(self) -> str:
+        return self._el.tag
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        attrs: Dict[str, Any] = dict(self._el.attrib)
+        if 'class' in attrs:
+            attrs['class'] = attrs['class'].split()
+        return attrs
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        # ``text()`` nodes skip comments, as bs4 does, and stop before this tag's tail
+        parts = [str(t) for t in self._el.xpath('.//text()')]
+        if strip:
+            parts = [p.strip() for p in parts if p.strip()]
+        return separator.join(parts)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attrs[key]
+
+    def _matches(self, el: Any, name: Optional[str], class_: Optional[str]) -> bool:
+        if not isinstance(el.tag, str):  # comments, processing instructions
+            return False
+        return (name is None or el.tag == name) and _has_class(el.get('class'), class_)
+
+    def find_all(self, name: Optional[str] = None, class_: Optional[str] = None) -> List['ListingNode']:
+        return [ListingNode(el) for el in self._el.iterdescendants() if self._matches(el, name, class_)]
+
+    def find(self, name: Optional[str] = None, class_: Optional[str] = None) -> Optional['ListingNode']:
+        for el in self._el.iterdescendants():
+            if self._matches(el, name, class_):
+                return ListingNode(el)
+        return None
+
+    def __str__(self) -> str:
+        return etree.tostring(self._el, encoding='unicode', method='html', with_tail=False)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def iter_listings(html: Union[str, bytes], name: str, class_: Optional[str] = None) -> Iterator[Any]:
+    """
+    Yield every ``<name class="... class_ ...">`` element of ``html`` in document
+    order, like ``BeautifulSoup(html).find_all(name, class_=class_)``.
+    """
+    if not html:
+        return
+    if not LXML_AVAILABLE:
+        yield from _iter_listings_bs4(html, name, class_)
+        return
+
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    open_listings = 0
+    for start in range(0, len(html), FEED_CHUNK):
+        parser.feed(html[start:start + FEED_CHUNK])
+        for out in _drain(parser, name, class_, open_listings):
+            if isinstance(out, int):
+                open_listings = out
+            else:
+                yield out
+    parser.close()
+    for out in _drain(parser, name, class_, open_listings):
+        if not isinstance(out, int):
+            yield out
+
+
+def _drain(parser: Any, name: str, class_: Optional[str], open_listings: int) -> Iterator[Any]:
+    """
+    Handle queued parser events. Yields listing nodes, and the updated count of
+    listings still open (as an int) at the end.
+    """
+    for event, el in parser.read_events():
+        is_listing = el.tag == name and _has_class(el.get('class'), class_)
+        if event == 'start':
+            open_listings += is_listing
+            continue
+        if is_listing:
+            open_listings -= 1
+            if open_listings:
+                continue  # nested listing: emitted with its outermost container
+            detached = copy.deepcopy(el)
+            detached.tail = None
+            yield ListingNode(detached)
+            for inner in detached.iterdescendants(name):
+                if _has_class(inner.get('class'), class_):
+                    yield ListingNode(inner)
+        elif open_listings:
+            continue  # still part of a listing being built
+        el.clear(keep_tail=True)
+        # Drop finished siblings so the tree never holds more than the open path
+        parent = el.getparent()
+        while parent is not None and el.getprevious() is not None:
+            del parent[0]
+    yield open_listings
+
+
+def _iter_listings_bs4(html: Union[str, bytes], name: str, class_: Optional[str]) -> Iterator[Any]:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    # A callable matcher: during a strained parse ``class`` is still one string
+    strainer = SoupStrainer(name, attrs={'class': lambda value: _has_class(value, class_)} if class_ else {})
+    soup = BeautifulSoup(html, 'html.parser', parse_only=strainer)
+    yield from soup.find_all(name, class_=class_)
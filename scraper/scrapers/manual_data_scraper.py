@@ -4,15 +4,77 @@ Curated data from research and public sources
 
 Tier A (Kenya): prefer ``data/kenya_curated.json`` when present so the catalogue
 can be edited without changing Python. Otherwise the inline list below is used.
+
+Every record carries a ``content_hash`` of its catalogue entry, stored with the
+published row, so a run only pushes records that were added or edited.
 """
 
+import hashlib
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Tuple
 from .base_scraper import BaseScraper
 
 CURATED_REL_PATH = Path(__file__).resolve().parent.parent / "data" / "kenya_curated.json"
 
+# Bump when the way a curated record becomes a published row changes, so the next
+# run republishes everything
+CONTENT_HASH_VERSION = "1"
+
+# Rows published without resolving their source pages are stored as this prefix plus
+# the record's hash: up to date for runs that don't fetch either, republished by the
+# next run that does
+UNENRICHED_PREFIX = "raw:"
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Stable hash of a catalogue entry; source fetch times and key order do not count."""
+    canonical = {k: v for k, v in record.items() if k not in ("sources", "content_hash")}
+    canonical["sources"] = [
+        {"url": s.get("url"), "name": s.get("name")}
+        for s in record.get("sources") or []
+        if isinstance(s, dict)
+    ]
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{CONTENT_HASH_VERSION}|{payload}".encode("utf-8")).hexdigest()[:40]
+
+
+def mark_unenriched(records: List[Dict[str, Any]]) -> None:
+    """Store ``records`` as still needing source enrichment (see ``UNENRICHED_PREFIX``)."""
+    for record in records:
+        if record.get("content_hash") and not record["content_hash"].startswith(UNENRICHED_PREFIX):
+            record["content_hash"] = UNENRICHED_PREFIX + record["content_hash"]
+
+
+
+def curated_changes(
+    records: List[Dict[str, Any]],
+    published: Dict[Tuple[str, str], str],
+    force: bool = False,
+    enrich: bool = True,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+    """
+    Records that are new or whose ``content_hash`` differs from ``published`` (all of
+    them when ``force``), and the published ``(name, city)`` keys no longer in
+    ``records``. Keys are lower-cased like the ``data_centers`` unique index.
+
+    A row published unenriched matches its record's hash with ``UNENRICHED_PREFIX``
+    in front when this run does not ``enrich`` source pages either; a run that does
+    takes it again so the resolved links get published.
+    """
+    def up_to_date(stored: Any, current: Any) -> bool:
+        if stored == current:
+            return True
+        return not enrich and current is not None and stored == UNENRICHED_PREFIX + current
+
+    by_key = {(str(r["name"]).lower(), str(r["city"]).lower()): r for r in records}
+    changed = [
+        r for key, r in by_key.items()
+        if force or not up_to_date(published.get(key), r.get("content_hash"))
+    ]
+    removed = [key for key in published if key not in by_key]
+    return changed, removed
+
 
 class ManualDataScraper(BaseScraper):
     def __init__(self):
@@ -22,6 +84,7 @@ class ManualDataScraper(BaseScraper):
         out: List[Dict[str, Any]] = []
         for rec in records:
             r = dict(rec)
+            r["content_hash"] = content_hash(rec)
             sources = []
             for s in r.get("sources") or []:
                 if isinstance(s, dict) and "scraped_at" in s:
@@ -490,5 +553,7 @@ class ManualDataScraper(BaseScraper):
             },
         ]
         
+        for dc in data_centers:
+            dc['content_hash'] = content_hash(dc)
         return data_centers
 
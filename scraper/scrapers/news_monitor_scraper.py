@@ -4,12 +4,16 @@ Finds data center-related news articles for manual review
 Does NOT automatically add to database - flags for review instead
 """
 
+import os
 import re
-import time
+import threading
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 from .base_scraper import BaseScraper
+from processors.keyword_matcher import KeywordMatcher
+from .feed_state import FeedStateStore
+from .fetch import run_bounded
 
 try:
     import feedparser
@@ -25,8 +29,12 @@ class NewsMonitorScraper(BaseScraper):
     Flags articles for manual review instead of auto-adding to database.
     """
     
-    def __init__(self):
+    def __init__(self, feed_state: Optional[FeedStateStore] = None):
         super().__init__("News Monitor")
+        self.feed_delay = float(os.getenv('NEWS_FEED_DELAY_S', '2.0'))  # per host
+        self._feed_state = feed_state
+        self.feeds_not_modified = 0
+        self._count_lock = threading.Lock()
         self.keywords = [
             'data center', 'datacenter', 'data centre',
             'ai infrastructure', 'gpu facility', 'cloud infrastructure',
@@ -34,6 +42,7 @@ class NewsMonitorScraper(BaseScraper):
             'nvidia', 'microsoft azure', 'google cloud', 'aws',
             'ixafrica', 'africa data centres', 'raxiogroup'
         ]
+        self.keyword_matcher = KeywordMatcher(self.keywords)
         
         # News sources to monitor (RSS feeds and search pages)
         self.news_sources = [
@@ -63,48 +72,73 @@ class NewsMonitorScraper(BaseScraper):
             },
         ]
     
+    @property
+    def feed_state(self) -> FeedStateStore:
+        if self._feed_state is None:
+            self._feed_state = FeedStateStore()
+        return self._feed_state
+    
     def scrape(self) -> List[Dict[str, Any]]:
         """
         Scans news sources for data center articles.
         Returns list of flagged articles for review (NOT data centers).
+        Sources are polled concurrently; feeds on the same host stay ``feed_delay`` apart.
         """
         flagged_articles = []
+        self.feeds_not_modified = 0
         
         print(f"\n📰 Monitoring {len(self.news_sources)} news sources...")
         
-        for source in self.news_sources:
-            try:
-                print(f"  Checking {source['name']}...")
-                
-                # Try RSS feed first
-                if RSS_AVAILABLE and source.get('rss_url'):
-                    articles = self._check_rss_feed(source)
-                else:
-                    # Fallback to web search
-                    articles = self._check_web_search(source)
-                
-                # Filter for data center relevance
-                relevant = self._filter_relevant(articles)
-                flagged_articles.extend(relevant)
-                
-                time.sleep(2)  # Rate limiting
-                
-            except Exception as e:
-                print(f"  ⚠️  Error checking {source['name']}: {e}")
+        results = run_bounded(self._check_source, self.news_sources, max_workers=max(1, len(self.news_sources)))
+        for source, (articles, error) in zip(self.news_sources, results):
+            if error is not None:
+                print(f"  ⚠️  Error checking {source['name']}: {error}")
                 continue
+            
+            # Filter for data center relevance
+            relevant = self._filter_relevant(articles)
+            flagged_articles.extend(relevant)
         
+        if self.feeds_not_modified:
+            print(f"  {self.feeds_not_modified} feed(s) unchanged since the last run")
         print(f"✅ Found {len(flagged_articles)} relevant articles for review")
         return flagged_articles
     
+    def _check_source(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        print(f"  Checking {source['name']}...")
+        
+        # Try RSS feed first
+        if RSS_AVAILABLE and source.get('rss_url'):
+            return self._check_rss_feed(source)
+        # Fallback to web search
+        return self._check_web_search(source)
+    
     def _check_rss_feed(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Check RSS feed for recent articles"""
+        """
+        Check RSS feed for recent articles. The feed's stored ETag / Last-Modified are
+        sent along; on 304 the articles parsed last time are reused without parsing.
+        """
         if not RSS_AVAILABLE:
             print(f"    Note: RSS feeds require feedparser. Install with: pip install feedparser")
             return []
         
+        url = source['rss_url']
         articles = []
         try:
-            feed = feedparser.parse(source['rss_url'])
+            state = self.feed_state.get(url)
+            self.rate_limiter.acquire(url, self.feed_delay)
+            response = self.session.get(url, headers=state.validators() if state else {}, timeout=30)
+            
+            if response.status_code == 304 and state is not None:
+                with self._count_lock:
+                    self.feeds_not_modified += 1
+                return self._recent(state.articles)
+            response.raise_for_status()
+            
+            feed = feedparser.parse(
+                response.content,
+                response_headers={**response.headers, 'content-location': response.url},
+            )
             
             # Check last 7 days of articles
             cutoff_date = datetime.now() - timedelta(days=7)
@@ -124,12 +158,21 @@ class NewsMonitorScraper(BaseScraper):
                     })
                 except:
                     continue
+            
+            self.feed_state.put(
+                url, response.headers.get('ETag'), response.headers.get('Last-Modified'), articles
+            )
                     
         except Exception as e:
             print(f"    ⚠️  RSS feed error: {e}")
         
         return articles
     
+    def _recent(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Stored articles still inside the 7-day window (copies, as filtering annotates them)"""
+        cutoff = (datetime.now() - timedelta(days=7)).isoformat()
+        return [dict(a) for a in articles if a.get('published', '') >= cutoff]
+    
     def _check_web_search(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Fallback: search web page for articles"""
         articles = []
@@ -142,15 +185,8 @@ class NewsMonitorScraper(BaseScraper):
         """Filter articles that mention data centers"""
         relevant = []
         
-        for article in articles:
-            text = f"{article.get('title', '')} {article.get('summary', '')}".lower()
-            
-            # Check if article mentions any keywords
-            matches = []
-            for keyword in self.keywords:
-                if keyword.lower() in text:
-                    matches.append(keyword)
-            
+        texts = (f"{article.get('title', '')} {article.get('summary', '')}" for article in articles)
+        for article, matches in zip(articles, self.keyword_matcher.matched_many(texts)):
             if matches:
                 article['matched_keywords'] = matches
                 article['relevance_score'] = len(matches)
@@ -1,20 +1,281 @@
 """
-OpenStreetMap Kenya harvester (Tier B/C stub).
+OpenStreetMap Kenya harvester (Tier C).
 
-Extend with Overpass queries filtered to Kenya (ISO-3166-1: KE) when you need
-live POI discovery. Staged rows always go through ``ingestion_candidates``.
+Queries Overpass for data-centre tags inside Kenya (ISO-3166-1: KE). The country's
+bounding box is split into tiles that are fetched concurrently, each response is
+decoded element by element as it streams in (``json_stream``), and every tile is
+cached with a TTL (``overpass_cache``). Once a tile's TTL runs out, a count-only
+probe asks Overpass whether anything in it changed; unchanged tiles are served
+from the cache, so a run costs one full query per *changed* tile rather than
+one per tile. Staged rows always go through ``ingestion_candidates``.
 """
 
-from typing import List, Dict, Any
+import hashlib
+import math
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
 from .base_scraper import BaseScraper
+from .json_stream import iter_array_items
+from .overpass_cache import OverpassTileCache, osm_key
+
+OVERPASS_URL = os.getenv("OVERPASS_URL", "https://overpass-api.de/api/interpreter")
+OVERPASS_TIMEOUT_S = int(os.getenv("OVERPASS_TIMEOUT_S", "90"))
+OVERPASS_DELAY_S = float(os.getenv("OVERPASS_DELAY_S", "1.0"))
+OSM_TILE_DEG = float(os.getenv("OSM_TILE_DEG", "2.0"))
+OSM_TILE_WORKERS = int(os.getenv("OSM_TILE_WORKERS", "2"))  # public Overpass allows ~2 slots per IP
+
+# south, west, north, east
+KENYA_BBOX = (-4.72, 33.90, 5.03, 41.91)
+
+# Tag filters for facilities; both spellings are in use in East Africa
+DATA_CENTER_FILTERS = (
+    '["telecom"="data_center"]',
+    '["telecom"="data_centre"]',
+    '["building"="data_center"]',
+    '["building"="data_centre"]',
+    '["man_made"="data_center"]',
+)
+
+Tile = Tuple[float, float, float, float]
+
+_TILE_DONE = object()
+_TILE_FAILED = object()
+READ_CHUNK = 64 * 1024
+
+
+# A side may exceed the tile step by this fraction rather than leave a thin extra
+# row or column of tiles (Kenya is 8.01 degrees wide: 4 columns, not 5)
+TILE_SLACK = 0.05
+
+
+def split_bbox(bbox: Tile, step_deg: float) -> List[Tile]:
+    """Cover ``bbox`` with equal tiles of about ``step_deg`` degrees on a side (see ``TILE_SLACK``)."""
+    south, west, north, east = bbox
+    rows = max(1, math.ceil(round((north - south) / step_deg - TILE_SLACK, 6)))
+    cols = max(1, math.ceil(round((east - west) / step_deg - TILE_SLACK, 6)))
+    height, width = (north - south) / rows, (east - west) / cols
+    return [
+        (
+            round(south + r * height, 4),
+            round(west + c * width, 4),
+            round(south + (r + 1) * height, 4),
+            round(west + (c + 1) * width, 4),
+        )
+        for r in range(rows)
+        for c in range(cols)
+    ]
+
+
+def _tile_id(tile: Tile) -> str:
+    return ",".join(f"{v:.4f}" for v in tile)
+
+
+def _selection(tile: Tile) -> str:
+    bbox = ",".join(str(v) for v in tile)
+    lines = "\n".join(f"  nwr{f}(area.ke)({bbox});" for f in DATA_CENTER_FILTERS)
+    return (
+        f'area["ISO3166-1"="KE"][admin_level=2]->.ke;\n'
+        f"(\n{lines}\n)->.dc;\n"
+    )
+
+
+def build_query(tile: Tile, timeout_s: int = OVERPASS_TIMEOUT_S) -> str:
+    """Overpass QL for every data-centre object in ``tile`` with tags and a centre point."""
+    return f"[out:json][timeout:{timeout_s}];\n{_selection(tile)}.dc out tags center;\n"
+
+
+def build_change_probe(tile: Tile, since: str, timeout_s: int = OVERPASS_TIMEOUT_S) -> str:
+    """Two counts for ``tile``: all matching objects, and those edited after ``since``."""
+    return (
+        f"[out:json][timeout:{timeout_s}];\n{_selection(tile)}"
+        f'.dc out count;\nnwr.dc(newer:"{since}");\nout count;\n'
+    )
 
 
 class OsmKenyaScraper(BaseScraper):
     source_system = "osm_kenya"
 
-    def __init__(self):
-        super().__init__("OpenStreetMap Kenya (stub)")
+    def __init__(
+        self,
+        overpass_url: str = OVERPASS_URL,
+        tile_deg: float = OSM_TILE_DEG,
+        tile_workers: int = OSM_TILE_WORKERS,
+        cache: Optional[OverpassTileCache] = None,
+        delay: float = OVERPASS_DELAY_S,
+    ):
+        super().__init__("OpenStreetMap Kenya", max_workers=tile_workers)
+        self.overpass_url = overpass_url
+        self.tiles = split_bbox(KENYA_BBOX, tile_deg)
+        self.tile_workers = max(1, tile_workers)
+        self.delay = delay
+        self._cache = cache
+        self.tiles_failed = 0
+
+    @property
+    def cache(self) -> OverpassTileCache:
+        if self._cache is None:
+            self._cache = OverpassTileCache()
+        return self._cache
 
     def scrape(self) -> List[Dict[str, Any]]:
-        # Placeholder: add Overpass API call + parsing; keep Kenya bbox / area:KE filter.
-        return []
+        return list(self.iter_scrape())
+
+    def iter_scrape(self) -> Iterator[Dict[str, Any]]:
+        """Yield one row per OSM object, tile by tile as each tile's response streams in"""
+        seen = set()  # ways and relations crossing a tile edge come back from both tiles
+        for element in self._iter_elements():
+            key = osm_key(element)
+            if key in seen:
+                continue
+            seen.add(key)
+            try:
+                row = self.parse_element(element)
+            except Exception as e:
+                print(f"⚠️  Failed to parse OSM element {key}: {e}")
+                continue
+            if row:
+                yield row
+
+    def _iter_elements(self) -> Iterator[Dict[str, Any]]:
+        """Elements from all tiles, fetched on ``tile_workers`` threads."""
+        out: "queue.Queue[Any]" = queue.Queue(maxsize=1024)
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    out.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def work(tile: Tile) -> None:
+            # Failures are counted by the consumer, so workers share no counters
+            done = _TILE_DONE
+            try:
+                for element in self._tile_elements(tile):
+                    if not put(element):
+                        return
+            except Exception as e:
+                done = _TILE_FAILED
+                print(f"⚠️  Overpass tile {_tile_id(tile)} failed: {e}")
+            finally:
+                put(done)
+
+        self.tiles_failed = 0
+        pool = ThreadPoolExecutor(max_workers=self.tile_workers)
+        try:
+            for tile in self.tiles:
+                pool.submit(work, tile)
+            remaining = len(self.tiles)
+            while remaining:
+                item = out.get()
+                if item is _TILE_DONE or item is _TILE_FAILED:
+                    remaining -= 1
+                    if item is _TILE_FAILED:
+                        self.tiles_failed += 1
+                else:
+                    yield item
+        finally:
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _tile_elements(self, tile: Tile) -> Iterator[Dict[str, Any]]:
+        tile_id = _tile_id(tile)
+        query = build_query(tile)
+        query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        info = self.cache.info(tile_id, query_hash)
+
+        if self.cache.is_fresh(info):
+            self.cache.hits += 1
+            yield from self.cache.iter_elements(tile_id)
+            return
+        if info is not None and info.osm_base and self._tile_unchanged(tile, info.osm_base, info.elements):
+            self.cache.unchanged += 1
+            self.cache.touch(tile_id)
+            yield from self.cache.iter_elements(tile_id)
+            return
+
+        self.cache.misses += 1
+        meta: Dict[str, Any] = {}
+        yield from self.cache.store(tile_id, query_hash, self._stream_query(query, meta), meta)
+        if meta.get("remark"):
+            print(f"⚠️  Overpass remark for tile {tile_id}: {meta['remark']}")
+
+    def _tile_unchanged(self, tile: Tile, since: str, cached_elements: int) -> bool:
+        """True when the tile still has as many matches as cached and none edited since."""
+        try:
+            counts = [
+                int((el.get("tags") or {}).get("total", -1))
+                for el in self._stream_query(build_change_probe(tile, since), {})
+                if el.get("type") == "count"
+            ]
+        except Exception as e:
+            print(f"⚠️  Overpass change probe failed for tile {_tile_id(tile)}: {e}")
+            return False
+        return counts == [cached_elements, 0]
+
+    def _stream_query(self, query: str, meta: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """POST ``query`` and yield ``elements`` without holding the whole response."""
+        self.rate_limiter.acquire(self.overpass_url, self.delay)
+        response = self.session.post(
+            self.overpass_url,
+            data={"data": query},
+            timeout=OVERPASS_TIMEOUT_S + 30,
+            stream=True,
+        )
+        with response:
+            response.raise_for_status()
+            yield from iter_array_items(response.iter_content(READ_CHUNK), "elements", meta)
+
+    def parse_element(self, element: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Map an Overpass element (``out tags center``) to a harvested row"""
+        tags = element.get("tags") or {}
+        center = element.get("center") or {}
+        lat = element.get("lat", center.get("lat"))
+        lon = element.get("lon", center.get("lon"))
+        if lat is None or lon is None:
+            return None
+
+        osm_type, osm_id = element.get("type"), element.get("id")
+        operator = tags.get("operator") or tags.get("owner") or "Unknown"
+        name = tags.get("name") or tags.get("name:en")
+        if not name:
+            name = f"{operator} data centre" if operator != "Unknown" else f"Data centre (OSM {osm_type} {osm_id})"
+
+        street = " ".join(p for p in (tags.get("addr:housenumber"), tags.get("addr:street")) if p)
+        city = tags.get("addr:city") or tags.get("addr:town") or tags.get("is_in:city") or ""
+        address = ", ".join(p for p in (street, city, "Kenya") if p) if street else f"{lat:.5f}, {lon:.5f}"
+
+        if "construction" in tags:
+            status = "under-construction"
+        elif tags.get("disused") == "yes" or "disused:telecom" in tags:
+            status = "decommissioned"
+        else:
+            status = self.normalize_status(tags.get("status", ""))
+
+        url = f"https://www.openstreetmap.org/{osm_type}/{osm_id}"
+        row = {
+            "name": name,
+            "operator": operator,
+            "address": address,
+            "city": city,
+            "country": "Kenya",
+            "latitude": float(lat),
+            "longitude": float(lon),
+            "status": status,
+            "ownership_type": self.normalize_ownership(operator),
+            "sources": [self.create_source(url, self.name)],
+            "osm_id": f"{osm_type}/{osm_id}",
+        }
+        if tags.get("website"):
+            row["website"] = tags["website"]
+        capacity = self.extract_capacity(" ".join(filter(None, (tags.get("description"), tags.get("note")))))
+        if capacity:
+            row["capacity"] = capacity
+        return row
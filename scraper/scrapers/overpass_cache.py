@@ -0,0 +1,168 @@
+"""
+Per-tile cache of Overpass results backed by SQLite
+
+Each tile's elements are stored one row per OSM object as they stream in, and the
+tile only counts as cached once its whole response has been read. ``fresh`` tiles
+are served without touching the network; older ones can be kept after a cheap
+"has anything changed" probe by calling ``touch``.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "overpass.sqlite3"
+
+WRITE_BATCH = 500
+READ_BATCH = 500
+
+
+def osm_key(element: Dict[str, Any]) -> str:
+    """``node/123``-style identity of an Overpass element."""
+    return f"{element.get('type')}/{element.get('id')}"
+
+
+class TileInfo:
+    def __init__(self, fetched_at: float, osm_base: Optional[str], elements: int):
+        self.fetched_at = fetched_at
+        self.osm_base = osm_base
+        self.elements = elements
+
+
+class OverpassTileCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_s: float = float(os.getenv("OSM_TILE_TTL_S", str(86400))),
+    ):
+        self.path = str(path or os.getenv("OSM_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.unchanged = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS overpass_tiles (
+                tile TEXT PRIMARY KEY,
+                query_hash TEXT NOT NULL,
+                fetched_at REAL,
+                osm_base TEXT,
+                elements INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS overpass_elements (
+                tile TEXT NOT NULL,
+                osm_key TEXT NOT NULL,
+                body TEXT NOT NULL,
+                PRIMARY KEY (tile, osm_key)
+            );
+            """
+        )
+        self.conn.commit()
+
+    def info(self, tile: str, query_hash: str) -> Optional[TileInfo]:
+        """The complete cached copy of ``tile`` for this query, if there is one."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT fetched_at, osm_base, elements FROM overpass_tiles "
+                "WHERE tile = ? AND query_hash = ? AND fetched_at IS NOT NULL",
+                (tile, query_hash),
+            ).fetchone()
+        return TileInfo(*row) if row else None
+
+    def is_fresh(self, info: Optional[TileInfo]) -> bool:
+        return info is not None and time.time() - info.fetched_at <= self.ttl_s
+
+    def touch(self, tile: str) -> None:
+        """Restart the TTL of a tile that was checked and found unchanged."""
+        with self._lock:
+            self.conn.execute("UPDATE overpass_tiles SET fetched_at = ? WHERE tile = ?", (time.time(), tile))
+            self.conn.commit()
+
+    def iter_elements(self, tile: str) -> Iterator[Dict[str, Any]]:
+        last = ""
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT osm_key, body FROM overpass_elements "
+                    "WHERE tile = ? AND osm_key > ? ORDER BY osm_key LIMIT ?",
+                    (tile, last, READ_BATCH),
+                ).fetchall()
+            for last, body in rows:
+                yield json.loads(body)
+            if len(rows) < READ_BATCH:
+                return
+
+    def store(
+        self,
+        tile: str,
+        query_hash: str,
+        elements: Iterable[Dict[str, Any]],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Pass ``elements`` through while writing them to the cache. The tile is marked
+        complete (with ``meta["osm3s"]["timestamp_osm_base"]``, read once the stream has
+        ended) only if the caller consumes every element and Overpass reported no error.
+        """
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO overpass_tiles (tile, query_hash, fetched_at, osm_base, elements)
+                VALUES (?, ?, NULL, NULL, 0)
+                ON CONFLICT(tile) DO UPDATE SET
+                    query_hash = excluded.query_hash, fetched_at = NULL, osm_base = NULL, elements = 0
+                """,
+                (tile, query_hash),
+            )
+            self.conn.execute("DELETE FROM overpass_elements WHERE tile = ?", (tile,))
+            self.conn.commit()
+
+        pending = []
+        count = 0
+        for element in elements:
+            pending.append((tile, osm_key(element), json.dumps(element, separators=(",", ":"))))
+            count += 1
+            if len(pending) >= WRITE_BATCH:
+                self._write(pending)
+                pending = []
+            yield element
+        self._write(pending)
+
+        meta = meta or {}
+        if "error" in str(meta.get("remark", "")).lower():
+            return  # Overpass gave up part-way (timeout, memory): keep the tile incomplete
+        osm_base = (meta.get("osm3s") or {}).get("timestamp_osm_base")
+        with self._lock:
+            self.conn.execute(
+                "UPDATE overpass_tiles SET fetched_at = ?, osm_base = ?, elements = ? WHERE tile = ?",
+                (time.time(), osm_base, count, tile),
+            )
+            self.conn.commit()
+
+    def _write(self, rows: list) -> None:
+        if not rows:
+            return
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO overpass_elements (tile, osm_key, body) VALUES (?, ?, ?)", rows
+            )
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "unchanged": self.unchanged, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
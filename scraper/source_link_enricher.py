@@ -7,29 +7,95 @@ what was actually retrievable when the scraper ran.
 
 from __future__ import annotations
 
+import html
 import os
 import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import requests
-from bs4 import BeautifulSoup
+
+from scrapers.fetch import HostRateLimiter, run_bounded
 
 MAX_HTML_BYTES = 512_000
 MAX_NAME_LEN = 250
 DEFAULT_DELAY_S = float(os.getenv("SOURCE_FETCH_DELAY_S", "0.65"))
 DEFAULT_TIMEOUT_S = int(os.getenv("SOURCE_FETCH_TIMEOUT_S", "22"))
+DEFAULT_MAX_WORKERS = int(os.getenv("SOURCE_FETCH_WORKERS", "12"))
+
+
+class TitleScanner:
+    """
+    Finds the first ``<title>…</title>`` in an HTML byte stream fed chunk by chunk.
+
+    Each ``feed`` only scans the new bytes plus a few carried over from the previous
+    chunk (so tags split across chunks are still found); nothing before the title is
+    kept. ``done`` turns true as soon as the title closes.
+    """
+
+    _OPEN = b"<title"
+    _CLOSE = b"</title"
+    _TAG_END = b" \t\r\n/>"
+    _MAX_TITLE_BYTES = 8192
+
+    def __init__(self) -> None:
+        self._state = "open"  # open -> tag -> text -> done
+        self._carry = b""
+        self._title = bytearray()
 
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
 
-def _extract_title(html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    tag = soup.find("title")
-    if not tag:
-        return None
-    text = tag.get_text(separator=" ", strip=True)
-    if not text:
-        return None
-    return text[:220] if len(text) > 220 else text
+    def feed(self, chunk: bytes) -> bool:
+        data = self._carry + chunk
+        self._carry = b""
+        if self._state == "open":
+            data = self._find_open(data)
+        if self._state == "tag":
+            end = data.find(b">")
+            if end < 0:
+                return False  # still inside <title ...attributes
+            data = data[end + 1:]
+            self._state = "text"
+        if self._state == "text":
+            self._find_close(data)
+        return self.done
+
+    def _find_open(self, data: bytes) -> bytes:
+        low = data.lower()
+        start = low.find(self._OPEN)
+        while start >= 0:
+            after = start + len(self._OPEN)
+            if after == len(data):
+                self._carry = data[start:]  # can't tell <title from <titlefoo yet
+                return b""
+            if low[after] in self._TAG_END:
+                self._state = "tag"
+                return data[after:]
+            start = low.find(self._OPEN, start + 1)
+        self._carry = data[-(len(self._OPEN) - 1):]
+        return b""
+
+    def _find_close(self, data: bytes) -> None:
+        end = data.lower().find(self._CLOSE)
+        if end >= 0:
+            self._title += data[:end]
+            self._state = "done"
+            return
+        keep = len(self._CLOSE) - 1
+        self._title += data[:-keep] if len(data) > keep else b""
+        self._carry = data[-keep:]
+        if len(self._title) > self._MAX_TITLE_BYTES:
+            self._state = "done"
+
+    def title(self, encoding: str = "utf-8") -> Optional[str]:
+        if not self._title:
+            return None
+        text = html.unescape(bytes(self._title).decode(encoding, errors="replace")).strip()
+        if not text:
+            return None
+        return text[:220] if len(text) > 220 else text
 
 
 def enrich_one_source(
@@ -39,32 +105,36 @@ def enrich_one_source(
     delay_s: float,
     timeout: int,
     facility_name: str,
+    limiter: Optional[HostRateLimiter] = None,
 ) -> Dict[str, Any]:
     url = str(source.get("url") or "").strip()
     base_name = str(source.get("name") or "Source").strip() or "Source"
     if not url:
         return source
 
-    time.sleep(delay_s)
+    if limiter is not None:
+        limiter.acquire(url, delay_s)
+    else:
+        time.sleep(delay_s)
     scraped_at = datetime.now().isoformat()
     try:
         resp = session.get(url, timeout=timeout, allow_redirects=True, stream=True)
         final_url = (resp.url or url).strip()
 
-        chunks: List[bytes] = []
+        scanner = TitleScanner()
         total = 0
         for chunk in resp.iter_content(chunk_size=32768):
             if not chunk:
                 continue
-            chunks.append(chunk)
             total += len(chunk)
-            joined = b"".join(chunks)
-            if total >= MAX_HTML_BYTES or b"</title>" in joined.lower():
+            if scanner.feed(chunk) or total >= MAX_HTML_BYTES:
                 break
         resp.close()
 
-        raw = b"".join(chunks).decode(resp.encoding or "utf-8", errors="replace")
-        title = _extract_title(raw)
+        try:
+            title = scanner.title(resp.encoding or "utf-8")
+        except LookupError:  # unknown charset label
+            title = scanner.title("utf-8")
         display_name = base_name
         if title:
             display_name = f"{base_name} — {title}"
@@ -107,3 +177,46 @@ def enrich_facility_sources(
             continue
         out.append(enrich_one_source(session, src, delay_s=delay_s, timeout=timeout, facility_name=name))
     facility["sources"] = out
+
+
+def enrich_sources_batch(
+    session: requests.Session,
+    facilities: List[Dict[str, Any]],
+    *,
+    delay_s: float = DEFAULT_DELAY_S,
+    timeout: int = DEFAULT_TIMEOUT_S,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> int:
+    """
+    Enrich the sources of all ``facilities`` at once on a bounded worker pool.
+
+    ``delay_s`` spaces requests to the *same* host; different hosts are fetched in
+    parallel. Each facility's ``sources`` list is replaced in place, keeping order.
+    Returns the number of sources resolved.
+    """
+    jobs: List[tuple] = []  # (facility index, source)
+    for idx, facility in enumerate(facilities):
+        for src in facility.get("sources") or []:
+            if isinstance(src, dict):
+                jobs.append((idx, src))
+    if not jobs:
+        return 0
+
+    limiter = HostRateLimiter(interval_s=delay_s)
+
+    def resolve(job: tuple) -> Dict[str, Any]:
+        idx, src = job
+        name = str(facilities[idx].get("name") or "unknown")
+        return enrich_one_source(
+            session, src, delay_s=delay_s, timeout=timeout, facility_name=name, limiter=limiter
+        )
+
+    results = run_bounded(resolve, jobs, max_workers=max_workers)
+
+    enriched: Dict[int, List[Dict[str, Any]]] = {}
+    for (idx, src), (out, error) in zip(jobs, results):
+        # enrich_one_source never raises; keep the original entry if it somehow did.
+        enriched.setdefault(idx, []).append(out if error is None else src)
+    for idx, sources in enriched.items():
+        facilities[idx]["sources"] = sources
+    return len(jobs)
@@ -0,0 +1,6 @@
+"""Tests import scraper modules the way ``main.py`` does, from the scraper directory."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,34 @@
+import os
+
+import psycopg2
+import pytest
+
+from db.database import ConnectionPool, Database
+
+DSN = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DSN, reason="needs TEST_DATABASE_URL (Postgres with the schema applied)")
+
+
+def _terminate(pids):
+    admin = psycopg2.connect(DSN)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute("SELECT pg_terminate_backend(pid) FROM unnest(%s) AS pid", (list(pids),))
+    admin.close()
+
+
+def test_connections_dropped_by_the_server_are_replaced_on_checkout():
+    pool = ConnectionPool(DSN, minconn=2, maxconn=2)
+    try:
+        held = [pool.getconn(), pool.getconn()]
+        pids = [conn.get_backend_pid() for conn in held]
+        for conn in held:
+            pool.putconn(conn)
+        _terminate(pids)
+
+        db = Database(pool)
+        with db.transaction() as cur:
+            cur.execute("SELECT pg_backend_pid() AS pid")
+            assert cur.fetchone()["pid"] not in pids
+    finally:
+        pool.close()
@@ -0,0 +1,22 @@
+import copy
+
+from benchmarks.synthetic import make_facilities
+from processors.deduplicator import Deduplicator, blocking_keys
+
+
+def test_blocked_output_matches_exhaustive_scan():
+    # Directory-shaped rows with case, suffix and one-letter typo duplicates
+    rows = make_facilities(10000, dup_rate=0.2, seed=7)
+
+    exhaustive = Deduplicator(blocking=False).deduplicate(copy.deepcopy(rows))
+    blocked = Deduplicator(exhaustive_max_rows=0).deduplicate(copy.deepcopy(rows))
+
+    assert len(blocked) == len(exhaustive)
+    assert blocked == exhaustive
+
+
+def test_typos_in_place_and_boilerplate_words_keep_the_skeleton():
+    clean = {'name': 'Raxio Nakuru Data Center', 'city': 'Nakuru', 'country': 'Kenya'}
+    for name in ('Raxio Nakuruu Data Center', 'Raxio NakuruData Center', 'Raxio Nakuru Dta Center'):
+        noisy = dict(clean, name=name)
+        assert "s:nakuru data center|nakuru" in blocking_keys(noisy) & blocking_keys(clean)
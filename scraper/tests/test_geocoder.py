@@ -0,0 +1,41 @@
+from geopy.exc import GeocoderTimedOut
+
+from processors.geocode_backends import GeocodeBackend
+from processors.geocode_cache import GeocodeCache
+from processors.geocoder import Geocoder, normalize_query
+
+NAIROBI = (-1.2864, 36.8172)
+ROW = {'name': 'Test DC', 'address': '12 Unknown Lane', 'city': 'Nairobi', 'country': 'Kenya'}
+
+
+class FlakyCityBackend(GeocodeBackend):
+    """Knows no street addresses; the city lookup times out until ``up`` is set."""
+
+    name = 'flaky'
+
+    def __init__(self):
+        self.up = False
+        self.calls = []
+
+    def lookup(self, query):
+        self.calls.append(query)
+        if query.startswith('12 '):
+            return None
+        if not self.up:
+            raise GeocoderTimedOut('timed out')
+        return NAIROBI
+
+
+def test_city_timeout_does_not_cache_the_address_as_not_found():
+    backend = FlakyCityBackend()
+    cache = GeocodeCache(':memory:')
+    geocoder = Geocoder(cache=cache, backends=[backend], min_interval_s=0)
+
+    assert geocoder.geocode_many([dict(ROW), dict(ROW)]) == [None, None]
+    # Nothing remembered: neither in the cache nor for the second row of the batch
+    assert cache.lookup(normalize_query('12 Unknown Lane, Nairobi, Kenya'))[0] is False
+    assert backend.calls.count('Nairobi, Kenya') == 2
+
+    backend.up = True
+    row = geocoder.geocode(dict(ROW))
+    assert (row['latitude'], row['longitude']) == NAIROBI
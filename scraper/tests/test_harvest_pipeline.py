@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional
+
+from db.database import CandidateIndex, candidate_external_id
+from harvest_pipeline import HarvestResult, stream_harvest
+from processors.deduplicator import Deduplicator
+from processors.geocode_cache import GeocodeCache
+from processors.geocoder import Geocoder
+
+
+class CandidateStore:
+    """``ingestion_candidates`` in memory, keyed like the table: (source_system, external_id)"""
+
+    def __init__(self):
+        self.rows: Dict[tuple, Dict[str, Any]] = {}
+
+    def candidate_index(self, source_system: str) -> CandidateIndex:
+        return CandidateIndex(source_system, {})
+
+    def insert_candidates_many(
+        self,
+        items: List[Dict[str, Any]],
+        source_system: str,
+        *,
+        country_scope: str = "Kenya",
+        confidence: int = 55,
+        index: Optional[CandidateIndex] = None,
+    ) -> List[str]:
+        ids = []
+        for item in items:
+            ext = candidate_external_id(source_system, item)
+            self.rows[(source_system, ext)] = dict(item)
+            ids.append(ext)
+        if index is not None:
+            index.written += len(set(ids))
+        return ids
+
+
+class ListScraper:
+    source_system = "test_listing"
+    name = "Test listing"
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.rows = rows
+
+    def iter_scrape(self):
+        yield from self.rows
+
+
+def _row(city: str, url: str) -> Dict[str, Any]:
+    return {
+        "name": "Raxio Nairobi Data Center",
+        "operator": "Raxio Group",
+        "address": "Mombasa Road",
+        "city": city,
+        "country": "Kenya",
+        "latitude": -1.3192,
+        "longitude": 36.8947,
+        "sources": [{"url": url, "name": "Test listing"}],
+    }
+
+
+def test_merge_that_fills_city_updates_the_first_candidate():
+    store = CandidateStore()
+    scraper = ListScraper([_row("", "https://a.example/1"), _row("Nairobi", "https://b.example/1")])
+    geocoder = Geocoder(cache=GeocodeCache(":memory:"), backends=[], min_interval_s=0)
+    progress = HarvestResult(scraper.source_system, scraper.name)
+
+    stream_harvest(scraper, store, Deduplicator(), geocoder, confidence=50, batch_size=1, progress=progress)
+
+    assert progress.raw_rows == 2
+    assert len(store.rows) == 1
+    (candidate,) = store.rows.values()
+    assert candidate["city"] == "Nairobi"
+    assert [s["url"] for s in candidate["sources"]] == ["https://a.example/1", "https://b.example/1"]
@@ -0,0 +1,54 @@
+import requests
+
+from benchmarks.http_stub import StubSite
+from scrapers.http_cache import CachingHTTPAdapter, HttpCache
+from source_link_enricher import enrich_one_source
+
+
+def _session(cache: HttpCache) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", CachingHTTPAdapter(cache))
+    return session
+
+
+def _enrich(session: requests.Session, url: str) -> str:
+    source = enrich_one_source(
+        session, {"url": url, "name": "Stub"}, delay_s=0, timeout=5, facility_name="Test"
+    )
+    return source["name"]
+
+
+def test_enricher_leaves_a_partial_entry_that_revalidates():
+    site = StubSite(latency_s=0).start()
+    try:
+        url = site.urls(1)[0]
+        cache = HttpCache(":memory:")
+        session = _session(cache)
+
+        first = _enrich(session, url)
+        headers, body, _validated_at, partial = cache.get(url)
+        assert partial
+        assert headers.get("etag")
+        assert b"</title>" in body and len(body) < site.page_size
+
+        assert _enrich(session, url) == first == "Stub — Stub page /page/0"
+        assert site.not_modified == 1
+    finally:
+        site.stop()
+
+
+def test_partial_entry_is_not_served_as_a_whole_body():
+    site = StubSite(latency_s=0).start()
+    try:
+        url = site.urls(1)[0]
+        cache = HttpCache(":memory:")
+        session = _session(cache)
+        _enrich(session, url)
+
+        resp = session.get(url)
+        assert resp.headers["X-Cache"] == "MISS"
+        assert len(resp.content) == len(site._page("/page/0"))
+        assert cache.get(url)[3] is False
+        assert site.not_modified == 0
+    finally:
+        site.stop()
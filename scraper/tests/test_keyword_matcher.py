@@ -0,0 +1,40 @@
+from benchmarks.synthetic import make_articles, make_operator_names
+import pytest
+
+from processors import keyword_matcher
+from processors.keyword_matcher import KeywordMatch, KeywordMatcher
+from scrapers.news_monitor_scraper import NewsMonitorScraper
+
+
+def _naive(keywords, text):
+    return [k for k in keywords if k.lower() in text.lower()]
+
+
+@pytest.mark.parametrize("min_keywords", [keyword_matcher.TRIE_MIN_KEYWORDS, 0])
+def test_matches_plain_substring_search_on_the_news_keywords(monkeypatch, min_keywords):
+    # 0 sends the short news list through the compiled pattern too
+    monkeypatch.setattr(keyword_matcher, "TRIE_MIN_KEYWORDS", min_keywords)
+    keywords = NewsMonitorScraper().keywords
+    matcher = KeywordMatcher(keywords)
+    texts = [f"{a['title']} {a['summary']}" for a in make_articles(500)]
+    texts.append("New AWS region: Raxiogroup and iXAfrica Data Centres laws")
+
+    for text in texts + [t.upper() for t in texts[:50]]:
+        assert matcher.matched(text) == _naive(keywords, text)
+
+    many = keywords + make_operator_names(300)
+    matcher = KeywordMatcher(many)
+    for text in texts:
+        assert matcher.matched(text) == _naive(many, text)
+
+
+def test_overlapping_and_nested_keywords_are_all_found():
+    matcher = KeywordMatcher(["data", "data centre", "centre", "tre"])
+
+    assert matcher.find_all("A Data Centre") == [
+        KeywordMatch("data", 2),
+        KeywordMatch("data centre", 2),
+        KeywordMatch("centre", 7),
+        KeywordMatch("tre", 10),
+    ]
+    assert matcher.matched("no match here") == []
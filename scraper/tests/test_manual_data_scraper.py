@@ -0,0 +1,35 @@
+import copy
+
+from scrapers.manual_data_scraper import ManualDataScraper, curated_changes, mark_unenriched
+
+
+def _published(records):
+    return {(r["name"].lower(), r["city"].lower()): r["content_hash"] for r in records}
+
+
+def test_rows_published_unenriched_wait_for_the_next_fetching_run():
+    records = ManualDataScraper().scrape()
+    raw = copy.deepcopy(records)
+    mark_unenriched(raw)
+    published = _published(raw)
+
+    assert curated_changes(records, published, enrich=False) == ([], [])
+    changed, _ = curated_changes(records, published, enrich=True)
+    assert len(changed) == len(records)
+
+    # Once a fetching run has published them, neither kind of run takes them again
+    published = _published(records)
+    assert curated_changes(records, published, enrich=True) == ([], [])
+    assert curated_changes(records, published, enrich=False) == ([], [])
+
+
+def test_edited_rows_are_taken_by_a_no_fetch_run():
+    records = ManualDataScraper().scrape()
+    raw = copy.deepcopy(records)
+    mark_unenriched(raw)
+    published = _published(raw)
+
+    edited = copy.deepcopy(records)
+    edited[0]["content_hash"] = "edited"
+    changed, removed = curated_changes(edited, published, enrich=False)
+    assert changed == [edited[0]] and removed == []
@@ -0,0 +1,31 @@
+from benchmarks.synthetic import make_operator_names
+from processors.operator_registry import FALLBACK_REGISTRY, OperatorRegistry, Vocabulary
+
+
+def _first_category(spec, text):
+    lowered = text.lower()
+    for category in spec['categories']:
+        if any(keyword.lower() in lowered for keyword in category['keywords']):
+            return category['value']
+    return spec['default']
+
+
+def test_matches_the_first_category_rule():
+    registry = OperatorRegistry.load()
+    spec = FALLBACK_REGISTRY['ownership']
+    names = make_operator_names(2000) + [
+        'Safaricom', 'safaricom', 'Liquid Intelligent Technologies', 'Safaricom & Liquid',
+        'Wananchi-Jamii', 'Kenya Data Networks', '-', 'iXAfrica', '',
+    ]
+    for name in names:
+        assert registry.ownership(name) == _first_category(spec, name), name
+
+
+def test_exact_keyword_still_prefers_an_earlier_category_inside_it():
+    vocabulary = Vocabulary({'default': 'none', 'categories': [
+        {'value': 'first', 'keywords': ['-']},
+        {'value': 'second', 'keywords': ['a-b', 'b']},
+    ]})
+    assert vocabulary.classify('a-b') == 'first'
+    assert vocabulary.classify('b') == 'second'
+    assert vocabulary.classify('c') == 'none'
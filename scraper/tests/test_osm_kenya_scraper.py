@@ -0,0 +1,78 @@
+import pytest
+
+from benchmarks.http_stub import OverpassStub
+from scrapers.osm_kenya_scraper import OsmKenyaScraper
+from scrapers.overpass_cache import OverpassTileCache
+
+FIXTURE_NAMES = {
+    "East Africa Data Centre",
+    "iXAfrica NBOX1",
+    "Africa Data Centres Nairobi",
+    "Safaricom Mombasa Data Centre",
+    "Konza Data Centre",
+    "Tatu City Data Campus",
+}
+
+
+@pytest.fixture
+def stub():
+    with OverpassStub(latency_s=0) as overpass:
+        yield overpass
+
+
+def _scraper(stub: OverpassStub, cache: OverpassTileCache) -> OsmKenyaScraper:
+    return OsmKenyaScraper(overpass_url=stub.url, cache=cache, tile_workers=4, delay=0)
+
+
+def test_fixture_rows_are_parsed(stub):
+    rows = _scraper(stub, OverpassTileCache(":memory:")).scrape()
+
+    assert len(rows) == len(stub.fixture["elements"])
+    assert FIXTURE_NAMES <= {row["name"] for row in rows}
+    ixafrica = next(row for row in rows if row["name"] == "iXAfrica NBOX1")
+    assert ixafrica["osm_id"] == "way/612904117"
+    assert (ixafrica["latitude"], ixafrica["longitude"]) == (-1.2669734, 36.8092711)
+    assert all(row["country"] == "Kenya" and row["sources"] for row in rows)
+
+
+def test_node_on_a_tile_corner_is_staged_once(stub):
+    scraper = _scraper(stub, OverpassTileCache(":memory:"))
+    south, west, north, east = scraper.tiles[0]
+    # The corner shared by four tiles; Overpass returns it from each of them
+    stub.elements.append({
+        "type": "node", "id": 1, "lat": north, "lon": east,
+        "tags": {"telecom": "data_center", "name": "Corner DC"},
+    })
+
+    rows = scraper.scrape()
+
+    assert [row["name"] for row in rows].count("Corner DC") == 1
+    assert stub.queries == len(scraper.tiles)
+
+
+def test_second_run_is_served_from_the_tile_cache(stub):
+    cache = OverpassTileCache(":memory:")
+    first = _scraper(stub, cache).scrape()
+    queries = stub.queries
+
+    second = _scraper(stub, cache).scrape()
+
+    assert stub.queries == queries
+    assert stub.probes == 0
+    assert cache.hits == len(_scraper(stub, cache).tiles)
+    assert sorted(row["osm_id"] for row in second) == sorted(row["osm_id"] for row in first)
+
+
+def test_expired_tiles_are_probed_with_count_queries_only(stub):
+    cache = OverpassTileCache(":memory:")
+    scraper = _scraper(stub, cache)
+    first = scraper.scrape()
+    queries = stub.queries
+
+    cache.ttl_s = 0
+    second = scraper.scrape()
+
+    assert stub.probes == len(scraper.tiles)
+    assert stub.queries == queries
+    assert cache.unchanged == len(scraper.tiles)
+    assert len(second) == len(first)